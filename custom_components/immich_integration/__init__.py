@@ -2,47 +2,261 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform, CONF_HOST, CONF_API_KEY
-from homeassistant.core import HomeAssistant, ServiceCall, callback
-from .const import DOMAIN
-from .hub import ImmichHub, InvalidAuth
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+)
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from url_normalize import url_normalize
+
+from .asset_index import AlbumIndexStore
+from .cache import ThumbnailCache
+from .const import (
+    CONF_CONNECTION_LIMIT,
+    CONF_JOBS_CACHE_TTL,
+    CONF_PUSH,
+    CONF_SYNC_FOLDERS,
+    DATA_SERVERS,
+    DOMAIN,
+)
+from .coordinator import ImmichData, ImmichJobsCoordinator
+from .events import AssetEventTracker
+from .hub import (
+    DEFAULT_JOBS_CACHE_TTL,
+    DEFAULT_LIMIT_PER_HOST,
+    ApiError,
+    CannotConnect,
+    ImmichHub,
+    ImmichServer,
+    InvalidAuth,
+)
+from .search import AssetSearch
+from .services import async_setup_services
+from .sync import FolderSync
+from .websocket import ImmichWebSocket
 
-# TODO List the platforms that you want to support.
-# For your initial PR, limit it to 1 platform.
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR]
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.IMAGE,
+    Platform.SENSOR,
+    Platform.SWITCH,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+_LOGGER = logging.getLogger(__name__)
+# The device all entries shared before each got its own.
+_LEGACY_DEVICE_IDENTIFIER = (DOMAIN, "immich_integration")
+# Job status sensors were the only entities released with unscoped unique IDs.
+_UNSCOPED_UNIQUE_ID_PREFIX = "status_"
 
 # TODO Create ConfigEntry type alias with API object
 # TODO Rename type alias and update all entry annotations
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Immich Integration services."""
+    async_setup_services(hass)
+    return True
+
+
 # TODO Update entry annotation
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up immich from a config entry."""
+    """Set up immich from a config entry.
+
+    When a snapshot from a previous run exists, entities are created from it
+    straight away and the server is contacted in the background, so a slow
+    or unreachable server does not hold up Home Assistant's startup.
+    """
 
     hass.data.setdefault(DOMAIN, {})
 
-    hub = ImmichHub(host=entry.data[CONF_HOST], api_key=entry.data[CONF_API_KEY])
+    server = _async_get_server(hass, entry)
+    hub = ImmichHub(host=server.host, api_key=entry.data[CONF_API_KEY], server=server)
+    coordinator = ImmichJobsCoordinator(hass, entry, hub)
+    thumbnails = ThumbnailCache(
+        hass, hass.config.path(".cache", DOMAIN, "thumbnails", entry.entry_id)
+    )
+    albums = AlbumIndexStore(hass, hub, entry.entry_id)
+    events = AssetEventTracker(hass, entry, hub, albums)
+    search = AssetSearch(hub)
+    sync = (
+        FolderSync(hass, entry, hub, coordinator, folders)
+        if (folders := entry.options.get(CONF_SYNC_FOLDERS))
+        else None
+    )
 
-    if not await hub.authenticate():
-        raise InvalidAuth
+    try:
+        restored, *_ = await asyncio.gather(
+            coordinator.async_restore(),
+            thumbnails.async_load(),
+            albums.async_load(),
+            events.async_load(),
+            *([sync.async_load()] if sync else []),
+        )
+        if not restored:
+            # First start: there is nothing to build entities from yet.
+            await _async_connect(hub)
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await hub.async_close()
+        raise
 
-    hass.data[DOMAIN][entry.entry_id] = hub
+    hass.data[DOMAIN][entry.entry_id] = ImmichData(
+        hub=hub,
+        coordinator=coordinator,
+        thumbnails=thumbnails,
+        albums=albums,
+        events=events,
+        search=search,
+        sync=sync,
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    @callback
-    async def refresh_service(call: ServiceCall) -> None:
-        """My first service."""
-        await hub.refresh_jobs()
+    events.async_start()
+    if sync is not None:
+        sync.async_start()
+
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            _async_connect_in_background(hass, entry, hub, coordinator),
+            f"{DOMAIN} connect {entry.title}",
+        )
+
+    if entry.options.get(CONF_PUSH, False):
+
+        @callback
+        def handle_event(event: str, payload: Any) -> None:
+            """Apply a live event from the server."""
+            albums.async_apply_asset_event(event, payload)
+            events.async_handle_push_event(event)
+            if event == "on_upload_success":
+                search.clear()
+            coordinator.async_handle_push_event(event)
+
+        socket = ImmichWebSocket(
+            hub, handle_event, coordinator.async_set_push_connected
+        )
+        entry.async_create_background_task(
+            hass, socket.async_run(), f"{DOMAIN} events {entry.title}"
+        )
+
+    return True
+
+
+@callback
+def _async_get_server(hass: HomeAssistant, entry: ConfigEntry) -> ImmichServer:
+    """Return the connection shared by all entries for a server.
+
+    The connection limit and job cache TTL are taken from the options of the
+    entry that opens the connection; entries joining it later share them.
+    """
+    host = url_normalize(entry.data[CONF_HOST])
+    servers: dict[str, ImmichServer] = hass.data.setdefault(DATA_SERVERS, {})
+    if (server := servers.get(host)) is None or server.closed:
+        server = servers[host] = ImmichServer(
+            host,
+            limit_per_host=entry.options.get(
+                CONF_CONNECTION_LIMIT, DEFAULT_LIMIT_PER_HOST
+            ),
+            jobs_cache_ttl=entry.options.get(
+                CONF_JOBS_CACHE_TTL, DEFAULT_JOBS_CACHE_TTL
+            ),
+        )
+    return server
+
+
+async def _async_connect(hub: ImmichHub) -> None:
+    """Check the API key and fetch the user it belongs to."""
+    try:
+        if not await hub.authenticate():
+            raise InvalidAuth
+        await hub.get_my_user_info()
+    except InvalidAuth as err:
+        raise ConfigEntryAuthFailed("The Immich API key was rejected") from err
+    except (CannotConnect, ApiError) as err:
+        raise ConfigEntryNotReady(f"Unable to connect to Immich: {err}") from err
+
+
+async def _async_connect_in_background(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    hub: ImmichHub,
+    coordinator: ImmichJobsCoordinator,
+) -> None:
+    """Connect after a start from the saved snapshot and refresh it."""
+    try:
+        await _async_connect(hub)
+    except ConfigEntryAuthFailed as err:
+        # Polling would only be rejected too; ask for a new API key.
+        _LOGGER.warning("%s", err)
+        coordinator.async_set_update_error(err)
+        entry.async_start_reauth(hass)
+        return
+    except HomeAssistantError as err:
+        # Entities become unavailable; polling keeps retrying.
+        _LOGGER.warning("%s", err)
+        coordinator.async_set_update_error(err)
+        return
+    coordinator.async_save_snapshot()
+    await coordinator.async_refresh()
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an entry created by an older version."""
+    if entry.version > 1:
+        return False
+
+    if entry.minor_version < 2:
+        # Unique IDs and the device did not include the entry, so a second
+        # entry clashed with the first and shared its device.
+        @callback
+        def _scope_unique_id(entity: er.RegistryEntry) -> dict[str, Any] | None:
+            if entity.unique_id.startswith(_UNSCOPED_UNIQUE_ID_PREFIX):
+                return {"new_unique_id": f"{entry.entry_id}_{entity.unique_id}"}
+            return None
+
+        await er.async_migrate_entries(hass, entry.entry_id, _scope_unique_id)
+        _async_leave_legacy_device(hass, entry)
+        hass.config_entries.async_update_entry(entry, minor_version=2)
 
-    hass.services.async_register(DOMAIN, "refresh", refresh_service)
     return True
 
 
+@callback
+def _async_leave_legacy_device(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Detach an entry from the shared device; its entities move on setup."""
+    device_registry = dr.async_get(hass)
+    legacy = device_registry.async_get_device(identifiers={_LEGACY_DEVICE_IDENTIFIER})
+    if legacy is None or entry.entry_id not in legacy.config_entries:
+        return
+    entity_registry = er.async_get(hass)
+    # Unlink the entities first; leaving the device would remove them.
+    for entity in er.async_entries_for_device(
+        entity_registry, legacy.id, include_disabled_entities=True
+    ):
+        if entity.config_entry_id == entry.entry_id:
+            entity_registry.async_update_entity(entity.entity_id, device_id=None)
+    device_registry.async_update_device(
+        legacy.id, remove_config_entry_id=entry.entry_id
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data: ImmichData = hass.data[DOMAIN].pop(entry.entry_id)
+        await data.hub.async_close()
 
     return unload_ok
@@ -0,0 +1,298 @@
+"""Caches for the Immich Integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import partial
+import logging
+import os
+import time
+from typing import Generic, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+DEFAULT_MEMORY_BYTES = 32 * 1024 * 1024
+DEFAULT_DISK_BYTES = 512 * 1024 * 1024
+
+_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+}
+_CONTENT_TYPES = {ext: content_type for content_type, ext in _EXTENSIONS.items()}
+
+
+class TimedLRUCache(Generic[_K, _V]):
+    """Small in-memory LRU cache whose entries also expire after a TTL."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        """Initialize the cache."""
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[_K, tuple[float, _V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _K) -> _V | None:
+        """Return a live entry, or None if it is missing or expired."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: _K, value: _V) -> None:
+        """Store an entry, evicting the least recently used above the limit."""
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+class SingleFlight(Generic[_K, _V]):
+    """Share one in-flight call per key between concurrent callers.
+
+    A caller asking for a key that is already being fetched waits for that
+    call instead of starting its own. The call runs in a task of its own,
+    so a cancelled caller does not cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with nothing in flight."""
+        self.coalesced_calls = 0
+        self._pending: dict[_K, asyncio.Task[_V]] = {}
+
+    def __contains__(self, key: _K) -> bool:
+        return key in self._pending
+
+    async def async_run(self, key: _K, call: Callable[[], Awaitable[_V]]) -> _V:
+        """Return the result of call, or of the call in flight for key."""
+        if (task := self._pending.get(key)) is None:
+            task = asyncio.get_running_loop().create_task(call())
+            self._pending[key] = task
+            task.add_done_callback(partial(self._async_done, key))
+        else:
+            self.coalesced_calls += 1
+        return await asyncio.shield(task)
+
+    def _async_done(self, key: _K, task: asyncio.Task[_V]) -> None:
+        """Forget the finished call."""
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            # Mark the exception retrieved; awaiting callers re-raise it.
+            task.exception()
+
+    def forget(self, key: _K) -> None:
+        """Let the next caller for key start a new call instead of joining."""
+        self._pending.pop(key, None)
+
+    def cancel(self) -> None:
+        """Cancel every call in flight."""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
+
+class ThumbnailCache:
+    """Size-bounded LRU cache of thumbnails, in memory and on disk.
+
+    Entries are keyed by asset ID and thumbnail size. A memory miss falls
+    back to the disk tier before downloading, and concurrent requests for
+    the same key share a single download.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        directory: str,
+        max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+    ) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._directory = directory
+        self._max_memory_bytes = max_memory_bytes
+        self._max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._disk_bytes = 0
+        self._pending: dict[str, asyncio.Future[tuple[bytes, str]]] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced_calls = 0
+
+    async def async_load(self) -> None:
+        """Index the files already in the disk tier, oldest first."""
+        entries = await self.hass.async_add_executor_job(self._scan_directory)
+        for key, filename, size in entries:
+            self._disk[key] = (filename, size)
+            self._disk_bytes += size
+        await self._async_evict_disk()
+
+    def _scan_directory(self) -> list[tuple[str, str, int]]:
+        """List cached files sorted by access time."""
+        os.makedirs(self._directory, exist_ok=True)
+        entries = []
+        with os.scandir(self._directory) as scan:
+            for entry in scan:
+                key, ext = os.path.splitext(entry.name)
+                if ext not in _CONTENT_TYPES or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_atime, key, entry.name, stat.st_size))
+        entries.sort()
+        return [(key, filename, size) for _, key, filename, size in entries]
+
+    async def async_get(
+        self,
+        asset_id: str,
+        size: str,
+        fetch: Callable[[str, str], Awaitable[tuple[bytes, str]]],
+    ) -> tuple[bytes, str]:
+        """Return (image, content_type), downloading it with fetch on a miss."""
+        key = f"{asset_id}_{size}"
+        if (cached := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return cached
+
+        if (pending := self._pending.get(key)) is not None:
+            self.coalesced_calls += 1
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[tuple[bytes, str]] = (
+            self.hass.loop.create_future()
+        )
+        self._pending[key] = future
+        try:
+            result = await self._async_read_disk(key)
+            if result is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                result = await fetch(asset_id, size)
+                await self._async_write_disk(key, *result)
+            self._store_memory(key, result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Only waiters should see the error; avoid "never retrieved".
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._pending[key]
+        return result
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return cache sizes and counters."""
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced_calls,
+        }
+
+    def _store_memory(self, key: str, result: tuple[bytes, str]) -> None:
+        """Add an entry to the memory tier and evict the least recently used."""
+        size = len(result[0])
+        if size > self._max_memory_bytes:
+            return
+        self._memory[key] = result
+        self._memory_bytes += size
+        while self._memory_bytes > self._max_memory_bytes:
+            _, (image, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(image)
+
+    async def _async_read_disk(self, key: str) -> tuple[bytes, str] | None:
+        """Read an entry from the disk tier."""
+        if (entry := self._disk.get(key)) is None:
+            return None
+        filename, _ = entry
+        path = os.path.join(self._directory, filename)
+        try:
+            image = await self.hass.async_add_executor_job(_read_file, path)
+        except OSError as err:
+            _LOGGER.debug("Dropping unreadable cached thumbnail %s: %s", path, err)
+            self._disk_bytes -= self._disk.pop(key)[1]
+            return None
+        self._disk.move_to_end(key)
+        return image, _CONTENT_TYPES[os.path.splitext(filename)[1]]
+
+    async def _async_write_disk(self, key: str, image: bytes, content_type: str) -> None:
+        """Write an entry to the disk tier."""
+        if (ext := _EXTENSIONS.get(content_type)) is None:
+            return
+        filename = f"{key}{ext}"
+        path = os.path.join(self._directory, filename)
+        try:
+            await self.hass.async_add_executor_job(_write_file, path, image)
+        except OSError as err:
+            _LOGGER.warning("Unable to cache thumbnail %s: %s", path, err)
+            return
+        if (previous := self._disk.pop(key, None)) is not None:
+            self._disk_bytes -= previous[1]
+        self._disk[key] = (filename, len(image))
+        self._disk_bytes += len(image)
+        await self._async_evict_disk()
+
+    async def _async_evict_disk(self) -> None:
+        """Delete the least recently used files above the disk budget."""
+        paths = []
+        while self._disk_bytes > self._max_disk_bytes and self._disk:
+            _, (filename, size) = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            paths.append(os.path.join(self._directory, filename))
+        if paths:
+            await self.hass.async_add_executor_job(_remove_files, paths)
+
+
+def _read_file(path: str) -> bytes:
+    """Read a file and refresh its access time."""
+    with open(path, "rb") as file:
+        data = file.read()
+    os.utime(path)
+    return data
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Write a file atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def _remove_files(paths: list[str]) -> None:
+    """Remove files, ignoring ones already gone."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 import logging
 from typing import Any
 
@@ -9,14 +10,42 @@ import voluptuous as vol
 from urllib.parse import urlparse
 from url_normalize import url_normalize
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_API_KEY
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
 from homeassistant.core import callback
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 
-from .const import DOMAIN
-from .hub import ImmichHub
+from .const import (
+    CONF_CONNECTION_LIMIT,
+    CONF_JOBS_CACHE_TTL,
+    CONF_POLL_BACKOFF,
+    CONF_POLL_MAX_INTERVAL,
+    CONF_POLL_MIN_INTERVAL,
+    CONF_PUSH,
+    CONF_ROTATION_NO_REPEAT,
+    CONF_SYNC_FOLDERS,
+    CONF_WATCHED_ALBUMS,
+    DEFAULT_POLL_BACKOFF,
+    DEFAULT_POLL_MAX_INTERVAL,
+    DEFAULT_POLL_MIN_INTERVAL,
+    DEFAULT_ROTATION_NO_REPEAT,
+    DOMAIN,
+)
+from .hub import (
+    DEFAULT_JOBS_CACHE_TTL,
+    DEFAULT_LIMIT_PER_HOST,
+    CannotConnect,
+    ImmichHub,
+    InvalidAuth,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,10 +84,13 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     hub = ImmichHub(host=url, api_key=api_key)
 
-    if not await hub.authenticate():
-        raise InvalidAuth
+    try:
+        if not await hub.authenticate():
+            raise InvalidAuth
 
-    user_info = await hub.get_my_user_info()
+        user_info = await hub.get_my_user_info()
+    finally:
+        await hub.async_close()
     username = user_info["name"]
     clean_hostname = urlparse(url).hostname
 
@@ -73,7 +105,7 @@ class ImmichConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Immich Integration."""
 
     VERSION = 1
-    MINOR_VERSION = 1
+    MINOR_VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -97,10 +129,129 @@ class ImmichConfigFlow(ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_reauth(
+        self, entry_data: Mapping[str, Any]
+    ) -> ConfigFlowResult:
+        """Handle an API key the server no longer accepts."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Ask for a new API key and update the entry with it."""
+        errors: dict[str, str] = {}
+        entry = self._get_reauth_entry()
+        if user_input is not None:
+            try:
+                await validate_input(self.hass, {**entry.data, **user_input})
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
+            except Exception:
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                return self.async_update_reload_and_abort(
+                    entry, data_updates=user_input
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_API_KEY): str}),
+            description_placeholders={"host": entry.data[CONF_HOST]},
+            errors=errors,
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return ImmichOptionsFlow()
+
 
-class CannotConnect(HomeAssistantError):
-    """Error to indicate we cannot connect."""
+class ImmichOptionsFlow(OptionsFlow):
+    """Handle the options for Immich Integration."""
 
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage polling, watched albums and synced folders."""
+        errors: dict[str, str] = {}
+        options = self.config_entry.options
+        if user_input is not None:
+            if user_input[CONF_POLL_MIN_INTERVAL] > user_input[CONF_POLL_MAX_INTERVAL]:
+                errors["base"] = "invalid_poll_range"
+            elif not all(
+                self.hass.config.is_allowed_path(folder)
+                for folder in user_input.get(CONF_SYNC_FOLDERS, [])
+            ):
+                errors[CONF_SYNC_FOLDERS] = "folder_not_allowed"
+            else:
+                return self.async_create_entry(data={**options, **user_input})
+
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_POLL_MIN_INTERVAL,
+                    default=options.get(
+                        CONF_POLL_MIN_INTERVAL, DEFAULT_POLL_MIN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(
+                    CONF_POLL_MAX_INTERVAL,
+                    default=options.get(
+                        CONF_POLL_MAX_INTERVAL, DEFAULT_POLL_MAX_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(
+                    CONF_POLL_BACKOFF,
+                    default=options.get(CONF_POLL_BACKOFF, DEFAULT_POLL_BACKOFF),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=10.0)),
+                vol.Required(
+                    CONF_JOBS_CACHE_TTL,
+                    default=options.get(CONF_JOBS_CACHE_TTL, DEFAULT_JOBS_CACHE_TTL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=60.0)),
+                vol.Required(
+                    CONF_CONNECTION_LIMIT,
+                    default=options.get(CONF_CONNECTION_LIMIT, DEFAULT_LIMIT_PER_HOST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                vol.Required(
+                    CONF_ROTATION_NO_REPEAT,
+                    default=options.get(
+                        CONF_ROTATION_NO_REPEAT, DEFAULT_ROTATION_NO_REPEAT
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_PUSH, default=options.get(CONF_PUSH, False)
+                ): bool,
+                vol.Optional(
+                    CONF_SYNC_FOLDERS, default=options.get(CONF_SYNC_FOLDERS, [])
+                ): TextSelector(TextSelectorConfig(multiple=True)),
+            }
+        )
+        if albums := await self._async_list_albums():
+            watched = [
+                album_id
+                for album_id in options.get(CONF_WATCHED_ALBUMS, [])
+                if album_id in albums
+            ]
+            schema = schema.extend(
+                {
+                    vol.Optional(
+                        CONF_WATCHED_ALBUMS, default=watched
+                    ): cv.multi_select(albums),
+                }
+            )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
 
-class InvalidAuth(HomeAssistantError):
-    """Error to indicate there is invalid auth."""
+    async def _async_list_albums(self) -> dict[str, str]:
+        """Return the server's albums, or nothing if the entry is not loaded."""
+        data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if data is None:
+            return {}
+        try:
+            return await data.hub.list_albums()
+        except HomeAssistantError as err:
+            _LOGGER.debug("Unable to list albums: %s", err)
+            return {}
@@ -1,3 +1,19 @@
 """Constants for the Immich Integration integration."""
 
 DOMAIN = "immich_integration"
+DATA_SERVERS = f"{DOMAIN}_servers"
+
+CONF_POLL_MIN_INTERVAL = "poll_min_interval"
+CONF_POLL_MAX_INTERVAL = "poll_max_interval"
+CONF_POLL_BACKOFF = "poll_backoff"
+CONF_WATCHED_ALBUMS = "watched_albums"
+CONF_ROTATION_NO_REPEAT = "rotation_no_repeat"
+CONF_PUSH = "push"
+CONF_SYNC_FOLDERS = "sync_folders"
+CONF_CONNECTION_LIMIT = "connection_limit"
+CONF_JOBS_CACHE_TTL = "jobs_cache_ttl"
+
+DEFAULT_POLL_MIN_INTERVAL = 10
+DEFAULT_POLL_MAX_INTERVAL = 600
+DEFAULT_POLL_BACKOFF = 1.5
+DEFAULT_ROTATION_NO_REPEAT = 50
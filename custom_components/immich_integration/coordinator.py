@@ -0,0 +1,261 @@
+"""Data update coordinator for the Immich Integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .asset_index import AlbumIndexStore
+from .cache import ThumbnailCache
+from .const import (
+    CONF_POLL_BACKOFF,
+    CONF_POLL_MAX_INTERVAL,
+    CONF_POLL_MIN_INTERVAL,
+    DEFAULT_POLL_BACKOFF,
+    DEFAULT_POLL_MAX_INTERVAL,
+    DEFAULT_POLL_MIN_INTERVAL,
+    DOMAIN,
+)
+from .hub import ApiError, CannotConnect, ImmichHub, InvalidAuth, diff_jobs
+from .models import Job, parse_jobs
+
+if TYPE_CHECKING:
+    from .events import AssetEventTracker
+    from .search import AssetSearch
+    from .sync import FolderSync
+
+STATISTICS_SCAN_INTERVAL = timedelta(minutes=15)
+# Statuses that mean the API key may not read the statistics.
+_STATISTICS_DENIED = (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN)
+_SNAPSHOT_STORAGE_VERSION = 1
+_SNAPSHOT_SAVE_DELAY = 60
+_LOGGER = logging.getLogger(__name__)
+
+
+class ImmichJobsCoordinator(DataUpdateCoordinator[dict[str, Job]]):
+    """Fetch /api/jobs once per cycle and share it with every job entity.
+
+    The poll interval adapts to server activity: it drops to the floor while
+    any queue has active or waiting work (or right after a command), and
+    grows by the backoff factor on every idle cycle until it hits the ceiling.
+    While the live event channel is connected, idle polling stays at the
+    ceiling and asset events trigger a refresh instead.
+
+    The last snapshot is persisted, so entities can be created from it at
+    startup before the server has answered. Job queues are server-wide:
+    when another entry for the same server fetches a snapshot, it is taken
+    over and the poll timer restarts, so the server is polled once per
+    interval however many entries point at it.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, hub: ImmichHub) -> None:
+        """Initialize the coordinator."""
+        options = entry.options
+        self._min_interval = timedelta(
+            seconds=options.get(CONF_POLL_MIN_INTERVAL, DEFAULT_POLL_MIN_INTERVAL)
+        )
+        self._max_interval = timedelta(
+            seconds=options.get(CONF_POLL_MAX_INTERVAL, DEFAULT_POLL_MAX_INTERVAL)
+        )
+        self._backoff = options.get(CONF_POLL_BACKOFF, DEFAULT_POLL_BACKOFF)
+        self._command_issued = False
+        self._push_connected = False
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name="Immich Jobs",
+            update_interval=self._min_interval,
+            always_update=False,
+        )
+        self.hub = hub
+        self.changed_queues: set[str] = set()
+        self.skipped_writes = 0
+        self._fetching = False
+        entry.async_on_unload(hub.add_jobs_listener(self._async_snapshot_fetched))
+        self._store: Store[dict[str, Any]] = Store(
+            hass, _SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot"
+        )
+
+    async def async_restore(self) -> bool:
+        """Load the snapshot saved by a previous run, if any."""
+        if (stored := await self._store.async_load()) is None:
+            return False
+        try:
+            jobs = parse_jobs(stored["jobs"])
+        except ValueError as err:
+            _LOGGER.warning("Ignoring the saved job snapshot: %s", err)
+            return False
+        self.hub.jobs = jobs
+        self.hub.user_info = stored.get("user")
+        self.data = jobs
+        self.changed_queues = set(self.data)
+        return True
+
+    @callback
+    def async_save_snapshot(self) -> None:
+        """Schedule saving the latest snapshot."""
+        self._store.async_delay_save(self._snapshot_to_save, _SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_to_save(self) -> dict[str, Any]:
+        return {
+            "jobs": {name: job.as_dict() for name, job in self.hub.jobs.items()},
+            "user": self.hub.user_info,
+        }
+
+    async def _async_update_data(self) -> dict[str, Job]:
+        """Fetch the current job snapshot from the server."""
+        self._fetching = True
+        try:
+            jobs = await self.hub.get_jobs(False)
+        except InvalidAuth as err:
+            # Stops polling and asks the user for a new API key.
+            raise ConfigEntryAuthFailed("The Immich API key was rejected") from err
+        except (CannotConnect, ApiError) as err:
+            if self.hub.breaker.is_open:
+                # Poll again right when the breaker allows its next probe.
+                self.update_interval = max(
+                    self._min_interval,
+                    timedelta(seconds=self.hub.breaker.retry_in()),
+                )
+            raise UpdateFailed(f"Error fetching Immich jobs: {err}") from err
+        finally:
+            self._fetching = False
+
+        self._apply_snapshot(jobs)
+        return jobs
+
+    @callback
+    def _async_snapshot_fetched(self, jobs: dict[str, Job]) -> None:
+        """Take over a snapshot fetched by another entry for the server."""
+        if self._fetching:
+            # Our own request; _async_update_data handles it.
+            return
+        self._apply_snapshot(jobs)
+        self.async_set_updated_data(jobs)
+
+    def _apply_snapshot(self, jobs: dict[str, Job]) -> None:
+        """Work out what changed since our last snapshot and plan the next poll."""
+        self.changed_queues = diff_jobs(self.data or {}, jobs)
+        if self.changed_queues:
+            self.async_save_snapshot()
+        self.update_interval = self._next_interval(jobs)
+
+    def _next_interval(self, jobs: dict[str, Job]) -> timedelta:
+        """Return the delay before the next poll for this snapshot."""
+        busy = any(
+            job.counts.active or job.counts.waiting
+            for job in jobs.values()
+        )
+        if busy or self._command_issued:
+            self._command_issued = False
+            return self._min_interval
+        if self._push_connected:
+            return self._max_interval
+        return min(self.update_interval * self._backoff, self._max_interval)
+
+    @callback
+    def async_set_push_connected(self, connected: bool) -> None:
+        """Relax polling while live events arrive, fall back when they stop."""
+        self._push_connected = connected
+        if not connected:
+            self.update_interval = self._min_interval
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_handle_push_event(self, event: str) -> None:
+        """Refresh job state after a live asset event.
+
+        Immich sends no job events, but uploads and asset changes queue work,
+        so they trigger a debounced refresh.
+        """
+        if event.startswith("on_asset") or event == "on_upload_success":
+            self.hass.async_create_task(self.async_request_refresh())
+
+    async def async_command_issued(self) -> None:
+        """Tighten polling after a job command and refresh soon."""
+        self._command_issued = True
+        await self.async_request_refresh()
+
+    async def async_assets_uploaded(self, count: int) -> None:
+        """Tighten polling after uploads, if any, and refresh soon.
+
+        New assets queue thumbnail and metadata jobs on the server.
+        """
+        if count:
+            await self.async_command_issued()
+
+
+class ImmichStatisticsCoordinator(DataUpdateCoordinator[dict]):
+    """Fetch server statistics on a slow schedule of their own.
+
+    The statistics endpoint is expensive on the server, so it is never
+    polled at the job rate. Statistics are server-wide: like the job
+    snapshot, statistics fetched by another entry for the same server are
+    taken over and restart the timer, so the server is polled once per
+    interval however many entries point at it.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, hub: ImmichHub) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name="Immich Statistics",
+            update_interval=STATISTICS_SCAN_INTERVAL,
+        )
+        self.hub = hub
+        self.access_denied = False
+        self._fetching = False
+        entry.async_on_unload(
+            hub.add_statistics_listener(self._async_statistics_fetched)
+        )
+
+    async def _async_update_data(self) -> dict:
+        """Fetch the server statistics."""
+        self._fetching = True
+        try:
+            statistics = await self.hub.get_server_statistics()
+        except (CannotConnect, ApiError) as err:
+            self.access_denied = (
+                isinstance(err, ApiError) and err.status in _STATISTICS_DENIED
+            )
+            raise UpdateFailed(f"Error fetching Immich statistics: {err}") from err
+        finally:
+            self._fetching = False
+        self.access_denied = False
+        return statistics
+
+    @callback
+    def _async_statistics_fetched(self, statistics: dict) -> None:
+        """Take over statistics fetched by another entry for the server."""
+        if self._fetching or self.access_denied:
+            # Our own request, or statistics this API key may not read.
+            return
+        self.async_set_updated_data(statistics)
+
+
+@dataclass
+class ImmichData:
+    """Runtime data stored for each config entry."""
+
+    hub: ImmichHub
+    coordinator: ImmichJobsCoordinator
+    thumbnails: ThumbnailCache
+    albums: AlbumIndexStore
+    events: AssetEventTracker
+    search: AssetSearch
+    sync: FolderSync | None = None
@@ -0,0 +1,67 @@
+"""Diagnostics support for the Immich Integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import ImmichData
+
+TO_REDACT = {CONF_API_KEY, CONF_HOST}
+USER_TO_REDACT = {"email", "name", "profileImagePath"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: ImmichData = hass.data[DOMAIN][entry.entry_id]
+    hub = data.hub
+    coordinator = data.coordinator
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "user": async_redact_data(hub.user_info or {}, USER_TO_REDACT),
+        "requests": hub.metrics.as_dict(),
+        "jobs_cache": hub.cache_stats,
+        "server": {
+            "entries": hub.server.users,
+            "rate_limit": hub.server.limiter.stats,
+        },
+        "circuit_breaker": {
+            "open": hub.breaker.is_open,
+            "retry_in": round(hub.breaker.retry_in(), 1),
+        },
+        "coordinator": {
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "last_update_success": coordinator.last_update_success,
+            "queues": len(coordinator.data or {}),
+            "skipped_writes": coordinator.skipped_writes,
+        },
+        "throughput": {
+            name: {
+                "backlog": throughput.backlog,
+                "completion_rate": throughput.completion_rate,
+                "failure_rate": throughput.failure_rate,
+                "time_to_drain": throughput.time_to_drain,
+            }
+            for name, throughput in hub.throughput.items()
+        },
+        "thumbnails": data.thumbnails.stats,
+        "sync": data.sync.stats if data.sync else None,
+        "events": data.events.stats,
+        "search": data.search.stats,
+        "albums": data.albums.stats,
+    }
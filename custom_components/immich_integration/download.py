@@ -0,0 +1,210 @@
+"""Downloading Immich assets to local storage."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+from typing import Any, BinaryIO
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from .hub import ApiError, CannotConnect, ImmichHub
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_PARALLEL_DOWNLOADS = 3
+_CHUNK_SIZE = 256 * 1024
+_PARTIAL_SUFFIX = ".part"
+
+
+@dataclass(slots=True)
+class DownloadResult:
+    """Outcome of downloading a set of assets or archives."""
+
+    downloaded: dict[str, str]
+    skipped: list[str]
+    failed: dict[str, str]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as a service response."""
+        return {
+            "downloaded": self.downloaded,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+
+
+def _partial_size(path: str) -> int:
+    """Return how much of a download is on disk. Runs in the executor."""
+    try:
+        return os.path.getsize(path + _PARTIAL_SUFFIX)
+    except FileNotFoundError:
+        return 0
+
+
+async def _async_write_body(
+    hass: HomeAssistant, response: aiohttp.ClientResponse, path: str, append: bool
+) -> None:
+    """Write a response body to the partial file of path, chunk by chunk.
+
+    Only one chunk is held in memory at a time; writes run in the executor.
+    """
+    file: BinaryIO = await hass.async_add_executor_job(
+        open, path + _PARTIAL_SUFFIX, "ab" if append else "wb"
+    )
+    try:
+        async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+            await hass.async_add_executor_job(file.write, chunk)
+    finally:
+        await hass.async_add_executor_job(file.close)
+
+
+def _range_total(response: aiohttp.ClientResponse) -> int | None:
+    """Return the full size in a Content-Range header, e.g. bytes */1234."""
+    _, _, total = response.headers.get(aiohttp.hdrs.CONTENT_RANGE, "").rpartition("/")
+    return int(total) if total.isdigit() else None
+
+
+async def _async_write_original(
+    hass: HomeAssistant, hub: ImmichHub, asset_id: str, path: str, offset: int
+) -> bool:
+    """Write the original of an asset from offset on to the partial file.
+
+    Returns False if the server finds offset beyond the end of the file
+    and the partial file does not hold exactly the whole of it.
+    """
+    async with hub.download_original(asset_id, offset) as response:
+        if response.status != 416:
+            await _async_write_body(hass, response, path, response.status == 206)
+            return True
+        return _range_total(response) == offset
+
+
+async def async_download_original(
+    hass: HomeAssistant, hub: ImmichHub, asset_id: str, path: str
+) -> None:
+    """Download the original of an asset to path.
+
+    The file is written to path.part and renamed once complete. A partial
+    file left by an interrupted download is resumed with a Range request;
+    one that does not fit the asset, e.g. a stale one, is overwritten.
+    """
+    offset = await hass.async_add_executor_job(_partial_size, path)
+    if not await _async_write_original(hass, hub, asset_id, path, offset):
+        _LOGGER.debug("Restarting the download of %s from scratch", asset_id)
+        await _async_write_original(hass, hub, asset_id, path, 0)
+    await hass.async_add_executor_job(os.replace, path + _PARTIAL_SUFFIX, path)
+
+
+async def async_download_archive(
+    hass: HomeAssistant, hub: ImmichHub, asset_ids: list[str], path: str
+) -> None:
+    """Download a zip archive of assets to path.
+
+    The server builds archives while sending them, so they cannot be
+    resumed; an interrupted archive starts over on the next attempt.
+    """
+    async with hub.download_archive(asset_ids) as response:
+        await _async_write_body(hass, response, path, False)
+    await hass.async_add_executor_job(os.replace, path + _PARTIAL_SUFFIX, path)
+
+
+async def async_download_assets(
+    hass: HomeAssistant,
+    hub: ImmichHub,
+    asset_ids: list[str],
+    album_id: str | None,
+    target: str,
+    max_parallel: int = DEFAULT_MAX_PARALLEL_DOWNLOADS,
+) -> DownloadResult:
+    """Download the originals of assets, or of an album, into target.
+
+    Files keep their original names; files already in target are skipped.
+    Album assets are listed a page at a time, and at most max_parallel
+    downloads run at once.
+    """
+    result = DownloadResult(downloaded={}, skipped=[], failed={})
+    semaphore = asyncio.Semaphore(max_parallel)
+    names: set[str] = set()
+
+    async def _download(asset_id: str, asset: dict | None) -> None:
+        async with semaphore:
+            try:
+                if asset is None:
+                    asset = await hub.get_asset(asset_id)
+                path = os.path.join(target, _unique_name(asset, names))
+                if await hass.async_add_executor_job(os.path.exists, path):
+                    result.skipped.append(path)
+                    return
+                await async_download_original(hass, hub, asset_id, path)
+            except (CannotConnect, ApiError, OSError) as err:
+                _LOGGER.debug("Unable to download %s: %s", asset_id, err)
+                result.failed[asset_id] = str(err) or type(err).__name__
+            else:
+                result.downloaded[asset_id] = path
+
+    if album_id is None:
+        await asyncio.gather(*(_download(asset_id, None) for asset_id in asset_ids))
+        return result
+
+    page = 1
+    while True:
+        assets, more = await hub.search_assets({"albumIds": [album_id]}, page)
+        await asyncio.gather(*(_download(asset["id"], asset) for asset in assets))
+        if not more:
+            return result
+        page += 1
+
+
+async def async_download_archives(
+    hass: HomeAssistant,
+    hub: ImmichHub,
+    asset_ids: list[str],
+    album_id: str | None,
+    target: str,
+    name: str,
+    max_parallel: int = DEFAULT_MAX_PARALLEL_DOWNLOADS,
+) -> DownloadResult:
+    """Download assets, or an album, as zip archives into target.
+
+    The server splits large downloads into several archives; each is saved
+    as name-<n>.zip and archives already in target are skipped.
+    """
+    info = await hub.get_download_info(asset_ids, album_id)
+    archives: list[dict] = info["archives"]
+    result = DownloadResult(downloaded={}, skipped=[], failed={})
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def _download(number: int, archive: dict) -> None:
+        filename = f"{name}.zip" if len(archives) == 1 else f"{name}-{number}.zip"
+        path = os.path.join(target, filename)
+        async with semaphore:
+            if await hass.async_add_executor_job(os.path.exists, path):
+                result.skipped.append(path)
+                return
+            try:
+                await async_download_archive(hass, hub, archive["assetIds"], path)
+            except (CannotConnect, ApiError, OSError) as err:
+                _LOGGER.debug("Unable to download %s: %s", filename, err)
+                result.failed[filename] = str(err) or type(err).__name__
+            else:
+                result.downloaded[filename] = path
+
+    await asyncio.gather(
+        *(_download(number, archive) for number, archive in enumerate(archives, 1))
+    )
+    return result
+
+
+def _unique_name(asset: dict, names: set[str]) -> str:
+    """Return the original file name, made unique within one download."""
+    name = os.path.basename(asset.get("originalFileName") or asset["id"])
+    if name in names:
+        stem, ext = os.path.splitext(name)
+        name = f"{stem}-{asset['id'][:8]}{ext}"
+    names.add(name)
+    return name
@@ -0,0 +1,69 @@
+"""Base entity for the Immich Integration."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import ImmichJobsCoordinator
+from .models import Job
+
+
+def immich_device_info(entry_id: str) -> dr.DeviceInfo:
+    """Return the device of a config entry, one API key on one server."""
+    return dr.DeviceInfo(
+        identifiers={(DOMAIN, entry_id)},
+        manufacturer="Immich",
+        entry_type=dr.DeviceEntryType.SERVICE,
+    )
+
+
+class ImmichJobEntity(CoordinatorEntity[ImmichJobsCoordinator]):
+    """Entity bound to a single job queue of the shared snapshot.
+
+    State is only written when the coordinator reports the queue as changed
+    or the entity's availability flips, so unchanged queues do not produce
+    state writes or recorder rows.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: ImmichJobsCoordinator, job_name: str) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.hub = coordinator.hub
+        self.job_name = job_name
+        self._was_available = True
+
+        self._attr_device_info = immich_device_info(
+            coordinator.config_entry.entry_id
+        )
+        self.update_entity(coordinator.data[job_name])
+
+    @abstractmethod
+    def update_entity(self, job: Job) -> None:
+        """Update the entity attributes from the queue's job data."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Apply the shared snapshot if this queue changed."""
+        available = self.available
+        if (
+            self.job_name not in self.coordinator.changed_queues
+            and available == self._was_available
+        ):
+            self.coordinator.skipped_writes += 1
+            return
+        self._was_available = available
+        if (job := self.coordinator.data.get(self.job_name)) is not None:
+            self.update_entity(job)
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if the queue is present in the latest snapshot."""
+        return super().available and self.job_name in self.coordinator.data
@@ -0,0 +1,267 @@
+"""Asset events for the Immich Integration."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE_ID, CONF_TYPE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .asset_index import AlbumIndex, AlbumIndexStore
+    from .hub import ImmichHub
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_IMMICH = f"{DOMAIN}_event"
+TRIGGER_ASSET_UPLOADED = "asset_uploaded"
+TRIGGER_ALBUM_ASSET_ADDED = "album_asset_added"
+TRIGGER_PERSON_RECOGNIZED = "person_recognized"
+TRIGGER_TYPES = (
+    TRIGGER_ASSET_UPLOADED,
+    TRIGGER_ALBUM_ASSET_ADDED,
+    TRIGGER_PERSON_RECOGNIZED,
+)
+
+EVENTS_INTERVAL = timedelta(minutes=1)
+_STORAGE_VERSION = 1
+# Queues a new asset passes through before its faces are recognized.
+_FACE_PIPELINE = (
+    "metadataExtraction",
+    "thumbnailGeneration",
+    "faceDetection",
+    "facialRecognition",
+)
+
+
+@dataclass
+class AssetCursor:
+    """Position in the stream of assets ordered by creation time.
+
+    position is the newest createdAt reported; seen holds the IDs created at
+    exactly that instant, so assets sharing a timestamp are neither skipped
+    nor reported twice.
+    """
+
+    position: str
+    seen: set[str] = field(default_factory=set)
+
+    def is_new(self, created_at: str, asset_id: str) -> bool:
+        """Return if an asset lies beyond the cursor."""
+        return created_at > self.position or (
+            created_at == self.position and asset_id not in self.seen
+        )
+
+    def advance(self, created_at: str, asset_id: str) -> None:
+        """Move the cursor past a reported asset."""
+        if created_at > self.position:
+            self.position = created_at
+            self.seen = {asset_id}
+        elif created_at == self.position:
+            self.seen.add(asset_id)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation."""
+        return {"position": self.position, "seen": sorted(self.seen)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> AssetCursor:
+        """Restore a cursor saved with as_dict."""
+        return cls(position=data["position"], seen=set(data["seen"]))
+
+
+def _timestamp(when: datetime) -> str:
+    """Format a time the way Immich does, e.g. 2024-01-01T00:00:00.000Z."""
+    return (
+        dt_util.as_utc(when)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+class AssetEventTracker:
+    """Fire events for new uploads, album additions and recognized people.
+
+    New assets are found from a persisted creation-time cursor, so each poll
+    fetches only what was uploaded since the last one, and the cursor is
+    saved before the events it produced are fired, so restarts and
+    reconnects never repeat an event. People are reported from a second cursor
+    that trails the first and only moves while the face pipeline is idle,
+    so an asset is looked at once, after its faces have been recognized.
+    Album additions come from the watched album indexes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        hub: ImmichHub,
+        albums: AlbumIndexStore,
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.entry = entry
+        self.hub = hub
+        self.albums = albums
+        self.fired = 0
+        self._uploads: AssetCursor | None = None
+        self._faces: AssetCursor | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, _STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.events"
+        )
+        self._lock = asyncio.Lock()
+        self._device_id: str | None = None
+
+    async def async_load(self) -> None:
+        """Load the cursors saved by a previous run."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self._uploads = AssetCursor.from_dict(data["uploads"])
+        self._faces = AssetCursor.from_dict(data["faces"])
+
+    @callback
+    def async_start(self) -> None:
+        """Poll for new assets until the entry is unloaded."""
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass, self._async_scheduled_poll, EVENTS_INTERVAL
+            )
+        )
+        self.entry.async_on_unload(
+            self.albums.async_add_listener(self._async_album_assets_added)
+        )
+        self.async_request_poll()
+
+    @callback
+    def async_handle_push_event(self, event: str) -> None:
+        """Poll right away when the live event channel reports an upload."""
+        if event == "on_upload_success":
+            self.async_request_poll()
+
+    @callback
+    def async_request_poll(self) -> None:
+        """Start a poll unless one is running; it will see the new assets too."""
+        if self._lock.locked():
+            return
+        self.entry.async_create_background_task(
+            self.hass, self.async_poll(), f"{DOMAIN} asset events {self.entry.title}"
+        )
+
+    @callback
+    def _async_scheduled_poll(self, now: datetime) -> None:
+        self.async_request_poll()
+
+    async def async_poll(self) -> None:
+        """Fire events for the assets created since the last poll."""
+        async with self._lock:
+            try:
+                await self._async_poll()
+            except HomeAssistantError as err:
+                _LOGGER.debug("Unable to poll for new assets: %s", err)
+
+    async def _async_poll(self) -> None:
+        now = _timestamp(dt_util.utcnow())
+        if self._uploads is None or self._faces is None:
+            # First start: report what is uploaded from now on, not the library.
+            self._uploads = AssetCursor(now)
+            self._faces = AssetCursor(now)
+            await self._store.async_save(self._data_to_save())
+            return
+
+        # Assets reported by earlier polls were created before this snapshot.
+        faces_until = self._uploads.position
+        jobs = await self.hub.get_jobs(True)
+
+        if uploaded := await self.hub.fetch_new_assets(self._uploads, now):
+            await self._store.async_save(self._data_to_save())
+        for asset in uploaded:
+            self._fire(TRIGGER_ASSET_UPLOADED, _asset_data(asset))
+
+        if any(
+            (job := jobs.get(name)) is not None and job.counts.backlog
+            for name in _FACE_PIPELINE
+        ):
+            return
+        if recognized := await self.hub.fetch_new_assets(
+            self._faces, faces_until, with_people=True
+        ):
+            await self._store.async_save(self._data_to_save())
+        for asset in recognized:
+            for person in asset.get("people") or ():
+                if person.get("name"):
+                    self._fire(
+                        TRIGGER_PERSON_RECOGNIZED,
+                        {
+                            **_asset_data(asset),
+                            "person_id": person["id"],
+                            "person_name": person["name"],
+                        },
+                    )
+
+    @callback
+    def _async_album_assets_added(
+        self, album_id: str, index: AlbumIndex, asset_ids: list[str]
+    ) -> None:
+        for asset_id in asset_ids:
+            self._fire(
+                TRIGGER_ALBUM_ASSET_ADDED,
+                {"asset_id": asset_id, "album_id": album_id, "album_name": index.name},
+            )
+
+    def _fire(self, trigger_type: str, data: dict[str, Any]) -> None:
+        user = self.hub.user_info or {}
+        self.hass.bus.async_fire(
+            EVENT_IMMICH,
+            {
+                CONF_DEVICE_ID: self._get_device_id(),
+                CONF_TYPE: trigger_type,
+                "config_entry_id": self.entry.entry_id,
+                "user_id": user.get("id"),
+                "user_name": user.get("name"),
+                **data,
+            },
+        )
+        self.fired += 1
+
+    def _get_device_id(self) -> str | None:
+        if self._device_id is None and (
+            device := dr.async_get(self.hass).async_get_device(
+                identifiers={(DOMAIN, self.entry.entry_id)}
+            )
+        ):
+            self._device_id = device.id
+        return self._device_id
+
+    def _data_to_save(self) -> dict[str, Any]:
+        assert self._uploads is not None and self._faces is not None
+        return {"uploads": self._uploads.as_dict(), "faces": self._faces.as_dict()}
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the cursors and event count for diagnostics."""
+        return {
+            "fired": self.fired,
+            "uploads": self._uploads.position if self._uploads else None,
+            "faces": self._faces.position if self._faces else None,
+        }
+
+
+def _asset_data(asset: dict) -> dict[str, Any]:
+    return {
+        "asset_id": asset["id"],
+        "asset_type": asset.get("type"),
+        "file_name": asset.get("originalFileName"),
+        "owner_id": asset.get("ownerId"),
+    }
@@ -2,134 +2,1052 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import Any, BinaryIO
 from urllib.parse import urljoin
 from datetime import datetime
 import aiohttp
 
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.util.json import json_loads
+
+from .asset_index import AlbumIndex, PackedIdSet
+from .cache import SingleFlight
+from .events import AssetCursor
+from .metrics import RequestMetrics
+from .models import Job, parse_jobs
+from .throughput import JobThroughput
 
 _HEADER_API_KEY = "x-api-key"
 _LOGGER = logging.getLogger(__name__)
 
-_ALLOWED_MIME_TYPES = ["image/png", "image/jpeg"]
+_ALLOWED_MIME_TYPES = ["image/png", "image/jpeg", "image/webp"]
+_MAX_IMAGE_BYTES = 20 * 1024 * 1024
+_CHUNK_SIZE = 64 * 1024
+_SEARCH_PAGE_SIZE = 1000
 
+DEFAULT_LIMIT_PER_HOST = 4
+DEFAULT_TRANSFER_LIMIT_PER_HOST = 16
+DEFAULT_JOBS_CACHE_TTL = 5.0
+DEFAULT_MAX_PARALLEL_COMMANDS = 4
+DEFAULT_RATE_LIMIT = 20.0
+DEFAULT_RATE_BURST = 40
+UPLOAD_DEVICE_ID = "home-assistant"
+_DNS_CACHE_TTL = 300
+_KEEPALIVE_TIMEOUT = 60
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+# Streams may run for as long as a video plays; only stalls are errors.
+_STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
 
-class ImmichHub:
-    """Immich API hub."""
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 5.0
+_RETRY_STATUSES = (502, 503, 504)
+_BREAKER_THRESHOLD = 3
+_BREAKER_MIN_INTERVAL = 10.0
+_BREAKER_MAX_INTERVAL = 300.0
+
+
+class CircuitBreaker:
+    """Short-circuit requests while the server is unreachable.
+
+    After threshold consecutive failures the breaker opens and requests fail
+    immediately without touching the network. Once the probe interval has
+    passed a single request is let through; success closes the breaker,
+    failure reopens it with a doubled interval.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = _BREAKER_THRESHOLD,
+        min_interval: float = _BREAKER_MIN_INTERVAL,
+        max_interval: float = _BREAKER_MAX_INTERVAL,
+    ) -> None:
+        """Initialize the breaker."""
+        self._name = name
+        self._threshold = threshold
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._interval = min_interval
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return if requests are being short-circuited."""
+        return self._opened_at is not None
+
+    def retry_in(self) -> float:
+        """Return the seconds until the next probe is allowed."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._interval - time.monotonic())
+
+    def before_request(self) -> bool:
+        """Raise CannotConnect if a request must not be sent now.
+
+        Returns whether the request is the probe of an open breaker.
+        """
+        if self._opened_at is None:
+            return False
+        if self._probing or self.retry_in() > 0:
+            raise CannotConnect(f"{self._name} is unreachable")
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        if self._opened_at is not None:
+            _LOGGER.info("Connection to %s restored", self._name)
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._interval = self._min_interval
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold."""
+        self._failures += 1
+        if self._probing:
+            self._probing = False
+            self._interval = min(self._interval * 2, self._max_interval)
+            self._opened_at = time.monotonic()
+        elif self._opened_at is None and self._failures >= self._threshold:
+            _LOGGER.warning(
+                "%s is unreachable, pausing requests for %.0f s",
+                self._name,
+                self._interval,
+            )
+            self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Allow another probe if the current one ended without a result."""
+        self._probing = False
+
+
+@dataclass(slots=True)
+class _AttemptTrace:
+    """What the connection pool did for one request attempt."""
+
+    queued: bool = False
+
+
+async def _on_connection_queued_start(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceConnectionQueuedStartParams,
+) -> None:
+    if isinstance(attempt := context.trace_request_ctx, _AttemptTrace):
+        attempt.queued = True
+
+
+async def _on_connection_queued_end(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceConnectionQueuedEndParams,
+) -> None:
+    if isinstance(attempt := context.trace_request_ctx, _AttemptTrace):
+        attempt.queued = False
+
+
+def _create_session(
+    limit_per_host: int, timeout: aiohttp.ClientTimeout
+) -> aiohttp.ClientSession:
+    """Create a pooled session that traces waits for a free connection."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_queued_start.append(_on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(_on_connection_queued_end)
+    connector = aiohttp.TCPConnector(
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=_DNS_CACHE_TTL,
+        keepalive_timeout=_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector, timeout=timeout, trace_configs=[trace_config]
+    )
+
+
+class TokenBucket:
+    """Spread requests to a server over time.
+
+    Up to burst requests go out at once; beyond that each request reserves
+    the next token and waits for it, so callers are served in order at the
+    given rate per second.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the bucket, full."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self.throttled = 0
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            self.throttled += 1
+            await asyncio.sleep(-self._tokens / self._rate)
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Return the limiter settings and how often it delayed a request."""
+        return {"rate": self._rate, "burst": self._burst, "throttled": self.throttled}
+
+
+class JobSnapshot:
+    """Job queues of one server, shared by every hub talking to it.
+
+    Concurrent refreshes share a single in-flight request, and a fresh
+    snapshot may be served from cache. Listeners receive every new snapshot,
+    so entries for other users of the server follow along without polling.
+    """
+
+    def __init__(self, cache_ttl: float) -> None:
+        """Initialize an empty snapshot."""
+        self.jobs: dict[str, Job] = {}
+        self.throughput: dict[str, JobThroughput] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_ttl = cache_ttl
+        self._fetched_at: float | None = None
+        self._generation = 0
+        self._request: SingleFlight[None, None] = SingleFlight()
+        self._listeners: list[Callable[[dict[str, Job]], None]] = []
+
+    async def async_get(
+        self, fetch: Callable[[], Awaitable[dict[str, Job]]], cache: bool
+    ) -> dict[str, Job]:
+        """Return the snapshot, served from cache while it is fresh."""
+        if cache and self._fresh():
+            self.cache_hits += 1
+            return self.jobs
+        self.cache_misses += 1
+        await self.async_refresh(fetch)
+        return self.jobs
+
+    async def async_refresh(self, fetch: Callable[[], Awaitable[dict[str, Job]]]) -> None:
+        """Fetch a new snapshot, or join the request already in flight."""
+        await self._request.async_run(None, lambda: self._async_update(fetch))
+
+    async def _async_update(self, fetch: Callable[[], Awaitable[dict[str, Job]]]) -> None:
+        """Store a fetched snapshot and hand it to the listeners."""
+        generation = self._generation
+        jobs = await fetch()
+        if generation != self._generation:
+            # Superseded by a write; the answer may predate it.
+            return
 
-    def __init__(self, host: str, api_key: str) -> None:
+        now = time.monotonic()
+        for name, job in jobs.items():
+            self.throughput.setdefault(name, JobThroughput()).add_sample(
+                now, job.counts
+            )
+
+        # Keep the instances entities already hold for unchanged queues.
+        for name in jobs.keys() - diff_jobs(self.jobs, jobs):
+            jobs[name] = self.jobs[name]
+        self.jobs = jobs
+        self._fetched_at = now
+        for listener in list(self._listeners):
+            listener(jobs)
+
+    def _fresh(self) -> bool:
+        """Return if the snapshot is within its TTL."""
+        return (
+            self._fetched_at is not None
+            and time.monotonic() - self._fetched_at < self._cache_ttl
+        )
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot after a write.
+
+        A request already in flight may have been answered before the write,
+        so later callers start a fresh one instead of joining it, and its
+        answer is neither stored nor handed to the listeners.
+        """
+        self._generation += 1
+        self._fetched_at = None
+        self._request.forget(None)
+
+    def add_listener(
+        self, listener: Callable[[dict[str, Job]], None]
+    ) -> Callable[[], None]:
+        """Call listener with every new snapshot until the returned callback."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def cancel(self) -> None:
+        """Cancel the request in flight."""
+        self._request.cancel()
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Return cache counters."""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "coalesced": self._request.coalesced_calls,
+        }
+
+
+class ServerStatistics:
+    """Statistics of one server, shared by every hub talking to it.
+
+    The endpoint is expensive on large libraries, so concurrent fetches
+    share a single request, and listeners receive every result; entries for
+    other users of the server follow along without polling it themselves.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with nothing fetched."""
+        self._request: SingleFlight[None, dict] = SingleFlight()
+        self._listeners: list[Callable[[dict], None]] = []
+
+    async def async_get(self, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        """Fetch the statistics, or join the request already in flight."""
+        return await self._request.async_run(None, lambda: self._async_update(fetch))
+
+    async def _async_update(self, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        """Fetch the statistics and hand them to the listeners."""
+        statistics = await fetch()
+        for listener in list(self._listeners):
+            listener(statistics)
+        return statistics
+
+    def add_listener(self, listener: Callable[[dict], None]) -> Callable[[], None]:
+        """Call listener with every fetch until the returned callback."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def cancel(self) -> None:
+        """Cancel the request in flight."""
+        self._request.cancel()
+
+
+class ImmichServer:
+    """Connection state shared by every hub for the same Immich server.
+
+    Entries for different users of one server share the connection pools,
+    the circuit breaker, the rate limit, the job snapshot and the
+    statistics, since job queues and statistics are server-wide. Everything tied to an API key stays on the hub.
+    The server is closed when the last hub using it is.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        transfer_limit_per_host: int = DEFAULT_TRANSFER_LIMIT_PER_HOST,
+        jobs_cache_ttl: float = DEFAULT_JOBS_CACHE_TTL,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_burst: int = DEFAULT_RATE_BURST,
+    ) -> None:
         """Initialize."""
         self.host = host
+        self.breaker = CircuitBreaker(host)
+        self.limiter = TokenBucket(rate_limit, rate_burst)
+        self.snapshot = JobSnapshot(jobs_cache_ttl)
+        self.statistics = ServerStatistics()
+        self.users = 0
+        self.closed = False
+        self._limit_per_host = limit_per_host
+        self._transfer_limit_per_host = transfer_limit_per_host
+        self._session: aiohttp.ClientSession | None = None
+        self._transfer_session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on first use.
+
+        The session lives as long as the server is in use so that polls
+        reuse keep-alive connections instead of paying a new TCP and TLS
+        handshake each time.
+        """
+        if self._session is None or self._session.closed:
+            self._session = _create_session(self._limit_per_host, _REQUEST_TIMEOUT)
+        return self._session
+
+    @property
+    def transfer_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session for long transfers.
+
+        Downloads, uploads, video streams and the event channel hold their
+        connection for as long as they run. On a pool of their own they
+        cannot take the connections polls need, and requests wait for a
+        free connection without a time limit.
+        """
+        if self._transfer_session is None or self._transfer_session.closed:
+            self._transfer_session = _create_session(
+                self._transfer_limit_per_host, _STREAM_TIMEOUT
+            )
+        return self._transfer_session
+
+    async def async_release(self) -> None:
+        """Drop one user, closing the session after the last one."""
+        self.users -= 1
+        if self.users > 0:
+            return
+        self.closed = True
+        self.snapshot.cancel()
+        self.statistics.cancel()
+        for session in (self._session, self._transfer_session):
+            if session is not None and not session.closed:
+                await session.close()
+        self._session = None
+        self._transfer_session = None
+
+
+class ImmichHub:
+    """Immich API hub for one API key."""
+
+    def __init__(
+        self, host: str, api_key: str, server: ImmichServer | None = None
+    ) -> None:
+        """Initialize, on a server of its own unless one is shared."""
+        self.host = host
         self.api_key = api_key
-        self.jobs = {}
+        self.user_info: dict | None = None
+        self.server = server or ImmichServer(host)
+        self.server.users += 1
+        self.metrics = RequestMetrics()
 
-    async def authenticate(self) -> bool:
-        """Test if we can authenticate with the host."""
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the server's pooled session."""
+        return self.server.session
+
+    @property
+    def transfer_session(self) -> aiohttp.ClientSession:
+        """Return the server's session for long transfers."""
+        return self.server.transfer_session
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Return the server's circuit breaker."""
+        return self.server.breaker
+
+    @property
+    def jobs(self) -> dict[str, Job]:
+        """Return the server's latest job snapshot."""
+        return self.server.snapshot.jobs
+
+    @jobs.setter
+    def jobs(self, jobs: dict[str, Job]) -> None:
+        self.server.snapshot.jobs = jobs
+
+    @property
+    def throughput(self) -> dict[str, JobThroughput]:
+        """Return the per-queue throughput of the server."""
+        return self.server.snapshot.throughput
+
+    async def async_close(self) -> None:
+        """Stop using the server, closing it if no other hub does."""
+        await self.server.async_release()
+
+    @asynccontextmanager
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        retry: bool | None = None,
+        transfer: bool = False,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request through the circuit breaker.
+
+        Every attempt waits for the server's rate limit. Idempotent requests,
+        GETs unless told otherwise, are retried with jittered exponential
+        backoff on connection and gateway errors. Transfers go through the
+        transfer session. A timeout while waiting for a free connection of
+        the pool is not held against the server.
+        Connection errors, including ones while reading the body, are raised
+        as CannotConnect. Every attempt is recorded in the hub's metrics,
+        with the latency measured until the body has been consumed.
+        """
+        if retry is None:
+            retry = method == "GET"
+        attempts = _RETRY_ATTEMPTS if retry else 1
+        session = self.transfer_session if transfer else self.session
+        url = urljoin(self.host, path)
+        headers = {
+            "Accept": "application/json",
+            _HEADER_API_KEY: self.api_key,
+            **(headers or {}),
+        }
+
+        probe = False
         try:
-            async with aiohttp.ClientSession() as session:
-                url = urljoin(self.host, "/api/auth/validateToken")
-                headers = {"Accept": "application/json", _HEADER_API_KEY: self.api_key}
+            for attempt in range(attempts):
+                if attempt:
+                    await asyncio.sleep(_retry_delay(attempt))
+                probe = self.breaker.before_request() or probe
+                await self.server.limiter.acquire()
+                started = time.perf_counter()
+                trace = _AttemptTrace()
+                try:
+                    response = await session.request(
+                        method,
+                        url=url,
+                        headers=headers,
+                        trace_request_ctx=trace,
+                        **kwargs,
+                    )
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exception:
+                    _LOGGER.debug("Error connecting to the API: %s", exception)
+                    self.metrics.record(
+                        method, path, time.perf_counter() - started, None, 0
+                    )
+                    if not trace.queued:
+                        self.breaker.record_failure()
+                    if attempt + 1 == attempts:
+                        raise CannotConnect from exception
+                    continue
+
+                if response.status not in _RETRY_STATUSES:
+                    self.breaker.record_success()
+                    break
+                self.breaker.record_failure()
+                if attempt + 1 == attempts:
+                    break
+                self.metrics.record(
+                    method, path, time.perf_counter() - started, response.status, 0
+                )
+                response.release()
+
+            status: int | None = response.status
+            try:
+                yield response
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exception:
+                _LOGGER.debug("Error reading from the API: %s", exception)
+                status = None
+                raise CannotConnect from exception
+            finally:
+                self.metrics.record(
+                    method,
+                    path,
+                    time.perf_counter() - started,
+                    status,
+                    response.content.total_bytes,
+                )
+                response.release()
+        finally:
+            if probe:
+                self.breaker.release_probe()
+
+    async def _request_json(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request and decode the JSON response.
+
+        The body is decoded straight from bytes with the fast JSON decoder
+        rather than going through an intermediate text copy.
+        """
+        async with self._request(method, path, **kwargs) as response:
+            if response.status not in (200, 201):
+                raw_result = await response.text()
+                _LOGGER.error("Error from API: body=%s", raw_result)
+                if response.status == HTTPStatus.UNAUTHORIZED:
+                    raise InvalidAuth(status=response.status)
+                raise ApiError(status=response.status)
+
+            return json_loads(await response.read())
+
+    async def authenticate(self) -> bool:
+        """Test if we can authenticate with the host.
 
-                async with session.post(url=url, headers=headers) as response:
-                    if response.status != 200:
-                        raw_result = await response.text()
-                        _LOGGER.error("Error from API: body=%s", raw_result)
-                        return False
+        Returns False if the API key is rejected; other error responses
+        raise ApiError.
+        """
+        async with self._request("POST", "/api/auth/validateToken") as response:
+            if response.status != 200:
+                raw_result = await response.text()
+                _LOGGER.error("Error from API: body=%s", raw_result)
+                if response.status == HTTPStatus.UNAUTHORIZED:
+                    return False
+                raise ApiError(status=response.status)
 
-                    auth_result = await response.json()
+            auth_result = json_loads(await response.read())
 
-                    if not auth_result.get("authStatus"):
-                        raw_result = await response.text()
-                        _LOGGER.error("Error from API: body=%s", raw_result)
-                        return False
+            if not auth_result.get("authStatus"):
+                raw_result = await response.text()
+                _LOGGER.error("Error from API: body=%s", raw_result)
+                return False
 
-                    return True
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+            return True
 
     async def get_my_user_info(self) -> dict:
-        """Get user info."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                url = urljoin(self.host, "/api/users/me")
-                headers = {"Accept": "application/json", _HEADER_API_KEY: self.api_key}
+        """Get user info and keep it on the hub."""
+        user_info: dict = await self._request_json("GET", "/api/users/me")
+        self.user_info = user_info
+        return user_info
+
+    async def get_server_statistics(self) -> dict:
+        """Get asset counts and storage usage, in total and per user.
+
+        Concurrent callers, from any hub of the server, share a single
+        in-flight request instead of each issuing their own.
+        """
+        return await self.server.statistics.async_get(self._async_fetch_statistics)
+
+    async def _async_fetch_statistics(self) -> dict:
+        """Fetch /api/server/statistics."""
+        statistics: dict = await self._request_json("GET", "/api/server/statistics")
+        return statistics
+
+    def add_statistics_listener(
+        self, listener: Callable[[dict], None]
+    ) -> Callable[[], None]:
+        """Call listener with every statistics fetch for the server."""
+        return self.server.statistics.add_listener(listener)
+
+    async def get_albums(self) -> list[dict]:
+        """Return all albums, without their assets."""
+        albums: list[dict] = await self._request_json("GET", "/api/albums")
+        return albums
+
+    async def list_albums(self) -> dict[str, str]:
+        """Return album names keyed by album ID."""
+        return {album["id"]: album["albumName"] for album in await self.get_albums()}
+
+    async def list_people(self, page: int, size: int) -> tuple[list[dict], bool]:
+        """Return one page of named people and whether more pages follow."""
+        result: dict = await self._request_json(
+            "GET", "/api/people", params={"page": page, "size": size}
+        )
+        return result["people"], bool(result.get("hasNextPage"))
+
+    async def list_favorite_assets(self) -> list[str]:
+        """Return the IDs of all favorite images."""
+        asset_ids: list[str] = []
+        async for assets in self._search_metadata({"isFavorite": True, "type": "IMAGE"}):
+            asset_ids.extend(_image_ids(assets))
+        return asset_ids
+
+    async def search_assets(
+        self, query: dict[str, Any], page: int = 1, size: int = _SEARCH_PAGE_SIZE
+    ) -> tuple[list[dict], bool]:
+        """Return one page of a metadata search and whether more pages follow."""
+        return await self._search_page("/api/search/metadata", query, page, size)
+
+    async def smart_search(
+        self, query: dict[str, Any], page: int = 1, size: int = _SEARCH_PAGE_SIZE
+    ) -> tuple[list[dict], bool]:
+        """Return one page of a smart (CLIP) search and whether more pages follow.
+
+        Every call runs a model inference on the server.
+        """
+        return await self._search_page("/api/search/smart", query, page, size)
+
+    async def _search_page(
+        self, path: str, query: dict[str, Any], page: int, size: int
+    ) -> tuple[list[dict], bool]:
+        result: dict = await self._request_json(
+            "POST", path, retry=True, json={**query, "page": page, "size": size}
+        )
+        return result["assets"]["items"], result["assets"].get("nextPage") is not None
+
+    async def _search_metadata(self, query: dict[str, Any]) -> AsyncIterator[list[dict]]:
+        """Yield the pages of a metadata search, one list of assets at a time."""
+        page = 1
+        while True:
+            assets, more = await self.search_assets(query, page)
+            yield assets
+            if not more:
+                return
+            page += 1
+
+    async def sync_album(self, album_id: str, index: AlbumIndex) -> list[str]:
+        """Bring an album index up to date and return the assets it gained.
+
+        Assets updated since the index cursor are fetched and applied, so an
+        unchanged album costs two small requests whatever its size. Immich
+        exposes no album membership delta to API keys, so when the album's
+        asset count no longer matches the index it is rebuilt page by page.
+        Nothing counts as gained on the first sync of an album.
+        """
+        added: list[str] = []
+        album: dict = await self._request_json(
+            "GET", f"/api/albums/{album_id}", params={"withoutAssets": "true"}
+        )
+        index.name = album["albumName"]
+
+        if index.cursor is not None:
+            query = {
+                "albumIds": [album_id],
+                "updatedAfter": index.cursor,
+                "withDeleted": True,
+            }
+            async for assets in self._search_metadata(query):
+                for asset in assets:
+                    if asset.get("isTrashed"):
+                        index.asset_ids.discard(asset["id"])
+                    elif index.asset_ids.add(asset["id"]):
+                        added.append(asset["id"])
+                    index.cursor = max(index.cursor, asset["updatedAt"])
+
+        if index.cursor is None or len(index.asset_ids) != album["assetCount"]:
+            _LOGGER.debug("Rebuilding index of album %s", album_id)
+            keys: list[bytes] = []
+            cursor = ""
+            async for assets in self._search_metadata({"albumIds": [album_id]}):
+                for asset in assets:
+                    keys.append(uuid.UUID(asset["id"]).bytes)
+                    cursor = max(cursor, asset["updatedAt"])
+            rebuilt = PackedIdSet.from_packed(keys)
+            if index.cursor is not None:
+                added.extend(
+                    asset_id for asset_id in rebuilt if asset_id not in index.asset_ids
+                )
+            index.asset_ids = rebuilt
+            index.cursor = cursor or album["updatedAt"]
+
+        index.updated_at = album["updatedAt"]
+        return added
+
+    async def fetch_new_assets(
+        self, cursor: AssetCursor, before: str, with_people: bool = False
+    ) -> list[dict]:
+        """Return the assets created after the cursor and advance it past them.
+
+        Only assets created since the cursor are requested, so a poll costs
+        as much as was uploaded since the last one. Assets created after
+        before are left for a later call; bounding the query keeps its pages
+        stable while uploads continue.
+        """
+        query: dict[str, Any] = {
+            "createdAfter": cursor.position,
+            "createdBefore": before,
+            "withPeople": with_people,
+        }
+        new: dict[str, dict] = {}
+        async for assets in self._search_metadata(query):
+            for asset in assets:
+                if cursor.is_new(asset["createdAt"], asset["id"]) and (
+                    asset["createdAt"] <= before
+                ):
+                    new[asset["id"]] = asset
+        ordered = sorted(new.values(), key=lambda asset: asset["createdAt"])
+        for asset in ordered:
+            cursor.advance(asset["createdAt"], asset["id"])
+        return ordered
+
+    async def list_memory_assets(self) -> list[str]:
+        """Return the IDs of the images in the current memories."""
+        memories: list[dict] = await self._request_json("GET", "/api/memories")
+        return [
+            asset_id
+            for memory in memories
+            for asset_id in _image_ids(memory.get("assets", []))
+        ]
+
+    async def get_asset_thumbnail(
+        self, asset_id: str, size: str = "preview"
+    ) -> tuple[bytes, str]:
+        """Download an asset thumbnail.
+
+        The body is streamed and rejected as soon as it exceeds the size
+        limit. Returns the image and its content type.
+        """
+        async with self._request(
+            "GET",
+            f"/api/assets/{asset_id}/thumbnail",
+            headers={"Accept": ", ".join(_ALLOWED_MIME_TYPES)},
+            params={"size": size},
+        ) as response:
+            if response.status != 200:
+                raw_result = await response.text()
+                _LOGGER.error("Error from API: body=%s", raw_result)
+                raise ApiError(status=response.status)
+
+            if response.content_type not in _ALLOWED_MIME_TYPES:
+                _LOGGER.error(
+                    "Unsupported thumbnail type %s for asset %s",
+                    response.content_type,
+                    asset_id,
+                )
+                raise ApiError
+
+            if (response.content_length or 0) > _MAX_IMAGE_BYTES:
+                raise ApiError(f"Thumbnail for asset {asset_id} is too large")
 
-                async with session.get(url=url, headers=headers) as response:
-                    if response.status != 200:
-                        raw_result = await response.text()
-                        _LOGGER.error("Error from API: body=%s", raw_result)
-                        raise ApiError
+            image = bytearray()
+            async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                image.extend(chunk)
+                if len(image) > _MAX_IMAGE_BYTES:
+                    raise ApiError(f"Thumbnail for asset {asset_id} is too large")
 
-                    user_info: dict = await response.json()
+            return bytes(image), response.content_type
 
-                    return user_info
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+    @asynccontextmanager
+    async def stream_video(
+        self, asset_id: str, range_header: str | None = None
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Open the playable encoding of a video asset.
+
+        The body is left unread so callers can forward it chunk by chunk; a
+        Range header is passed through for seeking.
+        """
+        headers = {"Accept": "*/*"}
+        if range_header is not None:
+            headers["Range"] = range_header
+        async with self._request(
+            "GET",
+            f"/api/assets/{asset_id}/video/playback",
+            transfer=True,
+            headers=headers,
+        ) as response:
+            if response.status not in (200, 206):
+                raw_result = await response.text()
+                _LOGGER.error("Error from API: body=%s", raw_result)
+                raise ApiError(status=response.status)
+            yield response
+
+    async def get_asset(self, asset_id: str) -> dict:
+        """Return the details of an asset."""
+        asset: dict = await self._request_json("GET", f"/api/assets/{asset_id}")
+        return asset
+
+    @asynccontextmanager
+    async def download_original(
+        self, asset_id: str, offset: int = 0
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Open the original file of an asset, from offset onwards.
+
+        The body is left unread for the caller to write out chunk by chunk.
+        The status is 206 when the server honoured the offset, 200 when it
+        sent the whole file and 416 when the offset is already the end.
+        """
+        headers = {"Accept": "application/octet-stream"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        async with self._request(
+            "GET",
+            f"/api/assets/{asset_id}/original",
+            transfer=True,
+            headers=headers,
+        ) as response:
+            if response.status not in (200, 206, 416):
+                raw_result = await response.text()
+                _LOGGER.error("Error from API: body=%s", raw_result)
+                raise ApiError(status=response.status)
+            yield response
+
+    async def get_download_info(
+        self, asset_ids: list[str] | None = None, album_id: str | None = None
+    ) -> dict:
+        """Return how the server splits a download into archives."""
+        body: dict[str, Any] = (
+            {"albumId": album_id} if album_id is not None else {"assetIds": asset_ids}
+        )
+        info: dict = await self._request_json(
+            "POST", "/api/download/info", retry=True, json=body
+        )
+        return info
+
+    @asynccontextmanager
+    async def download_archive(
+        self, asset_ids: list[str]
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Open a zip archive of assets, built by the server as it is sent.
+
+        The body is left unread for the caller to write out chunk by chunk.
+        """
+        async with self._request(
+            "POST",
+            "/api/download/archive",
+            transfer=True,
+            headers={"Accept": "application/octet-stream"},
+            json={"assetIds": asset_ids},
+        ) as response:
+            if response.status != 200:
+                raw_result = await response.text()
+                _LOGGER.error("Error from API: body=%s", raw_result)
+                raise ApiError(status=response.status)
+            yield response
+
+    async def bulk_upload_check(self, checksums: dict[str, str]) -> dict[str, bool]:
+        """Ask which files are not on the server yet.
+
+        checksums maps a caller-chosen ID to the SHA-1 of a file; the result
+        maps each ID to whether the file should be uploaded.
+        """
+        result: dict = await self._request_json(
+            "POST",
+            "/api/assets/bulk-upload-check",
+            retry=True,
+            json={
+                "assets": [
+                    {"id": file_id, "checksum": checksum}
+                    for file_id, checksum in checksums.items()
+                ]
+            },
+        )
+        return {item["id"]: item["action"] == "accept" for item in result["results"]}
+
+    async def upload_asset(
+        self,
+        file: BinaryIO,
+        filename: str,
+        checksum: str,
+        modified_at: datetime,
+        device_asset_id: str,
+    ) -> str:
+        """Upload a file and return the ID of the asset.
+
+        The open file is streamed by aiohttp in chunks, read in the executor,
+        so it is never held in memory as a whole.
+        """
+        timestamp = modified_at.isoformat()
+        form = aiohttp.FormData()
+        form.add_field("deviceAssetId", device_asset_id)
+        form.add_field("deviceId", UPLOAD_DEVICE_ID)
+        form.add_field("fileCreatedAt", timestamp)
+        form.add_field("fileModifiedAt", timestamp)
+        form.add_field("assetData", file, filename=filename)
+        result: dict = await self._request_json(
+            "POST",
+            "/api/assets",
+            transfer=True,
+            headers={"x-immich-checksum": checksum},
+            data=form,
+        )
+        return result["id"]
 
     async def refresh_jobs(self, now: datetime | None = None):
-        """List Jobs."""
+        """List Jobs.
+
+        Concurrent callers, from any hub of the server, share a single
+        in-flight request instead of each issuing their own.
+        """
+        await self.server.snapshot.async_refresh(self._async_fetch_jobs)
+
+    async def _async_fetch_jobs(self) -> dict[str, Job]:
+        """Fetch and parse /api/jobs."""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = urljoin(self.host, "/api/jobs")
-                headers = {
-                    "Accept": "application/json",
-                    _HEADER_API_KEY: self.api_key,
-                }
-                data = {}
-
-                async with session.get(url=url, headers=headers, data=data) as response:
-                    if response.status != 200:
-                        raw_result = await response.text()
-                        _LOGGER.error("Error from API: body=%s", raw_result)
-                        raise ApiError
-
-                    self.jobs: dict = await response.json()
-
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
-
-    async def job_command(self, command: str, job_id: str) -> bool:
-        """Pause Job"""
+            return parse_jobs(await self._request_json("GET", "/api/jobs"))
+        except ValueError as err:
+            _LOGGER.error("Malformed jobs response: %s", err)
+            raise ApiError(str(err)) from err
+
+    async def job_command(self, command: str, job_id: str, force: bool = True) -> bool:
+        """Send a command to a job queue."""
+        data = {"command": command, "force": force}
         try:
-            async with aiohttp.ClientSession() as session:
-                url = urljoin(self.host, f"/api/jobs/{job_id}")
-                headers = {
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                    _HEADER_API_KEY: self.api_key,
-                }
-                data = {"command": "pause", "force": True}
-
-                async with session.put(url=url, headers=headers, data=data) as response:
-                    return response.status == 200
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
-
-    async def get_jobs(self, cache: bool) -> dict:
-        if not self.jobs or not cache:
-            await self.refresh_jobs()
-        return self.jobs
+            async with self._request("PUT", f"/api/jobs/{job_id}", json=data) as response:
+                return response.status == 200
+        finally:
+            self.invalidate_jobs()
+
+    async def job_commands(
+        self,
+        command: str,
+        job_ids: list[str],
+        force: bool = False,
+        max_parallel: int = DEFAULT_MAX_PARALLEL_COMMANDS,
+    ) -> dict[str, bool]:
+        """Send a command to several job queues concurrently.
+
+        At most max_parallel requests are in flight at once. Returns whether
+        the command succeeded for each queue; a connection error marks only
+        that queue as failed.
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+
+        async def _send(job_id: str) -> bool:
+            async with semaphore:
+                try:
+                    return await self.job_command(command, job_id, force)
+                except CannotConnect:
+                    return False
+
+        results = await asyncio.gather(*(_send(job_id) for job_id in job_ids))
+        return dict(zip(job_ids, results))
+
+    async def get_jobs(self, cache: bool) -> dict[str, Job]:
+        """Return the job snapshot, served from cache while it is fresh."""
+        return await self.server.snapshot.async_get(self._async_fetch_jobs, cache)
+
+    def invalidate_jobs(self) -> None:
+        """Drop the cached job snapshot after a write."""
+        self.server.snapshot.invalidate()
+
+    def add_jobs_listener(
+        self, listener: Callable[[dict[str, Job]], None]
+    ) -> Callable[[], None]:
+        """Call listener with every job snapshot fetched for the server."""
+        return self.server.snapshot.add_listener(listener)
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Return job cache counters."""
+        return self.server.snapshot.cache_stats
 
     async def pause(self, job_id: str) -> bool:
-        return self.job_command("pause", job_id)
+        return await self.job_command("pause", job_id)
+
+    async def resume(self, job_id: str) -> bool:
+        return await self.job_command("resume", job_id)
 
     async def start(self, job_id: str) -> bool:
-        return self.job_command("start", job_id)
+        return await self.job_command("start", job_id)
 
 
-class CannotConnect(HomeAssistantError):
-    """Error to indicate we cannot connect."""
+def _retry_delay(attempt: int) -> float:
+    """Return a jittered exponential backoff delay for a retry attempt."""
+    delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
 
+def _image_ids(assets: list[dict]) -> list[str]:
+    """Return the IDs of the image assets in a list of assets."""
+    return [asset["id"] for asset in assets if asset.get("type") == "IMAGE"]
 
-class InvalidAuth(HomeAssistantError):
-    """Error to indicate there is invalid auth."""
+
+def diff_jobs(old: dict[str, Job], new: dict[str, Job]) -> set[str]:
+    """Return the names of queues whose status or counts differ.
+
+    Queues that appeared or disappeared between the two snapshots count as
+    changed as well.
+    """
+    changed = set(old.keys() ^ new.keys())
+    for name, job in new.items():
+        previous = old.get(name)
+        if previous is not None and job != previous:
+            changed.add(name)
+    return changed
+
+
+class CannotConnect(HomeAssistantError):
+    """Error to indicate we cannot connect."""
 
 
 class ApiError(HomeAssistantError):
     """Error to indicate that the API returned an error."""
+
+    def __init__(self, *args: object, status: int | None = None) -> None:
+        """Initialize with the HTTP status of the response, if any."""
+        super().__init__(*args)
+        self.status = status
+
+
+class InvalidAuth(ApiError):
+    """Error to indicate the server rejected the API key."""
@@ -0,0 +1,273 @@
+"""Platform for Image integration."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime, timedelta
+import logging
+import random
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .asset_index import AlbumIndexStore
+from .cache import ThumbnailCache
+from .const import (
+    CONF_ROTATION_NO_REPEAT,
+    CONF_WATCHED_ALBUMS,
+    DEFAULT_ROTATION_NO_REPEAT,
+    DOMAIN,
+)
+from .coordinator import ImmichData
+from .entity import immich_device_info
+from .hub import ApiError, CannotConnect, ImmichHub
+
+SCAN_INTERVAL = timedelta(minutes=5)
+_ID_LIST_REFRESH_INTERVAL = timedelta(hours=12)
+_THUMBNAIL_SIZE = "preview"
+_POOL_SIZE = 3
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Immich Image platform."""
+
+    entry_id = config_entry.entry_id
+    data: ImmichData = hass.data[DOMAIN][entry_id]
+    no_repeat = config_entry.options.get(
+        CONF_ROTATION_NO_REPEAT, DEFAULT_ROTATION_NO_REPEAT
+    )
+
+    entities: list[BaseImmichImage] = [
+        ImmichFavoriteImage(hass, entry_id, data.hub, data.thumbnails, no_repeat),
+        ImmichMemoryImage(hass, entry_id, data.hub, data.thumbnails, no_repeat),
+    ]
+    entities.extend(
+        ImmichAlbumImage(
+            hass, entry_id, data.hub, data.thumbnails, no_repeat, data.albums, album_id
+        )
+        for album_id in config_entry.options.get(CONF_WATCHED_ALBUMS, [])
+    )
+    async_add_entities(entities)
+
+
+class RotationPool:
+    """Prefetched queue of upcoming random assets for a slideshow entity.
+
+    The next few images are downloaded in the background ahead of their
+    slot, so a slideshow tick is served from memory. Assets shown within the
+    last no_repeat picks are skipped while other assets are available.
+    """
+
+    def __init__(
+        self,
+        hub: ImmichHub,
+        thumbnails: ThumbnailCache,
+        load_asset_ids: Callable[[], Awaitable[Sequence[str]]],
+        no_repeat: int,
+        pool_size: int = _POOL_SIZE,
+    ) -> None:
+        """Initialize the pool."""
+        self.hub = hub
+        self._thumbnails = thumbnails
+        self._load_asset_ids = load_asset_ids
+        self._pool_size = pool_size
+        self._asset_ids: Sequence[str] = []
+        self._recent: deque[str] = deque(maxlen=max(no_repeat, 1))
+        self._pool: deque[tuple[str, bytes, str]] = deque()
+        self._fill_lock = asyncio.Lock()
+
+    async def async_refresh_ids(self, now: datetime | None = None) -> None:
+        """Reload the list of assets to pick from."""
+        try:
+            self._asset_ids = await self._load_asset_ids()
+        except (CannotConnect, ApiError) as err:
+            _LOGGER.debug("Unable to refresh asset list: %s", err)
+            return
+        self._pool = deque(item for item in self._pool if item[0] in self._asset_ids)
+
+    async def async_fill(self) -> None:
+        """Download assets until the pool is full."""
+        async with self._fill_lock:
+            if not self._asset_ids:
+                await self.async_refresh_ids()
+            while len(self._pool) < self._pool_size:
+                if (asset_id := self._pick()) is None:
+                    return
+                try:
+                    image, content_type = await self._thumbnails.async_get(
+                        asset_id, _THUMBNAIL_SIZE, self.hub.get_asset_thumbnail
+                    )
+                except (CannotConnect, ApiError) as err:
+                    _LOGGER.debug("Unable to prefetch %s: %s", asset_id, err)
+                    return
+                self._pool.append((asset_id, image, content_type))
+
+    def pop(self) -> tuple[str, bytes, str] | None:
+        """Return the next prefetched asset without any network access."""
+        if not self._pool:
+            return None
+        return self._pool.popleft()
+
+    def _pick(self) -> str | None:
+        """Pick a random asset outside the no-repeat window when possible."""
+        if not self._asset_ids:
+            return None
+        pooled = {asset_id for asset_id, _, _ in self._pool}
+        excluded = pooled.union(self._recent)
+        if len(excluded) >= len(self._asset_ids):
+            # Every asset was shown recently; only avoid back-to-back repeats.
+            excluded = pooled
+            if self._recent:
+                excluded.add(self._recent[-1])
+        for _ in range(8):
+            asset_id = random.choice(self._asset_ids)
+            if asset_id not in excluded:
+                break
+        else:
+            candidates = [i for i in self._asset_ids if i not in excluded]
+            asset_id = random.choice(candidates or self._asset_ids)
+        self._recent.append(asset_id)
+        return asset_id
+
+
+class BaseImmichImage(ImageEntity):
+    """Image entity rotating through random assets of an Immich source."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        hub: ImmichHub,
+        thumbnails: ThumbnailCache,
+        no_repeat: int,
+    ) -> None:
+        """Initialize the image entity."""
+        super().__init__(hass)
+        self.hub = hub
+        self._pool = RotationPool(hub, thumbnails, self._async_load_asset_ids, no_repeat)
+        self._current_image: bytes | None = None
+        self._fill_task: asyncio.Task | None = None
+
+        self._attr_device_info = immich_device_info(entry_id)
+
+    @abstractmethod
+    async def _async_load_asset_ids(self) -> Sequence[str]:
+        """Return the IDs of the images this entity picks from."""
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh the asset list on its own slow schedule.
+
+        The first image is loaded after the entity has been added, so the
+        download does not hold up platform setup.
+        """
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._pool.async_refresh_ids, _ID_LIST_REFRESH_INTERVAL
+            )
+        )
+        self.async_schedule_update_ha_state(True)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop prefetching."""
+        if self._fill_task is not None:
+            self._fill_task.cancel()
+
+    async def async_update(self) -> None:
+        """Show the next prefetched asset and refill the pool."""
+        if (item := self._pool.pop()) is None:
+            # Nothing prefetched yet, e.g. on the first update.
+            await self._pool.async_fill()
+            item = self._pool.pop()
+
+        if item is not None:
+            asset_id, self._current_image, self._attr_content_type = item
+            self._attr_extra_state_attributes = {"asset_id": asset_id}
+            self._attr_image_last_updated = dt_util.utcnow()
+
+        if self._fill_task is None or self._fill_task.done():
+            self._fill_task = self.hass.async_create_background_task(
+                self._pool.async_fill(), f"{DOMAIN} prefetch {self.entity_id}"
+            )
+
+    async def async_image(self) -> bytes | None:
+        """Return the current image from memory."""
+        return self._current_image
+
+
+class ImmichFavoriteImage(BaseImmichImage):
+    """Random favorite image."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        hub: ImmichHub,
+        thumbnails: ThumbnailCache,
+        no_repeat: int,
+    ) -> None:
+        super().__init__(hass, entry_id, hub, thumbnails, no_repeat)
+        self._attr_unique_id = f"{entry_id}_favorite_image"
+        self._attr_name = "Favorite image"
+
+    async def _async_load_asset_ids(self) -> list[str]:
+        return await self.hub.list_favorite_assets()
+
+
+class ImmichMemoryImage(BaseImmichImage):
+    """Random image from the current memories."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        hub: ImmichHub,
+        thumbnails: ThumbnailCache,
+        no_repeat: int,
+    ) -> None:
+        super().__init__(hass, entry_id, hub, thumbnails, no_repeat)
+        self._attr_unique_id = f"{entry_id}_memory_image"
+        self._attr_name = "Memory image"
+
+    async def _async_load_asset_ids(self) -> list[str]:
+        return await self.hub.list_memory_assets()
+
+
+class ImmichAlbumImage(BaseImmichImage):
+    """Random image from a watched album."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        hub: ImmichHub,
+        thumbnails: ThumbnailCache,
+        no_repeat: int,
+        albums: AlbumIndexStore,
+        album_id: str,
+    ) -> None:
+        super().__init__(hass, entry_id, hub, thumbnails, no_repeat)
+        self._albums = albums
+        self._album_id = album_id
+        self._attr_unique_id = f"{entry_id}_album_image_{album_id}"
+        self._attr_name = f"Album {album_id}"
+
+    async def _async_load_asset_ids(self) -> Sequence[str]:
+        index = await self._albums.async_sync(self._album_id)
+        self._attr_name = f"Album {index.name}"
+        return index.asset_ids
@@ -0,0 +1,333 @@
+"""Media source for the Immich Integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from http import HTTPStatus
+import logging
+import uuid
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.media_player import BrowseError, MediaClass
+from homeassistant.components.media_source import (
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+    Unresolvable,
+)
+from homeassistant.core import HomeAssistant
+
+from .cache import TimedLRUCache
+from .const import DOMAIN
+from .coordinator import ImmichData
+from .hub import ApiError, CannotConnect
+
+_LOGGER = logging.getLogger(__name__)
+
+PAGE_SIZE = 100
+_BROWSE_CACHE_ENTRIES = 64
+_BROWSE_CACHE_TTL = 60.0
+_CHUNK_SIZE = 64 * 1024
+_FORWARDED_HEADERS = (
+    hdrs.ACCEPT_RANGES,
+    hdrs.CONTENT_LENGTH,
+    hdrs.CONTENT_RANGE,
+    hdrs.CONTENT_TYPE,
+)
+_IMAGE_VARIANTS = ("thumbnail", "preview")
+_VIDEO_VARIANT = "video"
+
+
+async def async_get_media_source(hass: HomeAssistant) -> ImmichMediaSource:
+    """Set up the Immich media source and its proxy view."""
+    hass.http.register_view(ImmichMediaView(hass))
+    return ImmichMediaSource(hass)
+
+
+def _media_url(entry_id: str, asset_id: str, variant: str) -> str:
+    return f"/api/{DOMAIN}/media/{entry_id}/{asset_id}/{variant}"
+
+
+class ImmichMediaSource(MediaSource):
+    """Browse albums, people and the timeline of Immich servers.
+
+    Identifiers are paths below the server's config entry ID, e.g.
+    "<entry>/album/<album>/<page>". Asset lists are fetched one server-side
+    page at a time and end with a "More" directory for the next page;
+    directories are only expanded when opened. Browsed pages are cached
+    briefly so going back and forth does not hit the server again.
+    """
+
+    name = "Immich"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+        self._cache: TimedLRUCache[str, BrowseMediaSource] = TimedLRUCache(
+            _BROWSE_CACHE_ENTRIES, _BROWSE_CACHE_TTL
+        )
+
+    def _entries(self) -> dict[str, ImmichData]:
+        return self.hass.data.get(DOMAIN, {})
+
+    def _entry(self, entry_id: str) -> ImmichData:
+        if (data := self._entries().get(entry_id)) is None:
+            raise BrowseError(f"Immich server {entry_id} is not loaded")
+        return data
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Resolve an asset to a URL of the proxy view."""
+        try:
+            entry_id, kind, asset_id, asset_type = item.identifier.split("/")
+        except ValueError as err:
+            raise Unresolvable(f"Unknown media item {item.identifier}") from err
+        if kind != "asset" or entry_id not in self._entries():
+            raise Unresolvable(f"Unknown media item {item.identifier}")
+        if asset_type == "VIDEO":
+            return PlayMedia(_media_url(entry_id, asset_id, _VIDEO_VARIANT), "video/mp4")
+        # Originals may be HEIC or RAW; the preview is a JPEG any player shows.
+        return PlayMedia(_media_url(entry_id, asset_id, "preview"), "image/jpeg")
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """Return one level of the media tree."""
+        if not item.identifier:
+            entries = self._entries()
+            if len(entries) == 1:
+                return await self._async_browse(next(iter(entries)), [])
+            return self._browse_root(entries)
+
+        entry_id, *path = item.identifier.split("/")
+        return await self._async_browse(entry_id, path)
+
+    def _browse_root(self, entries: dict[str, ImmichData]) -> BrowseMediaSource:
+        root = _directory(None, self.name)
+        root.children = [
+            _directory(entry_id, data.coordinator.config_entry.title)
+            for entry_id, data in entries.items()
+        ]
+        return root
+
+    async def _async_browse(self, entry_id: str, path: list[str]) -> BrowseMediaSource:
+        identifier = "/".join([entry_id, *path])
+        if (cached := self._cache.get(identifier)) is not None:
+            return cached
+
+        data = self._entry(entry_id)
+        kind, *args = path or ["server"]
+        try:
+            if kind == "server":
+                result = _directory(identifier, data.coordinator.config_entry.title)
+                result.children = [
+                    _directory(f"{entry_id}/albums", "Albums"),
+                    _directory(f"{entry_id}/people/1", "People"),
+                    _directory(f"{entry_id}/timeline/1", "Timeline"),
+                ]
+            elif kind == "albums":
+                result = await self._async_browse_albums(entry_id, data)
+            elif kind == "people":
+                result = await self._async_browse_people(entry_id, data, int(args[0]))
+            elif kind == "album":
+                album_id, page = args[0], int(args[1])
+                result = await self._async_browse_assets(
+                    data, identifier, "Album", {"albumIds": [album_id]}, page,
+                    lambda next_page: f"{entry_id}/album/{album_id}/{next_page}",
+                )
+            elif kind == "person":
+                person_id, page = args[0], int(args[1])
+                result = await self._async_browse_assets(
+                    data, identifier, "Person", {"personIds": [person_id]}, page,
+                    lambda next_page: f"{entry_id}/person/{person_id}/{next_page}",
+                )
+            elif kind == "timeline":
+                page = int(args[0])
+                result = await self._async_browse_assets(
+                    data, identifier, "Timeline", {"order": "desc"}, page,
+                    lambda next_page: f"{entry_id}/timeline/{next_page}",
+                )
+            else:
+                raise BrowseError(f"Unknown media item {identifier}")
+        except (IndexError, ValueError) as err:
+            raise BrowseError(f"Unknown media item {identifier}") from err
+        except (CannotConnect, ApiError) as err:
+            raise BrowseError(f"Unable to browse Immich: {err}") from err
+
+        self._cache.set(identifier, result)
+        return result
+
+    async def _async_browse_albums(
+        self, entry_id: str, data: ImmichData
+    ) -> BrowseMediaSource:
+        result = _directory(f"{entry_id}/albums", "Albums")
+        result.children = [
+            _directory(
+                f"{entry_id}/album/{album['id']}/1",
+                album["albumName"],
+                thumbnail=(
+                    _media_url(entry_id, asset_id, "thumbnail")
+                    if (asset_id := album.get("albumThumbnailAssetId"))
+                    else None
+                ),
+            )
+            for album in await data.hub.get_albums()
+        ]
+        return result
+
+    async def _async_browse_people(
+        self, entry_id: str, data: ImmichData, page: int
+    ) -> BrowseMediaSource:
+        people, more = await data.hub.list_people(page, PAGE_SIZE)
+        result = _directory(f"{entry_id}/people/{page}", "People")
+        result.children = [
+            _directory(f"{entry_id}/person/{person['id']}/1", person["name"])
+            for person in people
+            if person.get("name")
+        ]
+        if more:
+            result.children.append(
+                _directory(f"{entry_id}/people/{page + 1}", "More")
+            )
+        return result
+
+    async def _async_browse_assets(
+        self,
+        data: ImmichData,
+        identifier: str,
+        title: str,
+        query: dict,
+        page: int,
+        next_identifier: Callable[[int], str],
+    ) -> BrowseMediaSource:
+        assets, more = await data.hub.search_assets(query, page, PAGE_SIZE)
+        entry_id = identifier.split("/", 1)[0]
+        result = _directory(
+            identifier,
+            title if page == 1 else f"{title} ({page})",
+            children_media_class=MediaClass.IMAGE,
+        )
+        result.children = [
+            _asset(entry_id, asset)
+            for asset in assets
+            if asset.get("type") in ("IMAGE", "VIDEO")
+        ]
+        if more:
+            result.children.append(_directory(next_identifier(page + 1), "More"))
+        return result
+
+
+def _directory(
+    identifier: str | None,
+    title: str,
+    thumbnail: str | None = None,
+    children_media_class: MediaClass = MediaClass.DIRECTORY,
+) -> BrowseMediaSource:
+    """Return a directory whose children are loaded when it is opened."""
+    return BrowseMediaSource(
+        domain=DOMAIN,
+        identifier=identifier,
+        media_class=MediaClass.DIRECTORY,
+        media_content_type="",
+        title=title,
+        can_play=False,
+        can_expand=True,
+        thumbnail=thumbnail,
+        children_media_class=children_media_class,
+    )
+
+
+def _asset(entry_id: str, asset: dict) -> BrowseMediaSource:
+    video = asset["type"] == "VIDEO"
+    return BrowseMediaSource(
+        domain=DOMAIN,
+        identifier=f"{entry_id}/asset/{asset['id']}/{asset['type']}",
+        media_class=MediaClass.VIDEO if video else MediaClass.IMAGE,
+        media_content_type="video/mp4" if video else "image/jpeg",
+        title=asset.get("originalFileName") or asset["id"],
+        can_play=True,
+        can_expand=False,
+        thumbnail=_media_url(entry_id, asset["id"], "thumbnail"),
+    )
+
+
+class ImmichMediaView(HomeAssistantView):
+    """Proxy Immich thumbnails and videos to Home Assistant clients.
+
+    Images go through the thumbnail cache. Videos are streamed chunk by
+    chunk with Range passed through, so seeking works and a video is never
+    held in memory as a whole.
+    """
+
+    url = f"/api/{DOMAIN}/media/{{entry_id}}/{{asset_id}}/{{variant}}"
+    name = f"api:{DOMAIN}:media"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(
+        self, request: web.Request, entry_id: str, asset_id: str, variant: str
+    ) -> web.StreamResponse:
+        """Serve an asset."""
+        data: ImmichData | None = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        try:
+            uuid.UUID(asset_id)
+        except ValueError:
+            data = None
+        if data is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        if variant in _IMAGE_VARIANTS:
+            return await self._async_serve_image(data, asset_id, variant)
+        if variant == _VIDEO_VARIANT:
+            return await self._async_stream_video(request, data, asset_id)
+        return web.Response(status=HTTPStatus.NOT_FOUND)
+
+    async def _async_serve_image(
+        self, data: ImmichData, asset_id: str, variant: str
+    ) -> web.Response:
+        try:
+            image, content_type = await data.thumbnails.async_get(
+                asset_id, variant, data.hub.get_asset_thumbnail
+            )
+        except CannotConnect:
+            return web.Response(status=HTTPStatus.BAD_GATEWAY)
+        except ApiError:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        return web.Response(
+            body=image,
+            content_type=content_type,
+            headers={hdrs.CACHE_CONTROL: "private, max-age=3600"},
+        )
+
+    async def _async_stream_video(
+        self, request: web.Request, data: ImmichData, asset_id: str
+    ) -> web.StreamResponse:
+        response: web.StreamResponse | None = None
+        try:
+            async with data.hub.stream_video(
+                asset_id, request.headers.get(hdrs.RANGE)
+            ) as upstream:
+                response = web.StreamResponse(
+                    status=upstream.status,
+                    headers={
+                        header: upstream.headers[header]
+                        for header in _FORWARDED_HEADERS
+                        if header in upstream.headers
+                    },
+                )
+                await response.prepare(request)
+                async for chunk in upstream.content.iter_chunked(_CHUNK_SIZE):
+                    await response.write(chunk)
+        except CannotConnect:
+            if response is None:
+                return web.Response(status=HTTPStatus.BAD_GATEWAY)
+            # Headers are already sent; end the truncated body.
+            _LOGGER.debug("Video stream of %s was interrupted", asset_id)
+            return response
+        except ApiError:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        await response.write_eof()
+        return response
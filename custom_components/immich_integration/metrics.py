@@ -0,0 +1,135 @@
+"""Request instrumentation for the Immich Integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+import re
+from typing import Any
+
+# Upper bounds of the latency histogram buckets, in milliseconds.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf")
+)
+
+_ID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+
+class EndpointStats:
+    """Counters and latency histogram of one endpoint."""
+
+    __slots__ = (
+        "requests",
+        "errors",
+        "bytes_received",
+        "latency_total",
+        "latency_buckets",
+        "statuses",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.requests = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.latency_total = 0.0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.statuses: dict[int, int] = {}
+
+    def record(self, latency: float, status: int | None, size: int) -> None:
+        """Record a request; a status of None means a connection error."""
+        self.requests += 1
+        self.bytes_received += size
+        milliseconds = latency * 1000
+        self.latency_total += milliseconds
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, milliseconds)] += 1
+        if status is None:
+            self.errors += 1
+        else:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status >= 400:
+                self.errors += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Return the bucket bound below which a fraction q of requests fall."""
+        if not self.requests:
+            return None
+        rank = q * self.requests
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_received": self.bytes_received,
+            "latency_mean_ms": (
+                round(self.latency_total / self.requests, 1) if self.requests else None
+            ),
+            "latency_p50_ms": self.quantile(0.5),
+            "latency_p95_ms": self.quantile(0.95),
+            "latency_histogram_ms": {
+                str(bound): count
+                for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)
+            },
+            "statuses": {str(status): n for status, n in self.statuses.items()},
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint request counters of a hub.
+
+    Recording is a dictionary lookup and a few integer additions, cheap
+    enough to leave on. Asset IDs in paths are folded into a placeholder so
+    the number of endpoints stays bounded.
+    """
+
+    __slots__ = ("endpoints",)
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def record(
+        self, method: str, path: str, latency: float, status: int | None, size: int
+    ) -> None:
+        """Record a finished request."""
+        endpoint = f"{method} {_ID_PATTERN.sub('{id}', path)}"
+        if (stats := self.endpoints.get(endpoint)) is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        stats.record(latency, status, size)
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests over all endpoints."""
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests over all endpoints."""
+        return sum(stats.errors for stats in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the bytes received over all endpoints."""
+        return sum(stats.bytes_received for stats in self.endpoints.values())
+
+    @property
+    def latency_mean(self) -> float | None:
+        """Return the mean latency over all endpoints, in milliseconds."""
+        if not (requests := self.requests):
+            return None
+        return sum(stats.latency_total for stats in self.endpoints.values()) / requests
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            endpoint: stats.as_dict()
+            for endpoint, stats in sorted(self.endpoints.items())
+        }
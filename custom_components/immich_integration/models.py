@@ -0,0 +1,109 @@
+"""Job snapshot model for the Immich Integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class JobCounts:
+    """Item counts of a job queue."""
+
+    active: int = 0
+    completed: int = 0
+    failed: int = 0
+    delayed: int = 0
+    waiting: int = 0
+    paused: int = 0
+
+    @property
+    def backlog(self) -> int:
+        """Return the items still to be processed."""
+        return self.active + self.waiting + self.delayed
+
+
+@dataclass(frozen=True, slots=True)
+class QueueStatus:
+    """Run state of a job queue."""
+
+    is_active: bool = False
+    is_paused: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """Immutable state of one job queue.
+
+    Snapshots are parsed once per response and the same instances are shared
+    by every entity, so equality between snapshots is a cheap field compare.
+    """
+
+    counts: JobCounts
+    status: QueueStatus
+
+    @classmethod
+    def from_dict(cls, data: Any) -> Job:
+        """Parse and validate a queue from the /api/jobs response."""
+        counts = data["jobCounts"]
+        status = data["queueStatus"]
+        return cls(
+            counts=JobCounts(
+                active=_count(counts, "active"),
+                completed=_count(counts, "completed"),
+                failed=_count(counts, "failed"),
+                delayed=_count(counts, "delayed"),
+                waiting=_count(counts, "waiting"),
+                paused=_count(counts, "paused"),
+            ),
+            status=QueueStatus(
+                is_active=_flag(status, "isActive"),
+                is_paused=_flag(status, "isPaused"),
+            ),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue in the /api/jobs format."""
+        counts = self.counts
+        return {
+            "jobCounts": {
+                "active": counts.active,
+                "completed": counts.completed,
+                "failed": counts.failed,
+                "delayed": counts.delayed,
+                "waiting": counts.waiting,
+                "paused": counts.paused,
+            },
+            "queueStatus": {
+                "isActive": self.status.is_active,
+                "isPaused": self.status.is_paused,
+            },
+        }
+
+
+def parse_jobs(data: Any) -> dict[str, Job]:
+    """Parse an /api/jobs response, raising ValueError if it is malformed."""
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected an object of job queues, got {type(data).__name__}")
+    jobs: dict[str, Job] = {}
+    for name, job in data.items():
+        try:
+            jobs[name] = Job.from_dict(job)
+        except (AttributeError, KeyError, TypeError, ValueError) as err:
+            raise ValueError(f"Malformed job queue {name}: {err!r}") from err
+    return jobs
+
+
+def _count(counts: dict[str, Any], key: str) -> int:
+    """Return a count, which older servers may leave out."""
+    value = counts.get(key, 0)
+    if type(value) is not int:
+        raise ValueError(f"{key} is not an integer: {value!r}")
+    return value
+
+
+def _flag(status: dict[str, Any], key: str) -> bool:
+    value = status[key]
+    if type(value) is not bool:
+        raise ValueError(f"{key} is not a boolean: {value!r}")
+    return value
@@ -0,0 +1,142 @@
+"""Cached asset search for the Immich Integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, time
+import json
+from typing import Any
+
+from .cache import SingleFlight, TimedLRUCache
+from .hub import ImmichHub
+
+SEARCH_SMART = "smart"
+SEARCH_METADATA = "metadata"
+SEARCH_MODES = (SEARCH_SMART, SEARCH_METADATA)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 250
+# Asset fields a search may return; the rest is dropped before caching.
+RESULT_FIELDS = (
+    "id",
+    "type",
+    "originalFileName",
+    "fileCreatedAt",
+    "localDateTime",
+    "isFavorite",
+    "duration",
+    "ownerId",
+)
+DEFAULT_RESULT_FIELDS = ("id", "type", "originalFileName", "fileCreatedAt")
+
+_CACHE_ENTRIES = 128
+_CACHE_TTL = 300.0
+
+
+def _json_default(value: Any) -> Any:
+    """Encode filter values JSON has no type for, such as dates from YAML."""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+@dataclass(frozen=True, slots=True)
+class SearchPage:
+    """One page of search results, trimmed to RESULT_FIELDS."""
+
+    items: tuple[dict[str, Any], ...]
+    more: bool
+
+
+class AssetSearch:
+    """Smart and metadata searches of one API key, behind an LRU cache.
+
+    A smart search costs a model inference on the server, and dashboards
+    and voice automations repeat the same few queries, so pages are cached
+    for a few minutes under their normalized query. Identical queries in
+    flight at the same time share one request. Only RESULT_FIELDS are kept
+    of each asset, which keeps cached pages small.
+    """
+
+    def __init__(
+        self,
+        hub: ImmichHub,
+        max_entries: int = _CACHE_ENTRIES,
+        ttl: float = _CACHE_TTL,
+    ) -> None:
+        """Initialize the search."""
+        self.hub = hub
+        self.hits = 0
+        self.misses = 0
+        self._cache: TimedLRUCache[str, SearchPage] = TimedLRUCache(max_entries, ttl)
+        self._requests: SingleFlight[str, SearchPage] = SingleFlight()
+
+    async def async_search(
+        self,
+        mode: str,
+        text: str | None,
+        filters: dict[str, Any],
+        page: int = 1,
+        size: int = DEFAULT_PAGE_SIZE,
+    ) -> tuple[SearchPage, bool]:
+        """Return a page of results and whether it came from the cache.
+
+        Smart searches match text against image content; metadata searches
+        match it against file names. filters are passed on to Immich, with
+        dates as ISO 8601 strings.
+        """
+        text = " ".join(text.lower().split()) if text else None
+        filters = json.loads(json.dumps(filters, default=_json_default))
+        key = json.dumps([mode, text, filters, page, size], sort_keys=True)
+        if (cached := self._cache.get(key)) is not None:
+            self.hits += 1
+            return cached, True
+
+        if key not in self._requests:
+            self.misses += 1
+        result = await self._requests.async_run(
+            key, lambda: self._async_fetch(key, mode, text, filters, page, size)
+        )
+        return result, False
+
+    async def _async_fetch(
+        self,
+        key: str,
+        mode: str,
+        text: str | None,
+        filters: dict[str, Any],
+        page: int,
+        size: int,
+    ) -> SearchPage:
+        if mode == SEARCH_SMART:
+            assets, more = await self.hub.smart_search(
+                {**filters, "query": text}, page, size
+            )
+        else:
+            query = {**filters, "originalFileName": text} if text else filters
+            assets, more = await self.hub.search_assets(query, page, size)
+        result = SearchPage(
+            items=tuple(
+                {field: asset[field] for field in RESULT_FIELDS if field in asset}
+                for asset in assets
+            ),
+            more=more,
+        )
+        self._cache.set(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Drop cached results, e.g. after new assets arrived."""
+        self._cache.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return cache counters."""
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._requests.coalesced_calls,
+        }
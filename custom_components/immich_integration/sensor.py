@@ -0,0 +1,481 @@
+"""Platform for Sensor integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import (
+    ImmichData,
+    ImmichJobsCoordinator,
+    ImmichStatisticsCoordinator,
+)
+from .entity import ImmichJobEntity, immich_device_info
+from .models import Job
+from .sync import (
+    STATE_IDLE,
+    STATE_PAUSED,
+    STATE_SCANNING,
+    STATE_UPLOADING,
+    FolderSync,
+)
+from .throughput import JobThroughput
+
+# Only the diagnostic sensors poll; they read in-memory counters.
+SCAN_INTERVAL = timedelta(minutes=1)
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ImmichStatisticsSensorEntityDescription(SensorEntityDescription):
+    """Describes an Immich server statistics sensor."""
+
+    value_fn: Callable[[dict[str, Any]], int]
+
+
+STATISTICS_SENSORS: tuple[ImmichStatisticsSensorEntityDescription, ...] = (
+    ImmichStatisticsSensorEntityDescription(
+        key="photos",
+        name="Photos",
+        icon="mdi:image",
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda stats: stats["photos"],
+    ),
+    ImmichStatisticsSensorEntityDescription(
+        key="videos",
+        name="Videos",
+        icon="mdi:video",
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda stats: stats["videos"],
+    ),
+    ImmichStatisticsSensorEntityDescription(
+        key="usage",
+        name="Storage used",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIBIBYTES,
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda stats: stats["usage"],
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ImmichJobSensorEntityDescription(SensorEntityDescription):
+    """Describes an Immich job throughput sensor."""
+
+    value_fn: Callable[[JobThroughput], float | None]
+
+
+JOB_SENSORS: tuple[ImmichJobSensorEntityDescription, ...] = (
+    ImmichJobSensorEntityDescription(
+        key="completion_rate",
+        name="Completion rate",
+        icon="mdi:speedometer",
+        native_unit_of_measurement="items/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda throughput: throughput.completion_rate,
+    ),
+    ImmichJobSensorEntityDescription(
+        key="failure_rate",
+        name="Failure rate",
+        icon="mdi:alert-circle-outline",
+        native_unit_of_measurement="items/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda throughput: throughput.failure_rate,
+    ),
+    ImmichJobSensorEntityDescription(
+        key="time_to_drain",
+        name="Time to drain",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        value_fn=lambda throughput: throughput.time_to_drain,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ImmichDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes an Immich integration diagnostic sensor."""
+
+    value_fn: Callable[[ImmichData], float | None]
+
+
+DIAGNOSTIC_SENSORS: tuple[ImmichDiagnosticSensorEntityDescription, ...] = (
+    ImmichDiagnosticSensorEntityDescription(
+        key="requests",
+        name="API requests",
+        icon="mdi:swap-horizontal",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data.hub.metrics.requests,
+    ),
+    ImmichDiagnosticSensorEntityDescription(
+        key="request_errors",
+        name="API request errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data.hub.metrics.errors,
+    ),
+    ImmichDiagnosticSensorEntityDescription(
+        key="request_latency",
+        name="API mean latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: data.hub.metrics.latency_mean,
+    ),
+    ImmichDiagnosticSensorEntityDescription(
+        key="bytes_received",
+        name="API data received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.MEBIBYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data.hub.metrics.bytes_received,
+    ),
+    ImmichDiagnosticSensorEntityDescription(
+        key="jobs_cache_hits",
+        name="Jobs cache hits",
+        icon="mdi:cached",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: (
+            data.hub.cache_stats["hits"] + data.hub.cache_stats["coalesced"]
+        ),
+    ),
+    ImmichDiagnosticSensorEntityDescription(
+        key="skipped_writes",
+        name="Skipped state writes",
+        icon="mdi:content-save-off-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data.coordinator.skipped_writes,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ImmichSyncSensorEntityDescription(SensorEntityDescription):
+    """Describes an Immich folder sync progress sensor."""
+
+    value_fn: Callable[[FolderSync], Any]
+
+
+SYNC_SENSORS: tuple[ImmichSyncSensorEntityDescription, ...] = (
+    ImmichSyncSensorEntityDescription(
+        key="sync_state",
+        name="Folder sync",
+        icon="mdi:folder-sync",
+        device_class=SensorDeviceClass.ENUM,
+        options=[STATE_IDLE, STATE_SCANNING, STATE_UPLOADING, STATE_PAUSED],
+        value_fn=lambda sync: sync.state,
+    ),
+    ImmichSyncSensorEntityDescription(
+        key="sync_pending",
+        name="Folder sync pending",
+        icon="mdi:file-clock-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda sync: sync.pending,
+    ),
+    ImmichSyncSensorEntityDescription(
+        key="sync_uploaded",
+        name="Folder sync uploaded",
+        icon="mdi:file-upload-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda sync: sync.uploaded,
+    ),
+    ImmichSyncSensorEntityDescription(
+        key="sync_failed",
+        name="Folder sync failed",
+        icon="mdi:file-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda sync: sync.failed,
+    ),
+    ImmichSyncSensorEntityDescription(
+        key="sync_indexed",
+        name="Folder sync files",
+        icon="mdi:file-check-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda sync: sync.indexed,
+    ),
+    ImmichSyncSensorEntityDescription(
+        key="sync_last",
+        name="Folder sync last run",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda sync: sync.last_sync,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Immich Sensor platform."""
+
+    data: ImmichData = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_entities(
+        ImmichJobSensor(data.coordinator, job_name, description)
+        for job_name in data.coordinator.data
+        for description in JOB_SENSORS
+    )
+    async_add_entities(
+        (
+            ImmichDiagnosticSensor(config_entry.entry_id, data, description)
+            for description in DIAGNOSTIC_SENSORS
+        ),
+        True,
+    )
+    if data.sync is not None:
+        async_add_entities(
+            ImmichSyncSensor(data.sync, description) for description in SYNC_SENSORS
+        )
+
+    statistics = ImmichStatisticsCoordinator(hass, config_entry, data.hub)
+    known_users: set[str] = set()
+
+    @callback
+    def _async_add_user_sensors() -> None:
+        """Add a usage sensor for every user not seen before."""
+        if not statistics.last_update_success:
+            return
+        new_users = [
+            user
+            for user in statistics.data["usageByUser"]
+            if user["userId"] not in known_users
+        ]
+        known_users.update(user["userId"] for user in new_users)
+        if new_users:
+            async_add_entities(
+                ImmichUserUsageSensor(statistics, user["userId"], user["userName"])
+                for user in new_users
+            )
+
+    async def _async_setup_statistics() -> None:
+        """Add the statistics sensors unless the API key may not read them.
+
+        Other failures, such as a server that is down at startup, only leave
+        the sensors unavailable until the coordinator recovers.
+        """
+        await statistics.async_refresh()
+        if statistics.access_denied:
+            # Statistics need an admin API key; skip the sensors otherwise.
+            _LOGGER.debug("Server statistics not permitted, not adding sensors")
+            return
+
+        async_add_entities(
+            ImmichStatisticsSensor(statistics, description)
+            for description in STATISTICS_SENSORS
+        )
+        _async_add_user_sensors()
+        config_entry.async_on_unload(
+            statistics.async_add_listener(_async_add_user_sensors)
+        )
+
+    # The statistics endpoint is slow on large libraries; keep it off the
+    # startup path.
+    config_entry.async_create_background_task(
+        hass, _async_setup_statistics(), f"{DOMAIN} statistics {config_entry.title}"
+    )
+
+
+class BaseImmichStatisticsSensor(
+    CoordinatorEntity[ImmichStatisticsCoordinator], SensorEntity
+):
+    """Sensor fed by the server statistics coordinator."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: ImmichStatisticsCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_device_info = immich_device_info(coordinator.config_entry.entry_id)
+
+
+class ImmichStatisticsSensor(BaseImmichStatisticsSensor):
+    """Server-wide asset count or storage usage."""
+
+    entity_description: ImmichStatisticsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ImmichStatisticsCoordinator,
+        description: ImmichStatisticsSensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_statistics_{description.key}"
+        )
+
+    @property
+    def native_value(self) -> int:
+        """Return the statistic."""
+        return self.entity_description.value_fn(self.coordinator.data)
+
+
+class ImmichUserUsageSensor(BaseImmichStatisticsSensor):
+    """Storage used by one user."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_suggested_unit_of_measurement = UnitOfInformation.GIBIBYTES
+    _attr_state_class = SensorStateClass.TOTAL
+
+    def __init__(
+        self, coordinator: ImmichStatisticsCoordinator, user_id: str, user_name: str
+    ) -> None:
+        super().__init__(coordinator)
+        self._user_id = user_id
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_usage_{user_id}"
+        self._attr_name = f"{user_name} storage used"
+
+    @property
+    def _user(self) -> dict[str, Any] | None:
+        for user in self.coordinator.data["usageByUser"]:
+            if user["userId"] == self._user_id:
+                return user
+        return None
+
+    @property
+    def available(self) -> bool:
+        """Return if the user is still present on the server."""
+        return super().available and self._user is not None
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the bytes used by the user."""
+        if (user := self._user) is None:
+            return None
+        return user["usage"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the user's asset counts and quota."""
+        if (user := self._user) is None:
+            return None
+        return {
+            "photos": user["photos"],
+            "videos": user["videos"],
+            "quota": user.get("quotaSizeInBytes"),
+        }
+
+
+class ImmichJobSensor(ImmichJobEntity, SensorEntity):
+    """Throughput or time-to-drain of one job queue."""
+
+    entity_description: ImmichJobSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ImmichJobsCoordinator,
+        job_name: str,
+        description: ImmichJobSensorEntityDescription,
+    ) -> None:
+        self.entity_description = description
+        super().__init__(coordinator, job_name)
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{description.key}_{job_name}"
+        )
+        self._attr_name = f"{job_name} {description.name}"
+
+    def update_entity(self, job: Job) -> None:
+        """Update the value from the queue's rolling window."""
+        if (throughput := self.hub.throughput.get(self.job_name)) is None:
+            self._attr_native_value = None
+            return
+        self._attr_native_value = self.entity_description.value_fn(throughput)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state when the rate moved, even for an unchanged queue."""
+        if self.job_name not in self.coordinator.changed_queues:
+            previous = self._attr_native_value
+            if (job := self.coordinator.data.get(self.job_name)) is not None:
+                self.update_entity(job)
+            if self._attr_native_value != previous:
+                self.async_write_ha_state()
+                return
+        super()._handle_coordinator_update()
+
+
+class ImmichDiagnosticSensor(SensorEntity):
+    """Request and cache counter of the integration itself.
+
+    Disabled by default; the counters live in memory and are read on a
+    slow poll, so enabling them costs no extra requests.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    entity_description: ImmichDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        entry_id: str,
+        data: ImmichData,
+        description: ImmichDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._data = data
+        self._attr_unique_id = f"{entry_id}_diagnostic_{description.key}"
+        self._attr_device_info = immich_device_info(entry_id)
+
+    async def async_update(self) -> None:
+        """Read the current counter."""
+        self._attr_native_value = self.entity_description.value_fn(self._data)
+
+
+class ImmichSyncSensor(SensorEntity):
+    """Progress of the folder sync, written whenever the sync reports."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    entity_description: ImmichSyncSensorEntityDescription
+
+    def __init__(
+        self, sync: FolderSync, description: ImmichSyncSensorEntityDescription
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._sync = sync
+        self._attr_unique_id = f"{sync.entry.entry_id}_{description.key}"
+        self._attr_device_info = immich_device_info(sync.entry.entry_id)
+        self._attr_native_value = description.value_fn(sync)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the sync's progress."""
+        self.async_on_remove(self._sync.async_add_listener(self._handle_progress))
+
+    @callback
+    def _handle_progress(self) -> None:
+        """Write the state if the value moved."""
+        value = self.entity_description.value_fn(self._sync)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
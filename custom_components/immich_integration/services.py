@@ -0,0 +1,377 @@
+"""Services for the Immich Integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from functools import partial
+import logging
+import os
+import time
+from typing import Any, TypeVar
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID, ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN
+from .coordinator import ImmichData
+from .download import (
+    DEFAULT_MAX_PARALLEL_DOWNLOADS,
+    async_download_archives,
+    async_download_assets,
+)
+from .hub import ApiError, CannotConnect, ImmichServer
+from .search import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_RESULT_FIELDS,
+    MAX_PAGE_SIZE,
+    RESULT_FIELDS,
+    SEARCH_MODES,
+    SEARCH_SMART,
+)
+from .upload import DEFAULT_MAX_PARALLEL_UPLOADS, async_upload_files, scan_files
+
+_LOGGER = logging.getLogger(__name__)
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+_T = TypeVar("_T")
+
+SERVICE_REFRESH = "refresh"
+SERVICE_JOB_COMMAND = "job_command"
+SERVICE_UPLOAD = "upload"
+SERVICE_DOWNLOAD = "download"
+SERVICE_SEARCH = "search"
+
+ATTR_QUEUES = "queues"
+ATTR_COMMAND = "command"
+ATTR_FORCE = "force"
+ATTR_PATHS = "paths"
+ATTR_RECURSIVE = "recursive"
+ATTR_MAX_PARALLEL = "max_parallel"
+ATTR_PATH = "path"
+ATTR_ASSET_IDS = "asset_ids"
+ATTR_ALBUM_ID = "album_id"
+ATTR_ARCHIVE = "archive"
+ATTR_QUERY = "query"
+ATTR_MODE = "mode"
+ATTR_FILTERS = "filters"
+ATTR_PAGE = "page"
+ATTR_SIZE = "size"
+ATTR_FIELDS = "fields"
+
+ALL_QUEUES = "all"
+
+# Servers contacted at once by a service call.
+MAX_PARALLEL_ENTRIES = 4
+
+# Service command names mapped to Immich job commands.
+_JOB_COMMANDS = {
+    "pause": "pause",
+    "resume": "resume",
+    "start": "start",
+    "clear": "empty",
+}
+
+SERVICE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+SERVICE_JOB_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_QUEUES): vol.Any(
+            vol.In([ALL_QUEUES]), vol.All(cv.ensure_list, [cv.string])
+        ),
+        vol.Required(ATTR_COMMAND): vol.In(list(_JOB_COMMANDS)),
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }
+)
+
+SERVICE_UPLOAD_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PATHS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_RECURSIVE, default=False): cv.boolean,
+        vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_MAX_PARALLEL_UPLOADS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=8)
+        ),
+    }
+)
+
+SERVICE_DOWNLOAD_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Required(ATTR_PATH): cv.string,
+            vol.Exclusive(ATTR_ASSET_IDS, "assets"): vol.All(
+                cv.ensure_list, [cv.string]
+            ),
+            vol.Exclusive(ATTR_ALBUM_ID, "assets"): cv.string,
+            vol.Optional(ATTR_ARCHIVE, default=False): cv.boolean,
+            vol.Optional(
+                ATTR_MAX_PARALLEL, default=DEFAULT_MAX_PARALLEL_DOWNLOADS
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ASSET_IDS, ATTR_ALBUM_ID),
+)
+
+SERVICE_SEARCH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_QUERY): cv.string,
+        vol.Optional(ATTR_MODE, default=SEARCH_SMART): vol.In(SEARCH_MODES),
+        vol.Optional(ATTR_FILTERS, default={}): dict,
+        vol.Optional(ATTR_PAGE, default=1): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_SIZE, default=DEFAULT_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional(ATTR_FIELDS, default=list(DEFAULT_RESULT_FIELDS)): vol.All(
+            cv.ensure_list, [vol.In(RESULT_FIELDS)]
+        ),
+    }
+)
+
+
+def _get_entries(hass: HomeAssistant, call: ServiceCall) -> dict[str, ImmichData]:
+    """Return the loaded entries targeted by a service call.
+
+    Entries can be selected by config entry ID, by device, or both; all
+    loaded entries are targeted when neither is given.
+    """
+    loaded: dict[str, ImmichData] = hass.data.get(DOMAIN, {})
+    entry_ids = set(cv.ensure_list(call.data.get(ATTR_CONFIG_ENTRY_ID)))
+    if device_ids := call.data.get(ATTR_DEVICE_ID):
+        device_registry = dr.async_get(hass)
+        for device_id in device_ids:
+            if (device := device_registry.async_get(device_id)) is None:
+                raise ServiceValidationError(f"Device {device_id} not found")
+            entry_ids.update(device.config_entries & loaded.keys())
+    elif not entry_ids:
+        return dict(loaded)
+
+    if missing := entry_ids - loaded.keys():
+        raise ServiceValidationError(
+            f"Config entries {', '.join(sorted(missing))} are not loaded"
+        )
+    return {entry_id: loaded[entry_id] for entry_id in entry_ids}
+
+
+async def _async_for_each_entry(
+    entries: Mapping[_K, _V],
+    action: Callable[[_V], Awaitable[_T]],
+) -> dict[_K, _T]:
+    """Run an action for every entry concurrently, a few servers at a time."""
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_ENTRIES)
+
+    async def _run(data: _V) -> _T:
+        async with semaphore:
+            return await action(data)
+
+    results = await asyncio.gather(*(_run(data) for data in entries.values()))
+    return dict(zip(entries, results))
+
+
+async def _async_refresh_entry(data: ImmichData) -> dict[str, Any]:
+    """Refresh the job snapshot of one entry and time it."""
+    coordinator = data.coordinator
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+    return {
+        "success": coordinator.last_update_success,
+        "duration": round(time.perf_counter() - start, 3),
+        "error": (
+            None
+            if coordinator.last_update_success
+            else str(coordinator.last_exception)
+        ),
+    }
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain services."""
+
+    async def async_refresh(call: ServiceCall) -> ServiceResponse:
+        """Refresh the targeted servers concurrently.
+
+        The response holds, per config entry, whether the refresh succeeded,
+        how long it took in seconds and the error if it failed.
+        """
+        return await _async_for_each_entry(
+            _get_entries(hass, call), _async_refresh_entry
+        )
+
+    async def async_job_command(call: ServiceCall) -> ServiceResponse:
+        """Send one command to many job queues and refresh once afterwards.
+
+        Job queues are server-wide, so the command is sent once per server
+        however many of the targeted entries point at it.
+        """
+        command = _JOB_COMMANDS[call.data[ATTR_COMMAND]]
+        entries = _get_entries(hass, call)
+        servers: dict[ImmichServer, list[ImmichData]] = {}
+        for data in entries.values():
+            servers.setdefault(data.hub.server, []).append(data)
+
+        async def _send(server_entries: list[ImmichData]) -> dict[str, bool]:
+            data = server_entries[0]
+            queues = call.data[ATTR_QUEUES]
+            if queues == ALL_QUEUES:
+                queues = list(data.coordinator.data)
+
+            result = await data.hub.job_commands(
+                command, queues, force=call.data[ATTR_FORCE]
+            )
+            await asyncio.gather(
+                *(entry.coordinator.async_command_issued() for entry in server_entries)
+            )
+            return result
+
+        results = await _async_for_each_entry(servers, _send)
+        return {
+            entry_id: results[data.hub.server] for entry_id, data in entries.items()
+        }
+
+    def _get_single_entry(call: ServiceCall, action: str) -> ImmichData:
+        entries = _get_entries(hass, call)
+        if len(entries) != 1:
+            raise ServiceValidationError(f"Select the Immich server to {action}")
+        return next(iter(entries.values()))
+
+    async def async_upload(call: ServiceCall) -> ServiceResponse:
+        """Upload local files that are not on the server yet."""
+        data = _get_single_entry(call, "upload to")
+
+        paths: list[str] = call.data[ATTR_PATHS]
+        for path in paths:
+            if not hass.config.is_allowed_path(path):
+                raise ServiceValidationError(
+                    f"{path} is not in allowlist_external_dirs"
+                )
+        try:
+            files = await hass.async_add_executor_job(
+                scan_files, paths, call.data[ATTR_RECURSIVE]
+            )
+        except OSError as err:
+            raise ServiceValidationError(f"Unable to read {err.filename}") from err
+
+        try:
+            result = await async_upload_files(
+                hass, data.hub, files, call.data[ATTR_MAX_PARALLEL]
+            )
+        except (CannotConnect, ApiError) as err:
+            raise HomeAssistantError(f"Unable to check files with Immich: {err}") from err
+
+        await data.coordinator.async_assets_uploaded(len(result.uploaded))
+        return result.as_dict()
+
+    async def async_download(call: ServiceCall) -> ServiceResponse:
+        """Download originals, or zip archives, to a local folder."""
+        data = _get_single_entry(call, "download from")
+        target: str = call.data[ATTR_PATH]
+        if not hass.config.is_allowed_path(target):
+            raise ServiceValidationError(f"{target} is not in allowlist_external_dirs")
+        try:
+            await hass.async_add_executor_job(
+                partial(os.makedirs, target, exist_ok=True)
+            )
+        except OSError as err:
+            raise ServiceValidationError(f"Unable to create {target}") from err
+
+        asset_ids: list[str] = call.data.get(ATTR_ASSET_IDS, [])
+        album_id: str | None = call.data.get(ATTR_ALBUM_ID)
+        max_parallel: int = call.data[ATTR_MAX_PARALLEL]
+        try:
+            if call.data[ATTR_ARCHIVE]:
+                name = "immich"
+                if album_id is not None:
+                    albums = await data.hub.list_albums()
+                    name = albums.get(album_id, album_id).replace(os.sep, "_")
+                result = await async_download_archives(
+                    hass, data.hub, asset_ids, album_id, target, name, max_parallel
+                )
+            else:
+                result = await async_download_assets(
+                    hass, data.hub, asset_ids, album_id, target, max_parallel
+                )
+        except (CannotConnect, ApiError) as err:
+            raise HomeAssistantError(f"Unable to list assets in Immich: {err}") from err
+        return result.as_dict()
+
+    async def async_search(call: ServiceCall) -> ServiceResponse:
+        """Search assets, answering repeated queries from the cache."""
+        data = _get_single_entry(call, "search")
+        mode: str = call.data[ATTR_MODE]
+        if mode == SEARCH_SMART and not call.data.get(ATTR_QUERY):
+            raise ServiceValidationError("A smart search needs a query")
+
+        page: int = call.data[ATTR_PAGE]
+        try:
+            result, cached = await data.search.async_search(
+                mode,
+                call.data.get(ATTR_QUERY),
+                call.data[ATTR_FILTERS],
+                page,
+                call.data[ATTR_SIZE],
+            )
+        except (CannotConnect, ApiError) as err:
+            raise HomeAssistantError(f"Unable to search Immich: {err}") from err
+
+        fields: list[str] = call.data[ATTR_FIELDS]
+        return {
+            "items": [
+                {field: item.get(field) for field in fields} for item in result.items
+            ],
+            "page": page,
+            "next_page": page + 1 if result.more else None,
+            "cached": cached,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_refresh,
+        schema=SERVICE_REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_JOB_COMMAND,
+        async_job_command,
+        schema=SERVICE_JOB_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPLOAD,
+        async_upload,
+        schema=SERVICE_UPLOAD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DOWNLOAD,
+        async_download,
+        schema=SERVICE_DOWNLOAD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH,
+        async_search,
+        schema=SERVICE_SEARCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -2,22 +2,19 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
 import logging
+from typing import Any
 
 from homeassistant.components.switch import SwitchEntity, SwitchDeviceClass
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, CONF_HOST
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from collections.abc import Callable
-from homeassistant.helpers import device_registry as dr
-from .hub import ImmichHub
+from .coordinator import ImmichData, ImmichJobsCoordinator
 from .const import DOMAIN
+from .entity import ImmichJobEntity, immich_device_info
+from .models import Job
+from .sync import FolderSync
 
-SCAN_INTERVAL = timedelta(seconds=30)
-_ID_LIST_REFRESH_INTERVAL = timedelta(hours=12)
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -28,71 +25,82 @@ async def async_setup_entry(
 ) -> None:
     """Set up Immich Switch platform."""
 
-    hub = hass.data[DOMAIN][config_entry.entry_id]
+    data: ImmichData = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = data.coordinator
 
-    # Create entity for random favorite image
-    # async_add_entities([ImmichJobs(hass, hub)])
-
-    # Create entities for random image from each watched
-    jobs = await hub.get_jobs(False)
     async_add_entities(
-        [ImmichSwitch(hass, hub, job=jobs[key], job_name=key) for key in jobs]
+        [ImmichSwitch(coordinator, job_name=key) for key in coordinator.data]
     )
-    config_entry.async_on_unload(config_entry.add_update_listener(update_listener))
-
-
-async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    """Handle options updates."""
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    if data.sync is not None:
+        async_add_entities([ImmichSyncSwitch(data.sync)])
 
 
-class ImmichSwitch(SwitchEntity):
-    """Represent a switch ."""
+class ImmichSwitch(ImmichJobEntity, SwitchEntity):
+    """Represent a switch that pauses and resumes a job queue."""
 
-    _attr_has_entity_name = True
-    _attr_should_poll = True
-
-    def __init__(
-        self, hass: HomeAssistant, hub: ImmichHub, job: dict, job_name: str
-    ) -> None:
-        """Initialize the binary sensor entity."""
-        super().__init__()
-        self.hub = hub
-        self.hass = hass
-        self.entity_description = f"Switch {job_name}"
-        self.job_name=job_name
+    def __init__(self, coordinator: ImmichJobsCoordinator, job_name: str) -> None:
+        """Initialize the switch entity."""
         self._attr_device_class = SwitchDeviceClass.SWITCH
-        self.paused=job["queueStatus"]["isPaused"]
         self._attr_extra_state_attributes = {}
+        super().__init__(coordinator, job_name)
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_queue_{job_name}"
+        self._attr_name = f"{job_name} Queue"
 
-        self._attr_device_info = dr.DeviceInfo(
-            identifiers={(DOMAIN, "immich_integration")},
-            manufacturer="Immich",
-            entry_type=dr.DeviceEntryType.SERVICE,
-        )
+    def update_entity(self, job: Job) -> None:
+        """Update the paused state from the queue's job data."""
+        self.paused = job.status.is_paused
 
     @property
     def is_on(self) -> bool | None:
-        """Return true if light is on."""
-        return self.paused
+        """Return true if the queue is running."""
+        return not self.paused
 
-    @property
-    def name(self) -> str:
-        """Return the display name of this light."""
-        return self._name
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Resume the queue."""
+        if await self.hub.resume(job_id=self.job_name):
+            self.paused = False
+            self.async_write_ha_state()
+        await self.coordinator.async_command_issued()
 
-    def turn_on(self) -> None:
-        """Instruct the light to turn on.
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Pause the queue."""
+        if await self.hub.pause(job_id=self.job_name):
+            self.paused = True
+            self.async_write_ha_state()
+        await self.coordinator.async_command_issued()
 
-        You can skip the brightness part if your light does not support
-        brightness control.
-        """
-        bool ok = await self.hub.start(job_id=self.job_name)
-        self.paused=False if ok else True
 
+class ImmichSyncSwitch(SwitchEntity):
+    """Represent a switch that pauses and resumes the folder sync.
 
-    def turn_off(self) -> None:
-        """Instruct the light to turn off."""
-        bool ok = await self.hub.pause(job_id=self.job_name)
-        self.paused=True if ok else False
+    Pausing stops after the batch in flight. During a large sync the queue
+    switches can pause the server-side jobs the new assets trigger, such as
+    thumbnail generation, and resume them once the upload is done.
+    """
 
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = SwitchDeviceClass.SWITCH
+    _attr_name = "Folder sync"
+    _attr_icon = "mdi:folder-sync"
+
+    def __init__(self, sync: FolderSync) -> None:
+        """Initialize the switch entity."""
+        self._sync = sync
+        self._attr_unique_id = f"{sync.entry.entry_id}_sync"
+        self._attr_device_info = immich_device_info(sync.entry.entry_id)
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if the sync is enabled."""
+        return self._sync.enabled
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Resume the sync and start a pass."""
+        self._sync.async_set_enabled(True)
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Pause the sync."""
+        self._sync.async_set_enabled(False)
+        self.async_write_ha_state()
@@ -0,0 +1,212 @@
+"""Folder sync for the Immich Integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import ImmichJobsCoordinator
+from .hub import ApiError, CannotConnect, ImmichHub
+from .upload import LocalFile, async_upload_files, scan_files
+
+_LOGGER = logging.getLogger(__name__)
+
+SYNC_INTERVAL = timedelta(minutes=15)
+_STORAGE_VERSION = 1
+_SAVE_DELAY = 30
+_BATCH_SIZE = 500
+
+STATE_IDLE = "idle"
+STATE_SCANNING = "scanning"
+STATE_UPLOADING = "uploading"
+STATE_PAUSED = "paused"
+
+
+class FolderSync:
+    """Mirror local folders into Immich.
+
+    Every file that reached the server is remembered by path with the size,
+    mtime and checksum it had, and the index is persisted. A rescan only
+    stats files, so an unchanged folder costs one directory walk; only new
+    or modified files are hashed (in the executor) and checked against the
+    server. Files are uploaded in batches so pausing takes effect quickly
+    and progress is saved as it is made.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        hub: ImmichHub,
+        coordinator: ImmichJobsCoordinator,
+        folders: list[str],
+    ) -> None:
+        """Initialize the sync."""
+        self.hass = hass
+        self.entry = entry
+        self.hub = hub
+        self.coordinator = coordinator
+        self.folders = folders
+        self.enabled = True
+        self.state = STATE_IDLE
+        self.pending = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.last_sync: datetime | None = None
+        # path -> (size, mtime, checksum)
+        self._index: dict[str, tuple[int, float, str]] = {}
+        self._store: Store[dict[str, Any]] = Store(
+            hass, _STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.sync"
+        )
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._task: asyncio.Task | None = None
+
+    @property
+    def indexed(self) -> int:
+        """Return the number of files known to be on the server."""
+        return len(self._index)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return progress counters for diagnostics."""
+        return {
+            "enabled": self.enabled,
+            "state": self.state,
+            "folders": len(self.folders),
+            "indexed": self.indexed,
+            "pending": self.pending,
+            "uploaded": self.uploaded,
+            "failed": self.failed,
+            "last_sync": self.last_sync.isoformat() if self.last_sync else None,
+        }
+
+    async def async_load(self) -> None:
+        """Load the index saved by a previous run."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self.enabled = data["enabled"]
+        self._index = {
+            path: (size, mtime, checksum)
+            for path, (size, mtime, checksum) in data["files"].items()
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Sync now and then on a schedule until the entry is unloaded."""
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass, self._async_scheduled_sync, SYNC_INTERVAL
+            )
+        )
+        self.async_request_sync()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for progress updates."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def async_set_enabled(self, enabled: bool) -> None:
+        """Pause or resume syncing; a running pass stops after its batch."""
+        self.enabled = enabled
+        self._async_save()
+        if enabled:
+            self.async_request_sync()
+        elif self.state == STATE_IDLE:
+            self._set_state(STATE_PAUSED)
+
+    @callback
+    def async_request_sync(self) -> None:
+        """Start a sync pass unless one is running."""
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        self._task = self.entry.async_create_background_task(
+            self.hass, self._async_sync(), f"{DOMAIN} sync {self.entry.title}"
+        )
+
+    @callback
+    def _async_scheduled_sync(self, now: datetime) -> None:
+        self.async_request_sync()
+
+    async def _async_sync(self) -> None:
+        """Run one sync pass."""
+        self._set_state(STATE_SCANNING)
+        try:
+            files = await self.hass.async_add_executor_job(
+                scan_files, self.folders, True
+            )
+        except OSError as err:
+            _LOGGER.warning("Unable to scan %s: %s", err.filename, err)
+            self._set_state(STATE_IDLE)
+            return
+
+        changed = [file for file in files if not self._is_synced(file)]
+        # Forget files deleted locally; their assets stay in Immich.
+        present = {file.path for file in files}
+        for path in self._index.keys() - present:
+            del self._index[path]
+
+        self.pending = len(changed)
+        self._set_state(STATE_UPLOADING if changed else STATE_IDLE)
+        for start in range(0, len(changed), _BATCH_SIZE):
+            if not self.enabled:
+                break
+            if not await self._async_sync_batch(changed[start : start + _BATCH_SIZE]):
+                break
+
+        self.last_sync = dt_util.utcnow()
+        self._async_save()
+        self._set_state(STATE_IDLE if self.enabled else STATE_PAUSED)
+
+    async def _async_sync_batch(self, batch: list[LocalFile]) -> bool:
+        """Upload a batch of files, returning False if the server is unreachable."""
+        try:
+            result = await async_upload_files(self.hass, self.hub, batch)
+        except (CannotConnect, ApiError) as err:
+            _LOGGER.warning("Folder sync stopped: %s", err)
+            return False
+
+        for file in batch:
+            if file.path not in result.failed and file.checksum is not None:
+                self._index[file.path] = (file.size, file.mtime, file.checksum)
+        self.pending -= len(batch)
+        self.uploaded += len(result.uploaded)
+        self.failed += len(result.failed)
+        self._async_save()
+        self._notify()
+        await self.coordinator.async_assets_uploaded(len(result.uploaded))
+        return True
+
+    def _is_synced(self, file: LocalFile) -> bool:
+        if (entry := self._index.get(file.path)) is None:
+            return False
+        return entry[0] == file.size and entry[1] == file.mtime
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "files": {path: list(entry) for path, entry in self._index.items()},
+        }
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self._notify()
+
+    def _notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
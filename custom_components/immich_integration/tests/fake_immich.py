@@ -0,0 +1,242 @@
+"""Local stand-in for an Immich server, used by the tests and benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+import hashlib
+import uuid
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+JOB_NAMES = (
+    "thumbnailGeneration",
+    "metadataExtraction",
+    "videoConversion",
+    "faceDetection",
+    "facialRecognition",
+    "smartSearch",
+    "duplicateDetection",
+    "backgroundTask",
+    "storageTemplateMigration",
+    "migration",
+    "search",
+    "sidecar",
+    "library",
+    "notifications",
+    "backupDatabase",
+)
+
+
+def _job(active: int = 0, waiting: int = 0) -> dict:
+    return {
+        "jobCounts": {
+            "active": active,
+            "completed": 0,
+            "failed": 0,
+            "delayed": 0,
+            "waiting": waiting,
+            "paused": 0,
+        },
+        "queueStatus": {"isActive": bool(active), "isPaused": False},
+    }
+
+
+class FakeImmich:
+    """Serve the endpoints the integration polls with tunable cost.
+
+    Every request is counted per route and delayed by latency seconds.
+    The number of job queues, favorite assets and the thumbnail size set
+    the payload sizes.
+    """
+
+    def __init__(
+        self,
+        queues: int = len(JOB_NAMES),
+        latency: float = 0.0,
+        favorites: int = 100,
+        thumbnail_bytes: int = 64 * 1024,
+    ) -> None:
+        """Initialize the server."""
+        self.latency = latency
+        # Answer every request with 401, as for a deleted API key.
+        self.revoked = False
+        # Extra delay of every upload, on top of latency.
+        self.upload_latency = 0.0
+        self.requests: Counter[str] = Counter()
+        self.jobs = {
+            JOB_NAMES[i] if i < len(JOB_NAMES) else f"queue{i}": _job()
+            for i in range(queues)
+        }
+        self.favorites = [
+            {
+                "id": str(uuid.uuid4()),
+                "type": "IMAGE",
+                "updatedAt": "2024-01-01T00:00:00.000Z",
+            }
+            for _ in range(favorites)
+        ]
+        self.thumbnail = b"\xff\xd8" + bytes(max(thumbnail_bytes - 2, 0))
+        self.albums: list[dict] = []
+        # SHA-1 checksums of the assets on the server.
+        self.checksums: set[str] = set()
+        # Uploaded assets, found by searches on createdAfter.
+        self.uploads: list[dict] = []
+        # Original files by asset ID, and the Range headers they were asked with.
+        self.originals: dict[str, bytes] = {}
+        self.ranges: list[str | None] = []
+
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/api/auth/validateToken", self._validate_token)
+        app.router.add_get("/api/users/me", self._users_me)
+        app.router.add_get("/api/jobs", self._jobs)
+        app.router.add_put("/api/jobs/{name}", self._job_command)
+        app.router.add_get("/api/server/statistics", self._statistics)
+        app.router.add_get("/api/albums", self._albums)
+        app.router.add_get("/api/memories", self._memories)
+        app.router.add_post("/api/search/metadata", self._search_metadata)
+        app.router.add_post("/api/search/smart", self._search_smart)
+        app.router.add_get("/api/assets/{id}/thumbnail", self._thumbnail)
+        app.router.add_get("/api/assets/{id}/original", self._original)
+        app.router.add_get("/api/assets/{id}", self._asset)
+        app.router.add_post("/api/assets/bulk-upload-check", self._bulk_upload_check)
+        app.router.add_post("/api/assets", self._upload)
+        self.server = TestServer(app)
+
+    async def __aenter__(self) -> FakeImmich:
+        """Start the server."""
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        await self.server.close()
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the server."""
+        return str(self.server.make_url("/"))
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    def bump(self, name: str) -> None:
+        """Queue one more job on a queue, changing its snapshot."""
+        self.jobs[name]["jobCounts"]["waiting"] += 1
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        route = request.match_info.route.resource
+        self.requests[route.canonical if route else request.path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.revoked:
+            return web.json_response({"message": "Invalid API key"}, status=401)
+        return await handler(request)
+
+    async def _validate_token(self, request: web.Request) -> web.Response:
+        return web.json_response({"authStatus": True})
+
+    async def _users_me(self, request: web.Request) -> web.Response:
+        return web.json_response({"id": "user-1", "name": "Bench", "email": "b@x"})
+
+    async def _jobs(self, request: web.Request) -> web.Response:
+        return web.json_response(self.jobs)
+
+    async def _job_command(self, request: web.Request) -> web.Response:
+        job = self.jobs[request.match_info["name"]]
+        command = (await request.json())["command"]
+        job["queueStatus"]["isPaused"] = command == "pause"
+        return web.json_response(job)
+
+    async def _statistics(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"photos": len(self.favorites), "videos": 0, "usage": 0, "usageByUser": []}
+        )
+
+    async def _albums(self, request: web.Request) -> web.Response:
+        return web.json_response(self.albums)
+
+    async def _memories(self, request: web.Request) -> web.Response:
+        return web.json_response([])
+
+    async def _search_metadata(self, request: web.Request) -> web.Response:
+        query = await request.json()
+        if "createdAfter" in query:
+            items = [
+                asset
+                for asset in self.uploads
+                if query["createdAfter"] <= asset["createdAt"] <= query["createdBefore"]
+            ]
+        else:
+            items = self.favorites
+        return web.json_response({"assets": {"items": items, "nextPage": None}})
+
+    async def _search_smart(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"assets": {"items": self.favorites, "nextPage": None}}
+        )
+
+    async def _thumbnail(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.thumbnail, content_type="image/jpeg")
+
+    async def _asset(self, request: web.Request) -> web.Response:
+        asset_id = request.match_info["id"]
+        if asset_id not in self.originals:
+            return web.json_response({}, status=404)
+        return web.json_response(
+            {"id": asset_id, "type": "IMAGE", "originalFileName": f"{asset_id}.jpg"}
+        )
+
+    async def _original(self, request: web.Request) -> web.Response:
+        body = self.originals[request.match_info["id"]]
+        self.ranges.append(request.headers.get("Range"))
+        if (range_header := request.headers.get("Range")) is None:
+            return web.Response(body=body, content_type="image/jpeg")
+        start = int(range_header.removeprefix("bytes=").rstrip("-"))
+        if start >= len(body):
+            return web.Response(
+                status=416, headers={"Content-Range": f"bytes */{len(body)}"}
+            )
+        return web.Response(
+            body=body[start:],
+            status=206,
+            content_type="image/jpeg",
+            headers={"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"},
+        )
+
+    async def _bulk_upload_check(self, request: web.Request) -> web.Response:
+        assets = (await request.json())["assets"]
+        return web.json_response(
+            {
+                "results": [
+                    {"id": asset["id"], "action": "reject", "reason": "duplicate"}
+                    if asset["checksum"] in self.checksums
+                    else {"id": asset["id"], "action": "accept"}
+                    for asset in assets
+                ]
+            }
+        )
+
+    async def _upload(self, request: web.Request) -> web.Response:
+        if self.upload_latency:
+            await asyncio.sleep(self.upload_latency)
+        digest = hashlib.sha1()
+        async for part in await request.multipart():
+            if part.name == "assetData":
+                while chunk := await part.read_chunk():
+                    digest.update(chunk)
+        checksum = digest.hexdigest()
+        assert checksum == request.headers["x-immich-checksum"]
+        self.checksums.add(checksum)
+        return web.json_response(
+            {"id": str(uuid.uuid4()), "status": "created"}, status=201
+        )
@@ -0,0 +1,41 @@
+"""Test the Immich Integration asset index."""
+
+import random
+import uuid
+
+from custom_components.immich_integration.asset_index import AlbumIndex, PackedIdSet
+
+
+def test_packed_id_set() -> None:
+    """Test the packed set behaves like a sorted set of asset IDs."""
+    asset_ids = [str(uuid.uuid4()) for _ in range(100)]
+    packed = PackedIdSet.from_ids(asset_ids + asset_ids[:10])
+
+    assert len(packed) == 100
+    assert list(packed) == sorted(asset_ids, key=lambda i: uuid.UUID(i).bytes)
+    assert random.choice(packed) in asset_ids
+
+    new_id = str(uuid.uuid4())
+    assert packed.add(new_id)
+    assert not packed.add(new_id)
+    assert new_id in packed
+    assert packed.discard(asset_ids[0])
+    assert not packed.discard(asset_ids[0])
+    assert asset_ids[0] not in packed
+    assert len(packed) == 100
+
+
+def test_album_index_round_trip() -> None:
+    """Test an album index survives serialization."""
+    index = AlbumIndex(
+        asset_ids=PackedIdSet.from_ids([str(uuid.uuid4()) for _ in range(5)]),
+        name="Family",
+        updated_at="2024-05-01T12:00:00.000Z",
+        cursor="2024-05-01T11:00:00.000Z",
+    )
+
+    restored = AlbumIndex.from_dict(index.as_dict())
+
+    assert list(restored.asset_ids) == list(index.asset_ids)
+    assert restored.name == "Family"
+    assert restored.cursor == index.cursor
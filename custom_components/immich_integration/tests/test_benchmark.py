@@ -0,0 +1,192 @@
+"""Benchmark the poll path against a local stand-in for Immich.
+
+Each benchmark records its measurement with record_property, so it shows
+up in the JUnit report, and asserts a budget to catch regressions.
+"""
+
+from collections import Counter
+from datetime import timedelta
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.util import dt as dt_util
+
+from custom_components.immich_integration.const import (
+    DEFAULT_POLL_MAX_INTERVAL,
+    DEFAULT_POLL_MIN_INTERVAL,
+    DOMAIN,
+)
+
+from .fake_immich import FakeImmich
+
+pytestmark = pytest.mark.benchmark
+
+# Binary sensor, switch and three throughput sensors.
+ENTITIES_PER_QUEUE = 5
+# Polls in a minute at the busiest poll rate.
+POLLS_PER_MINUTE = 60 // DEFAULT_POLL_MIN_INTERVAL
+
+
+async def _setup_entries(
+    hass: HomeAssistant, server: FakeImmich, count: int
+) -> list[MockConfigEntry]:
+    """Set up count config entries against the server."""
+    entries = []
+    for i in range(count):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Bench {i}",
+            data={CONF_HOST: server.url, CONF_API_KEY: "key"},
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await hass.async_block_till_done()
+    return entries
+
+
+def _assert_entities(
+    hass: HomeAssistant, server: FakeImmich, entries: list[MockConfigEntry]
+) -> None:
+    """Assert every entry registered its own entities for all queues."""
+    entity_registry = er.async_get(hass)
+    for entry in entries:
+        assert len(
+            er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+        ) >= len(server.jobs) * ENTITIES_PER_QUEUE
+
+
+async def _unload_entries(hass: HomeAssistant, entries: list[MockConfigEntry]) -> None:
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("queues", [15, 50])
+async def test_requests_per_poll(
+    hass: HomeAssistant, queues: int, record_property
+) -> None:
+    """Test a poll cycle costs one request however many queues there are."""
+    async with FakeImmich(queues=queues) as server:
+        entries = await _setup_entries(hass, server, 1)
+        coordinator = hass.data[DOMAIN][entries[0].entry_id].coordinator
+
+        server.requests.clear()
+        for _ in range(10):
+            await coordinator.async_refresh()
+        requests_per_poll = server.requests["/api/jobs"] / 10
+
+        record_property("requests_per_poll", requests_per_poll)
+        assert requests_per_poll == 1
+        await _unload_entries(hass, entries)
+
+
+@pytest.mark.parametrize("count", [1, 5])
+async def test_requests_per_poll_per_server(
+    hass: HomeAssistant, count: int, record_property
+) -> None:
+    """Test entries for the same server share one poll per cycle.
+
+    Every entry has its own entities, and all of them follow the snapshot
+    the shared poll fetched.
+    """
+    async with FakeImmich() as server:
+        entries = await _setup_entries(hass, server, count)
+        _assert_entities(hass, server, entries)
+
+        name = next(iter(server.jobs))
+        server.requests.clear()
+        for _ in range(10):
+            server.bump(name)
+            async_fire_time_changed(
+                hass, dt_util.utcnow() + timedelta(seconds=DEFAULT_POLL_MAX_INTERVAL)
+            )
+            await hass.async_block_till_done()
+        requests_per_poll = server.requests["/api/jobs"] / 10
+
+        record_property("requests_per_poll", requests_per_poll)
+        assert requests_per_poll == 1
+        entity_registry = er.async_get(hass)
+        for entry in entries:
+            entity_id = entity_registry.async_get_entity_id(
+                "binary_sensor", DOMAIN, f"{entry.entry_id}_status_{name}"
+            )
+            assert hass.states.get(entity_id).attributes["waiting"] == 10
+        await _unload_entries(hass, entries)
+
+
+@pytest.mark.parametrize(
+    ("count", "latency"), [(1, 0.0), (10, 0.0), (50, 0.0), (1, 0.05)]
+)
+async def test_setup_time(
+    hass: HomeAssistant, count: int, latency: float, record_property
+) -> None:
+    """Test the wall time of setting up config entries."""
+    async with FakeImmich(latency=latency) as server:
+        start = time.perf_counter()
+        entries = await _setup_entries(hass, server, count)
+        per_entry = (time.perf_counter() - start) / count
+        _assert_entities(hass, server, entries)
+
+        record_property("setup_seconds_per_entry", round(per_entry, 4))
+        record_property("setup_requests", server.total_requests)
+        assert server.requests["/api/jobs"] == count
+        assert per_entry < 1.0 + 20 * latency
+        await _unload_entries(hass, entries)
+
+
+async def test_state_writes_per_minute(hass: HomeAssistant, record_property) -> None:
+    """Test only the entities of changed queues write state."""
+    async with FakeImmich() as server:
+        entries = await _setup_entries(hass, server, 1)
+        coordinator = hass.data[DOMAIN][entries[0].entry_id].coordinator
+        # Give the throughput window a second sample before counting.
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        writes: Counter[str] = Counter()
+        write_ha_state = Entity.async_write_ha_state
+
+        def _count_writes(entity: Entity) -> None:
+            writes[entity.entity_id] += 1
+            write_ha_state(entity)
+
+        names = list(server.jobs)
+        with patch.object(Entity, "async_write_ha_state", _count_writes):
+            for poll in range(POLLS_PER_MINUTE):
+                server.bump(names[poll % len(names)])
+                await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+        record_property("state_writes_per_minute", writes.total())
+        assert writes.total() <= POLLS_PER_MINUTE * ENTITIES_PER_QUEUE
+        await _unload_entries(hass, entries)
+
+
+@pytest.mark.parametrize("count", [1, 10, 50])
+async def test_memory_per_entry(
+    hass: HomeAssistant, count: int, record_property
+) -> None:
+    """Test the memory held by each config entry."""
+    async with FakeImmich() as server:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        entries = await _setup_entries(hass, server, count)
+        per_entry = (tracemalloc.get_traced_memory()[0] - before) / count
+        tracemalloc.stop()
+        _assert_entities(hass, server, entries)
+
+        record_property("bytes_per_entry", int(per_entry))
+        assert per_entry < 4 * 1024 * 1024
+        await _unload_entries(hass, entries)
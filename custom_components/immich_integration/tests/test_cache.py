@@ -0,0 +1,124 @@
+"""Test the Immich Integration caches."""
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.immich_integration.cache import SingleFlight, ThumbnailCache
+
+
+def _fetch() -> AsyncMock:
+    """Return a fetch that answers with a 100 byte JPEG per asset."""
+    return AsyncMock(
+        side_effect=lambda asset_id, size: (
+            asset_id.encode().ljust(100, b"\0"),
+            "image/jpeg",
+        )
+    )
+
+
+async def test_memory_hits_skip_the_fetch(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test a second request is answered from memory."""
+    cache = ThumbnailCache(hass, str(tmp_path))
+    await cache.async_load()
+    fetch = _fetch()
+
+    first = await cache.async_get("a", "preview", fetch)
+    assert await cache.async_get("a", "preview", fetch) == first
+    assert await cache.async_get("a", "thumbnail", fetch) != first
+
+    assert fetch.await_count == 2
+    assert cache.stats["memory_hits"] == 1
+    assert cache.stats["misses"] == 2
+
+
+async def test_disk_tier_evicts_and_survives_restart(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test the disk tier stays within budget and is reloaded after a restart."""
+    cache = ThumbnailCache(
+        hass, str(tmp_path), max_memory_bytes=100, max_disk_bytes=250
+    )
+    await cache.async_load()
+    fetch = _fetch()
+    for asset_id in ("a", "b", "c"):
+        await cache.async_get(asset_id, "preview", fetch)
+
+    # The least recently used file went to make room for the third one.
+    assert sorted(os.listdir(tmp_path)) == ["b_preview.jpg", "c_preview.jpg"]
+    assert cache.stats["disk_bytes"] == 200
+
+    # "b" is only on disk now, as memory holds a single thumbnail.
+    assert await cache.async_get("b", "preview", fetch) == (
+        b"b".ljust(100, b"\0"),
+        "image/jpeg",
+    )
+    assert cache.stats["disk_hits"] == 1
+
+    restarted = ThumbnailCache(
+        hass, str(tmp_path), max_memory_bytes=100, max_disk_bytes=250
+    )
+    await restarted.async_load()
+    fetch.reset_mock()
+    for asset_id in ("b", "c"):
+        await restarted.async_get(asset_id, "preview", fetch)
+
+    fetch.assert_not_awaited()
+    assert restarted.stats["disk_hits"] == 2
+
+
+async def test_concurrent_misses_share_one_fetch(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test requests for a thumbnail being downloaded wait for that download."""
+    cache = ThumbnailCache(hass, str(tmp_path))
+    await cache.async_load()
+    release = asyncio.Event()
+
+    async def fetch(asset_id: str, size: str) -> tuple[bytes, str]:
+        await release.wait()
+        return b"image", "image/jpeg"
+
+    fetch_mock = AsyncMock(side_effect=fetch)
+    waiters = [
+        asyncio.create_task(cache.async_get("a", "preview", fetch_mock))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [(b"image", "image/jpeg")] * 3
+    assert fetch_mock.await_count == 1
+    assert cache.stats["coalesced"] == 2
+
+
+async def test_single_flight_survives_a_cancelled_caller() -> None:
+    """Test callers share one call, which outlives a cancelled caller."""
+    flight: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    first = asyncio.create_task(flight.async_run("key", call))
+    second = asyncio.create_task(flight.async_run("key", call))
+    await asyncio.sleep(0)
+    assert "key" in flight
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+
+    assert await second == 1
+    assert flight.coalesced_calls == 1
+    assert "key" not in flight
+    assert await flight.async_run("key", call) == 2
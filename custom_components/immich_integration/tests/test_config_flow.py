@@ -3,11 +3,12 @@
 from unittest.mock import AsyncMock, patch
 
 from homeassistant import config_entries
-from homeassistant.components.immich_integration.config_flow import CannotConnect, InvalidAuth
-from homeassistant.components.immich_integration.const import DOMAIN
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from custom_components.immich_integration.const import DOMAIN
+from custom_components.immich_integration.hub import CannotConnect, InvalidAuth
+from homeassistant.const import CONF_API_KEY, CONF_HOST
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 
 async def test_form(hass: HomeAssistant, mock_setup_entry: AsyncMock) -> None:
@@ -19,25 +20,26 @@ async def test_form(hass: HomeAssistant, mock_setup_entry: AsyncMock) -> None:
     assert result["errors"] == {}
 
     with patch(
-        "homeassistant.components.immich_integration.config_flow.PlaceholderHub.authenticate",
+        "custom_components.immich_integration.config_flow.ImmichHub.authenticate",
         return_value=True,
+    ), patch(
+        "custom_components.immich_integration.config_flow.ImmichHub.get_my_user_info",
+        return_value={"name": "Test User"},
     ):
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {
                 CONF_HOST: "1.1.1.1",
-                CONF_USERNAME: "test-username",
-                CONF_PASSWORD: "test-password",
+                CONF_API_KEY: "test-api-key",
             },
         )
         await hass.async_block_till_done()
 
     assert result["type"] == FlowResultType.CREATE_ENTRY
-    assert result["title"] == "Name of the device"
+    assert result["title"] == "Test User @ 1.1.1.1"
     assert result["data"] == {
         CONF_HOST: "1.1.1.1",
-        CONF_USERNAME: "test-username",
-        CONF_PASSWORD: "test-password",
+        CONF_API_KEY: "test-api-key",
     }
     assert len(mock_setup_entry.mock_calls) == 1
 
@@ -51,15 +53,14 @@ async def test_form_invalid_auth(
     )
 
     with patch(
-        "homeassistant.components.immich_integration.config_flow.PlaceholderHub.authenticate",
+        "custom_components.immich_integration.config_flow.ImmichHub.authenticate",
         side_effect=InvalidAuth,
     ):
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {
                 CONF_HOST: "1.1.1.1",
-                CONF_USERNAME: "test-username",
-                CONF_PASSWORD: "test-password",
+                CONF_API_KEY: "test-api-key",
             },
         )
 
@@ -70,25 +71,26 @@ async def test_form_invalid_auth(
     # FlowResultType.CREATE_ENTRY or FlowResultType.ABORT so
     # we can show the config flow is able to recover from an error.
     with patch(
-        "homeassistant.components.immich_integration.config_flow.PlaceholderHub.authenticate",
+        "custom_components.immich_integration.config_flow.ImmichHub.authenticate",
         return_value=True,
+    ), patch(
+        "custom_components.immich_integration.config_flow.ImmichHub.get_my_user_info",
+        return_value={"name": "Test User"},
     ):
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {
                 CONF_HOST: "1.1.1.1",
-                CONF_USERNAME: "test-username",
-                CONF_PASSWORD: "test-password",
+                CONF_API_KEY: "test-api-key",
             },
         )
         await hass.async_block_till_done()
 
     assert result["type"] == FlowResultType.CREATE_ENTRY
-    assert result["title"] == "Name of the device"
+    assert result["title"] == "Test User @ 1.1.1.1"
     assert result["data"] == {
         CONF_HOST: "1.1.1.1",
-        CONF_USERNAME: "test-username",
-        CONF_PASSWORD: "test-password",
+        CONF_API_KEY: "test-api-key",
     }
     assert len(mock_setup_entry.mock_calls) == 1
 
@@ -102,15 +104,14 @@ async def test_form_cannot_connect(
     )
 
     with patch(
-        "homeassistant.components.immich_integration.config_flow.PlaceholderHub.authenticate",
+        "custom_components.immich_integration.config_flow.ImmichHub.authenticate",
         side_effect=CannotConnect,
     ):
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {
                 CONF_HOST: "1.1.1.1",
-                CONF_USERNAME: "test-username",
-                CONF_PASSWORD: "test-password",
+                CONF_API_KEY: "test-api-key",
             },
         )
 
@@ -122,24 +123,62 @@ async def test_form_cannot_connect(
     # we can show the config flow is able to recover from an error.
 
     with patch(
-        "homeassistant.components.immich_integration.config_flow.PlaceholderHub.authenticate",
+        "custom_components.immich_integration.config_flow.ImmichHub.authenticate",
         return_value=True,
+    ), patch(
+        "custom_components.immich_integration.config_flow.ImmichHub.get_my_user_info",
+        return_value={"name": "Test User"},
     ):
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {
                 CONF_HOST: "1.1.1.1",
-                CONF_USERNAME: "test-username",
-                CONF_PASSWORD: "test-password",
+                CONF_API_KEY: "test-api-key",
             },
         )
         await hass.async_block_till_done()
 
     assert result["type"] == FlowResultType.CREATE_ENTRY
-    assert result["title"] == "Name of the device"
+    assert result["title"] == "Test User @ 1.1.1.1"
     assert result["data"] == {
         CONF_HOST: "1.1.1.1",
-        CONF_USERNAME: "test-username",
-        CONF_PASSWORD: "test-password",
+        CONF_API_KEY: "test-api-key",
     }
     assert len(mock_setup_entry.mock_calls) == 1
+
+
+async def test_reauth(hass: HomeAssistant, mock_setup_entry: AsyncMock) -> None:
+    """Test a new API key replaces the rejected one."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: "1.1.1.1", CONF_API_KEY: "old-api-key"}
+    )
+    entry.add_to_hass(hass)
+    result = await entry.start_reauth_flow(hass)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "reauth_confirm"
+
+    with patch(
+        "custom_components.immich_integration.config_flow.ImmichHub.authenticate",
+        side_effect=CannotConnect,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_API_KEY: "new-api-key"}
+        )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+
+    with patch(
+        "custom_components.immich_integration.config_flow.ImmichHub.authenticate",
+        return_value=True,
+    ), patch(
+        "custom_components.immich_integration.config_flow.ImmichHub.get_my_user_info",
+        return_value={"name": "Test User"},
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_API_KEY: "new-api-key"}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert entry.data == {CONF_HOST: "1.1.1.1", CONF_API_KEY: "new-api-key"}
@@ -0,0 +1,98 @@
+"""Test the Immich Integration coordinators."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.immich_integration.const import (
+    CONF_POLL_BACKOFF,
+    CONF_POLL_MAX_INTERVAL,
+    CONF_POLL_MIN_INTERVAL,
+    DOMAIN,
+)
+from custom_components.immich_integration.coordinator import ImmichJobsCoordinator
+from custom_components.immich_integration.hub import ImmichHub
+from custom_components.immich_integration.models import Job, JobCounts, QueueStatus
+
+IDLE = {"thumbnailGeneration": Job(counts=JobCounts(), status=QueueStatus())}
+BUSY = {
+    "thumbnailGeneration": Job(
+        counts=JobCounts(active=1, waiting=5), status=QueueStatus(is_active=True)
+    )
+}
+
+
+async def test_poll_interval_adapts_to_activity(hass: HomeAssistant) -> None:
+    """Test the interval backs off while idle and drops to the floor on work."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        options={
+            CONF_POLL_MIN_INTERVAL: 10,
+            CONF_POLL_MAX_INTERVAL: 60,
+            CONF_POLL_BACKOFF: 2.0,
+        },
+    )
+    entry.add_to_hass(hass)
+    hub = ImmichHub(host="http://immich.local", api_key="key")
+    coordinator = ImmichJobsCoordinator(hass, entry, hub)
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+    with patch.object(hub, "get_jobs", return_value=IDLE) as get_jobs:
+        intervals = []
+        for _ in range(4):
+            await coordinator.async_refresh()
+            intervals.append(coordinator.update_interval.total_seconds())
+        # Idle cycles multiply the interval up to the ceiling.
+        assert intervals == [20, 40, 60, 60]
+
+        get_jobs.return_value = BUSY
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=10)
+
+        get_jobs.return_value = IDLE
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=20)
+
+        # A command brings the next poll back to the floor, even when idle.
+        await coordinator.async_command_issued()
+        assert coordinator.update_interval == timedelta(seconds=10)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=20)
+
+    await coordinator.async_shutdown()
+    await hub.async_close()
+
+
+async def test_push_connection_sets_the_interval(hass: HomeAssistant) -> None:
+    """Test idle polling relaxes while pushed and returns to the floor after."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        options={CONF_POLL_MIN_INTERVAL: 10, CONF_POLL_MAX_INTERVAL: 300},
+    )
+    entry.add_to_hass(hass)
+    hub = ImmichHub(host="http://immich.local", api_key="key")
+    coordinator = ImmichJobsCoordinator(hass, entry, hub)
+
+    with patch.object(hub, "get_jobs", return_value=IDLE) as get_jobs:
+        coordinator.async_set_push_connected(True)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=300)
+
+        # Work still pulls the interval down while pushed.
+        get_jobs.return_value = BUSY
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=10)
+
+        get_jobs.return_value = IDLE
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=300)
+
+        coordinator.async_set_push_connected(False)
+        assert coordinator.update_interval == timedelta(seconds=10)
+        await hass.async_block_till_done()
+
+    await coordinator.async_shutdown()
+    await hub.async_close()
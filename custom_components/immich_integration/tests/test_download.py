@@ -0,0 +1,65 @@
+"""Test downloading assets."""
+
+from pathlib import Path
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.immich_integration.download import (
+    async_download_assets,
+    async_download_original,
+)
+from custom_components.immich_integration.hub import ImmichHub
+
+from .fake_immich import FakeImmich
+
+
+async def test_download_resumes_partial_files(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test originals are streamed to disk and partial files are resumed."""
+    original = bytes(range(256)) * 4096
+    (tmp_path / "a.jpg.part").write_bytes(original[:1000])
+    (tmp_path / "c.jpg").write_bytes(b"already here")
+
+    async with FakeImmich() as server:
+        server.originals = {"a": original, "b": original, "c": original}
+        hub = ImmichHub(host=server.url, api_key="key")
+        result = await async_download_assets(
+            hass, hub, ["a", "b", "c"], None, str(tmp_path), max_parallel=2
+        )
+        await hub.async_close()
+
+    assert result.downloaded == {
+        "a": str(tmp_path / "a.jpg"),
+        "b": str(tmp_path / "b.jpg"),
+    }
+    assert result.skipped == [str(tmp_path / "c.jpg")]
+    assert (tmp_path / "a.jpg").read_bytes() == original
+    assert (tmp_path / "b.jpg").read_bytes() == original
+    assert not (tmp_path / "a.jpg.part").exists()
+    assert len(server.ranges) == 2
+    assert set(server.ranges) == {"bytes=1000-", None}
+
+
+@pytest.mark.parametrize(
+    ("partial", "ranges"),
+    [(b"original", ["bytes=8-"]), (b"stale original", ["bytes=14-", None])],
+)
+async def test_download_checks_partial_file_at_the_end(
+    hass: HomeAssistant, tmp_path: Path, partial: bytes, ranges: list[str | None]
+) -> None:
+    """Test a partial file past the end is kept only if it has the asset's size."""
+    path = tmp_path / "a.jpg"
+    (tmp_path / "a.jpg.part").write_bytes(partial)
+
+    async with FakeImmich() as server:
+        server.originals = {"a": b"original"}
+        hub = ImmichHub(host=server.url, api_key="key")
+        await async_download_original(hass, hub, "a", str(path))
+        await hub.async_close()
+
+    assert path.read_bytes() == b"original"
+    assert not (tmp_path / "a.jpg.part").exists()
+    assert server.ranges == ranges
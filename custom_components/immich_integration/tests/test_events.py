@@ -0,0 +1,130 @@
+"""Test the asset events."""
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.immich_integration.asset_index import AlbumIndexStore
+from custom_components.immich_integration.const import DOMAIN
+from custom_components.immich_integration.events import (
+    EVENT_IMMICH,
+    TRIGGER_ASSET_UPLOADED,
+    TRIGGER_PERSON_RECOGNIZED,
+    AssetCursor,
+    AssetEventTracker,
+)
+from custom_components.immich_integration.hub import ImmichHub
+
+from .fake_immich import FakeImmich
+
+
+def test_asset_cursor_handles_shared_timestamps() -> None:
+    """Test assets created at the cursor's instant are reported once."""
+    cursor = AssetCursor("2024-01-01T00:00:00.000Z")
+    cursor.advance("2024-01-01T00:00:01.000Z", "a")
+
+    assert not cursor.is_new("2024-01-01T00:00:01.000Z", "a")
+    assert cursor.is_new("2024-01-01T00:00:01.000Z", "b")
+    assert not cursor.is_new("2024-01-01T00:00:00.500Z", "c")
+
+    cursor.advance("2024-01-01T00:00:01.000Z", "b")
+    assert AssetCursor.from_dict(cursor.as_dict()) == cursor
+
+
+async def test_new_uploads_fire_once(hass: HomeAssistant) -> None:
+    """Test each upload and recognized person fires exactly one event."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    events = async_capture_events(hass, EVENT_IMMICH)
+
+    async with FakeImmich() as server:
+        hub = ImmichHub(host=server.url, api_key="key")
+        albums = AlbumIndexStore(hass, hub, entry.entry_id)
+        tracker = AssetEventTracker(hass, entry, hub, albums)
+
+        # The first poll only places the cursors.
+        await tracker.async_poll()
+        start = tracker.stats["uploads"]
+        server.uploads = [
+            {"id": "a", "type": "IMAGE", "createdAt": start},
+            {
+                "id": "b",
+                "type": "IMAGE",
+                "createdAt": start,
+                "people": [{"id": "p", "name": "Ann"}],
+            },
+        ]
+
+        await tracker.async_poll()
+        await tracker.async_poll()
+        await hub.async_close()
+
+    assert [(event.data["type"], event.data["asset_id"]) for event in events] == [
+        (TRIGGER_ASSET_UPLOADED, "a"),
+        (TRIGGER_ASSET_UPLOADED, "b"),
+        (TRIGGER_PERSON_RECOGNIZED, "b"),
+    ]
+    assert events[2].data["person_name"] == "Ann"
+
+
+async def test_uploads_not_repeated_after_restart(hass: HomeAssistant) -> None:
+    """Test a restart right after a poll does not fire its events again."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    events = async_capture_events(hass, EVENT_IMMICH)
+
+    async with FakeImmich() as server:
+        hub = ImmichHub(host=server.url, api_key="key")
+        albums = AlbumIndexStore(hass, hub, entry.entry_id)
+        tracker = AssetEventTracker(hass, entry, hub, albums)
+        await tracker.async_poll()
+        server.uploads = [
+            {"id": "a", "type": "IMAGE", "createdAt": tracker.stats["uploads"]}
+        ]
+        await tracker.async_poll()
+
+        restarted = AssetEventTracker(hass, entry, hub, albums)
+        await restarted.async_load()
+        await restarted.async_poll()
+        await hub.async_close()
+
+    assert [event.data["asset_id"] for event in events] == ["a"]
+
+
+async def test_events_fire_on_the_entry_device(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry
+) -> None:
+    """Test each entry fires its events on its own device."""
+    events = async_capture_events(hass, EVENT_IMMICH)
+
+    async with FakeImmich() as server:
+        devices = {}
+        trackers = []
+        for _ in range(2):
+            entry = MockConfigEntry(domain=DOMAIN)
+            entry.add_to_hass(hass)
+            devices[entry.entry_id] = device_registry.async_get_or_create(
+                config_entry_id=entry.entry_id, identifiers={(DOMAIN, entry.entry_id)}
+            ).id
+            hub = ImmichHub(host=server.url, api_key="key")
+            tracker = AssetEventTracker(
+                hass, entry, hub, AlbumIndexStore(hass, hub, entry.entry_id)
+            )
+            await tracker.async_poll()
+            trackers.append(tracker)
+
+        server.uploads = [
+            {"id": "a", "type": "IMAGE", "createdAt": trackers[1].stats["uploads"]}
+        ]
+        for tracker in trackers:
+            await tracker.async_poll()
+            await tracker.hub.async_close()
+
+    assert len(events) == 2
+    assert {
+        event.data["config_entry_id"]: event.data["device_id"] for event in events
+    } == devices
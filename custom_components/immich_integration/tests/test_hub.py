@@ -0,0 +1,254 @@
+"""Test the Immich Integration hub."""
+
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from custom_components.immich_integration.hub import (
+    CannotConnect,
+    CircuitBreaker,
+    ImmichHub,
+    ImmichServer,
+    TokenBucket,
+    diff_jobs,
+)
+from custom_components.immich_integration.models import (
+    Job,
+    JobCounts,
+    QueueStatus,
+    parse_jobs,
+)
+from custom_components.immich_integration.throughput import JobThroughput
+
+from .fake_immich import FakeImmich
+
+
+def _job(active: int = 0, waiting: int = 0, paused: bool = False) -> Job:
+    return Job(
+        counts=JobCounts(active=active, waiting=waiting),
+        status=QueueStatus(is_active=active > 0, is_paused=paused),
+    )
+
+
+def test_diff_jobs_reports_only_changed_queues() -> None:
+    """Test only queues with different status or counts are reported."""
+    old = {"thumbnailGeneration": _job(), "metadataExtraction": _job()}
+    new = {"thumbnailGeneration": _job(active=1, waiting=5), "metadataExtraction": _job()}
+
+    assert diff_jobs(old, new) == {"thumbnailGeneration"}
+
+
+def test_diff_jobs_added_and_removed_queues() -> None:
+    """Test appearing and disappearing queues count as changed."""
+    old = {"thumbnailGeneration": _job(), "sidecar": _job()}
+    new = {"thumbnailGeneration": _job(), "smartSearch": _job(paused=True)}
+
+    assert diff_jobs(old, new) == {"sidecar", "smartSearch"}
+    assert diff_jobs({}, new) == set(new)
+
+
+async def test_get_jobs_coalesces_and_caches() -> None:
+    """Test concurrent callers share one request and later ones hit the cache."""
+    server = ImmichServer("http://immich.local", jobs_cache_ttl=60)
+    hub = ImmichHub(host=server.host, api_key="key", server=server)
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> dict[str, Job]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"thumbnailGeneration": _job()}
+
+    with patch.object(hub, "_async_fetch_jobs", side_effect=fetch):
+        waiters = [asyncio.create_task(hub.get_jobs(True)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        assert await hub.get_jobs(True) == results[0]
+
+        assert calls == 1
+        assert hub.cache_stats == {"hits": 1, "misses": 3, "coalesced": 2}
+
+        hub.invalidate_jobs()
+        await hub.get_jobs(True)
+        assert calls == 2
+
+
+async def test_invalidate_drops_the_answer_in_flight() -> None:
+    """Test a request superseded by a write does not publish its answer."""
+    server = ImmichServer("http://immich.local", jobs_cache_ttl=60)
+    hub = ImmichHub(host=server.host, api_key="key", server=server)
+    received: list[dict[str, Job]] = []
+    hub.add_jobs_listener(received.append)
+    release = asyncio.Event()
+
+    async def fetch() -> dict[str, Job]:
+        await release.wait()
+        return {"thumbnailGeneration": _job(paused=False)}
+
+    with patch.object(hub, "_async_fetch_jobs", side_effect=fetch):
+        stale = asyncio.create_task(hub.get_jobs(False))
+        await asyncio.sleep(0)
+        hub.invalidate_jobs()
+        release.set()
+        await stale
+
+    assert hub.jobs == {}
+    assert received == []
+
+    fresh = {"thumbnailGeneration": _job(paused=True)}
+    with patch.object(hub, "_async_fetch_jobs", return_value=fresh):
+        assert await hub.get_jobs(True) == fresh
+    assert received == [fresh]
+
+
+async def test_hubs_share_the_server_snapshot() -> None:
+    """Test hubs for one server share the job snapshot and its listeners."""
+    server = ImmichServer("http://immich.local")
+    first = ImmichHub(host=server.host, api_key="alice", server=server)
+    second = ImmichHub(host=server.host, api_key="bob", server=server)
+    received: list[dict[str, Job]] = []
+    second.add_jobs_listener(received.append)
+
+    jobs = {"thumbnailGeneration": _job(active=1)}
+    with patch.object(first, "_async_fetch_jobs", return_value=jobs):
+        await first.get_jobs(False)
+
+    assert second.jobs == jobs
+    assert received == [jobs]
+    assert server.users == 2
+    await first.async_close()
+    assert not server.closed
+    await second.async_close()
+    assert server.closed
+
+
+async def test_job_commands_report_each_queue() -> None:
+    """Test one failing queue does not fail the others, bounded in parallel."""
+    hub = ImmichHub(host="http://immich.local", api_key="key")
+    in_flight = peak = 0
+
+    async def job_command(command: str, job_id: str, force: bool) -> bool:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        if job_id == "offline":
+            raise CannotConnect
+        return job_id != "rejected"
+
+    queues = ["offline", "rejected", *(f"queue{i}" for i in range(6))]
+    with patch.object(hub, "job_command", side_effect=job_command):
+        result = await hub.job_commands("start", queues, max_parallel=2)
+
+    assert result == {
+        "offline": False,
+        "rejected": False,
+        **{f"queue{i}": True for i in range(6)},
+    }
+    assert peak == 2
+    await hub.async_close()
+
+
+async def test_token_bucket_delays_beyond_burst() -> None:
+    """Test requests beyond the burst wait for their token."""
+    bucket = TokenBucket(rate=10, burst=2)
+    with patch(
+        "custom_components.immich_integration.hub.asyncio.sleep"
+    ) as sleep:
+        for _ in range(4):
+            await bucket.acquire()
+
+    assert bucket.throttled == 2
+    delays = [call.args[0] for call in sleep.await_args_list]
+    assert delays[0] == pytest.approx(0.1, abs=0.01)
+    assert delays[1] == pytest.approx(0.2, abs=0.01)
+
+
+def test_circuit_breaker_opens_and_probes() -> None:
+    """Test the breaker short-circuits after failures and lets one probe through."""
+    breaker = CircuitBreaker("immich.local", threshold=2, min_interval=60)
+    assert breaker.before_request() is False
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CannotConnect):
+        breaker.before_request()
+
+    breaker = CircuitBreaker("immich.local", threshold=1, min_interval=0)
+    breaker.record_failure()
+    assert breaker.before_request() is True
+    with pytest.raises(CannotConnect):
+        breaker.before_request()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.before_request() is False
+
+
+async def test_pool_waits_do_not_open_the_breaker() -> None:
+    """Test timing out on a busy pool is not counted against the server."""
+    async with FakeImmich(latency=0.5) as fake:
+        server = ImmichServer(fake.url, limit_per_host=1)
+        hub = ImmichHub(host=fake.url, api_key="key", server=server)
+        fake.originals = {"busy": b"original"}
+        async with hub.download_original("busy"):
+            # A long transfer does not hold up requests on the poll pool.
+            await hub.get_my_user_info()
+
+        slow = asyncio.create_task(hub.get_my_user_info())
+        await asyncio.sleep(0.1)
+        for _ in range(3):
+            with pytest.raises(CannotConnect):
+                await hub._request_json(
+                    "GET",
+                    "/api/server/statistics",
+                    retry=False,
+                    timeout=aiohttp.ClientTimeout(total=0.05),
+                )
+        await slow
+        await hub.async_close()
+
+    assert not hub.breaker.is_open
+
+
+def test_job_throughput_rates() -> None:
+    """Test rates and time to drain come from the rolling window."""
+    throughput = JobThroughput(max_samples=4)
+    assert throughput.completion_rate is None
+
+    for minute, waiting in enumerate((100, 90, 80, 70, 60)):
+        throughput.add_sample(minute * 60.0, JobCounts(waiting=waiting, failed=minute))
+
+    assert throughput.completion_rate == 10
+    assert throughput.failure_rate == 1
+    assert throughput.time_to_drain == 6
+
+    throughput.add_sample(300.0, JobCounts(waiting=60))
+    assert throughput.completion_rate is None
+
+
+def test_parse_jobs() -> None:
+    """Test the jobs response is parsed once and validated."""
+    raw = {
+        "thumbnailGeneration": {
+            "jobCounts": {"active": 1, "failed": 2, "waiting": 3},
+            "queueStatus": {"isActive": True, "isPaused": False},
+        }
+    }
+    jobs = parse_jobs(raw)
+    job = Job(
+        counts=JobCounts(active=1, failed=2, waiting=3),
+        status=QueueStatus(is_active=True),
+    )
+    assert jobs == {"thumbnailGeneration": job}
+    assert parse_jobs({"thumbnailGeneration": job.as_dict()}) == jobs
+
+    with pytest.raises(ValueError, match="thumbnailGeneration"):
+        parse_jobs({"thumbnailGeneration": {"jobCounts": {"active": "1"}}})
+    with pytest.raises(ValueError):
+        parse_jobs([])
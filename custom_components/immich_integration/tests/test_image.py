@@ -0,0 +1,80 @@
+"""Test the Immich Integration slideshow images."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.immich_integration.cache import ThumbnailCache
+from custom_components.immich_integration.image import RotationPool
+
+
+async def _pool(
+    hass: HomeAssistant, tmp_path: Path, asset_ids: list[str], **kwargs: int
+) -> tuple[RotationPool, MagicMock, AsyncMock]:
+    """Return a pool over asset_ids, its hub and its asset list loader."""
+    hub = MagicMock()
+    hub.get_asset_thumbnail = AsyncMock(
+        side_effect=lambda asset_id, size: (asset_id.encode(), "image/jpeg")
+    )
+    thumbnails = ThumbnailCache(hass, str(tmp_path))
+    await thumbnails.async_load()
+    load_asset_ids = AsyncMock(return_value=asset_ids)
+    return RotationPool(hub, thumbnails, load_asset_ids, **kwargs), hub, load_asset_ids
+
+
+async def test_pool_serves_prefetched_assets_in_order(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test assets are shown in the order they were prefetched."""
+    pool, hub, _ = await _pool(
+        hass, tmp_path, [str(i) for i in range(10)], no_repeat=10, pool_size=3
+    )
+    assert pool.pop() is None
+
+    await pool.async_fill()
+    prefetched = [call.args[0] for call in hub.get_asset_thumbnail.await_args_list]
+    assert len(prefetched) == 3
+
+    for asset_id in prefetched:
+        assert pool.pop() == (asset_id, asset_id.encode(), "image/jpeg")
+    assert pool.pop() is None
+
+
+async def test_pool_does_not_repeat_until_exhausted(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test every asset is shown once before any repeats, then not twice in a row."""
+    asset_ids = [str(i) for i in range(5)]
+    pool, _, _ = await _pool(hass, tmp_path, asset_ids, no_repeat=5, pool_size=2)
+
+    shown = []
+    for _ in range(5):
+        await pool.async_fill()
+        shown.append(pool.pop()[0])
+    assert sorted(shown) == asset_ids
+
+    for _ in range(20):
+        await pool.async_fill()
+        asset_id = pool.pop()[0]
+        assert asset_id != shown[-1]
+        shown.append(asset_id)
+
+
+async def test_pool_refresh_drops_removed_assets(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test a refreshed asset list drops prefetched assets no longer in it."""
+    pool, _, load_asset_ids = await _pool(
+        hass, tmp_path, ["a", "b"], no_repeat=2, pool_size=2
+    )
+    await pool.async_fill()
+    load_asset_ids.assert_awaited_once()
+
+    load_asset_ids.return_value = ["a", "d"]
+    await pool.async_refresh_ids()
+    await pool.async_fill()
+
+    shown = {pool.pop()[0] for _ in range(2)}
+    assert shown == {"a", "d"}
+    assert pool.pop() is None
@@ -0,0 +1,192 @@
+"""Test setting up the Immich Integration."""
+
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.config_entries import SOURCE_REAUTH
+from homeassistant.const import CONF_API_KEY, CONF_HOST, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.immich_integration.const import (
+    CONF_CONNECTION_LIMIT,
+    CONF_JOBS_CACHE_TTL,
+    DOMAIN,
+)
+from custom_components.immich_integration.coordinator import STATISTICS_SCAN_INTERVAL
+from custom_components.immich_integration.hub import CannotConnect, ImmichHub
+
+from .fake_immich import FakeImmich
+
+
+def _store_snapshot(
+    hass_storage: dict[str, Any], entry: MockConfigEntry, jobs: dict
+) -> None:
+    """Save a job snapshot for the entry as a previous run would have."""
+    hass_storage[f"{DOMAIN}.{entry.entry_id}.snapshot"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}.snapshot",
+        "data": {"jobs": jobs, "user": None},
+    }
+
+
+async def test_setup_from_snapshot_without_server(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test entities come from the saved snapshot while the server is down."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: "http://127.0.0.1:9", CONF_API_KEY: "key"}
+    )
+    _store_snapshot(hass_storage, entry, FakeImmich(queues=2).jobs)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.thumbnailgeneration_status") is not None
+    assert hass.states.get("switch.metadataextraction_queue") is not None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_server_connection_options(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the connection limit and job cache TTL come from the options."""
+    async with FakeImmich() as server:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_HOST: server.url, CONF_API_KEY: "key"},
+            options={CONF_CONNECTION_LIMIT: 2, CONF_JOBS_CACHE_TTL: 600},
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        hub: ImmichHub = hass.data[DOMAIN][entry.entry_id].hub
+
+        assert hub.session.connector.limit_per_host == 2
+        # Well past the default TTL, the snapshot is still served from cache.
+        freezer.tick(300)
+        await hub.get_jobs(True)
+        assert hub.cache_stats["hits"] == 1
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_migrate_unscoped_unique_ids(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test unique IDs and the device from before they were scoped are moved."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "http://127.0.0.1:9", CONF_API_KEY: "key"},
+        minor_version=1,
+    )
+    entry.add_to_hass(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "immich_integration")}
+    )
+    legacy = entity_registry.async_get_or_create(
+        "binary_sensor",
+        DOMAIN,
+        "status_thumbnailGeneration",
+        config_entry=entry,
+        device_id=device.id,
+    )
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.minor_version == 2
+    assert (
+        entity_registry.async_get(legacy.entity_id).unique_id
+        == f"{entry.entry_id}_status_thumbnailGeneration"
+    )
+    assert device_registry.async_get(device.id) is None
+
+
+async def test_statistics_sensors_recover(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test statistics sensors are added while unreachable and recover later."""
+    async with FakeImmich() as server:
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_HOST: server.url, CONF_API_KEY: "key"}
+        )
+        entry.add_to_hass(hass)
+        with patch.object(
+            ImmichHub, "get_server_statistics", side_effect=CannotConnect
+        ):
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        entity_id = entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{entry.entry_id}_statistics_photos"
+        )
+        assert entity_id is not None
+        assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+        async_fire_time_changed(hass, dt_util.utcnow() + STATISTICS_SCAN_INTERVAL)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert hass.states.get(entity_id).state == str(len(server.favorites))
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_statistics_polled_once_per_server(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test entries for one server share each statistics poll."""
+    async with FakeImmich() as server:
+        entries = []
+        for api_key in ("alice", "bob"):
+            entry = MockConfigEntry(
+                domain=DOMAIN, data={CONF_HOST: server.url, CONF_API_KEY: api_key}
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done(wait_background_tasks=True)
+            entries.append(entry)
+        server.requests.clear()
+        server.favorites.pop()
+
+        async_fire_time_changed(hass, dt_util.utcnow() + STATISTICS_SCAN_INTERVAL)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert server.requests["/api/server/statistics"] == 1
+        for entry in entries:
+            entity_id = entity_registry.async_get_entity_id(
+                "sensor", DOMAIN, f"{entry.entry_id}_statistics_photos"
+            )
+            assert hass.states.get(entity_id).state == str(len(server.favorites))
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_rejected_key_starts_reauth(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test a key rejected after a start from the snapshot asks for a new one."""
+    async with FakeImmich() as server:
+        server.revoked = True
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_HOST: server.url, CONF_API_KEY: "key"}
+        )
+        _store_snapshot(hass_storage, entry, server.jobs)
+        entry.add_to_hass(hass)
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+        assert [flow["context"]["source"] for flow in flows] == [SOURCE_REAUTH]
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,127 @@
+"""Test the Immich Integration media source."""
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.media_player import BrowseError, MediaClass
+from homeassistant.components.media_source import MediaSourceItem, Unresolvable
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.immich_integration.const import DOMAIN
+from custom_components.immich_integration.media_source import ImmichMediaSource
+
+from .fake_immich import FakeImmich
+
+
+@pytest.fixture
+async def server() -> AsyncGenerator[FakeImmich]:
+    """Serve three images and one album holding them."""
+    async with FakeImmich(favorites=3) as server:
+        server.albums = [
+            {
+                "id": "album-1",
+                "albumName": "Holidays",
+                "albumThumbnailAssetId": server.favorites[0]["id"],
+            }
+        ]
+        yield server
+
+
+@pytest.fixture
+async def entry_id(hass: HomeAssistant, server: FakeImmich) -> AsyncGenerator[str]:
+    """Set up an entry for the server and return its ID."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: server.url, CONF_API_KEY: "key"}
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry.entry_id
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+def _item(hass: HomeAssistant, identifier: str) -> MediaSourceItem:
+    return MediaSourceItem(hass, DOMAIN, identifier, None)
+
+
+async def test_browse_albums_and_assets(
+    hass: HomeAssistant, server: FakeImmich, entry_id: str
+) -> None:
+    """Test browsing from the server root down to the assets of an album."""
+    source = ImmichMediaSource(hass)
+
+    root = await source.async_browse_media(_item(hass, ""))
+    assert [child.identifier for child in root.children] == [
+        f"{entry_id}/albums",
+        f"{entry_id}/people/1",
+        f"{entry_id}/timeline/1",
+    ]
+
+    albums = await source.async_browse_media(_item(hass, f"{entry_id}/albums"))
+    (album,) = albums.children
+    assert album.identifier == f"{entry_id}/album/album-1/1"
+    assert album.title == "Holidays"
+    assert album.thumbnail == (
+        f"/api/{DOMAIN}/media/{entry_id}/{server.favorites[0]['id']}/thumbnail"
+    )
+
+    assets = await source.async_browse_media(_item(hass, album.identifier))
+    assert [child.identifier for child in assets.children] == [
+        f"{entry_id}/asset/{asset['id']}/IMAGE" for asset in server.favorites
+    ]
+    assert all(child.media_class == MediaClass.IMAGE for child in assets.children)
+
+    # Browsing the same page again is answered from the cache.
+    requests = server.total_requests
+    await source.async_browse_media(_item(hass, album.identifier))
+    assert server.total_requests == requests
+
+
+async def test_resolve_assets(hass: HomeAssistant, entry_id: str) -> None:
+    """Test images resolve to their preview and videos to the stream."""
+    source = ImmichMediaSource(hass)
+
+    image = await source.async_resolve_media(
+        _item(hass, f"{entry_id}/asset/asset-1/IMAGE")
+    )
+    assert image.url == f"/api/{DOMAIN}/media/{entry_id}/asset-1/preview"
+    assert image.mime_type == "image/jpeg"
+
+    video = await source.async_resolve_media(
+        _item(hass, f"{entry_id}/asset/asset-2/VIDEO")
+    )
+    assert video.url == f"/api/{DOMAIN}/media/{entry_id}/asset-2/video"
+    assert video.mime_type == "video/mp4"
+
+
+@pytest.mark.parametrize(
+    "identifier",
+    ["missing/asset/asset-1/IMAGE", "{entry_id}/album/asset-1/IMAGE", "{entry_id}"],
+)
+async def test_resolve_rejects_unknown_items(
+    hass: HomeAssistant, entry_id: str, identifier: str
+) -> None:
+    """Test unknown entries and identifiers are not resolved."""
+    source = ImmichMediaSource(hass)
+    with pytest.raises(Unresolvable):
+        await source.async_resolve_media(
+            _item(hass, identifier.format(entry_id=entry_id))
+        )
+
+
+@pytest.mark.parametrize(
+    "identifier",
+    ["missing/albums", "{entry_id}/unknown", "{entry_id}/album/album-1/first"],
+)
+async def test_browse_rejects_unknown_items(
+    hass: HomeAssistant, entry_id: str, identifier: str
+) -> None:
+    """Test unknown entries and identifiers are not browsed."""
+    source = ImmichMediaSource(hass)
+    with pytest.raises(BrowseError):
+        await source.async_browse_media(
+            _item(hass, identifier.format(entry_id=entry_id))
+        )
@@ -0,0 +1,33 @@
+"""Test the request metrics."""
+
+from custom_components.immich_integration.metrics import RequestMetrics
+
+
+def test_request_metrics() -> None:
+    """Test requests are counted per endpoint with IDs folded."""
+    metrics = RequestMetrics()
+    metrics.record("GET", "/api/jobs", 0.02, 200, 1000)
+    metrics.record("GET", "/api/jobs", 0.2, 503, 0)
+    metrics.record(
+        "GET",
+        "/api/assets/0c5f6d2e-7a3b-4c1d-9e8f-123456789abc/thumbnail",
+        0.04,
+        None,
+        0,
+    )
+
+    assert set(metrics.endpoints) == {
+        "GET /api/jobs",
+        "GET /api/assets/{id}/thumbnail",
+    }
+    jobs = metrics.endpoints["GET /api/jobs"]
+    assert jobs.requests == 2
+    assert jobs.errors == 1
+    assert jobs.statuses == {200: 1, 503: 1}
+    assert jobs.quantile(0.5) == 25
+    assert jobs.quantile(0.95) == 250
+
+    assert metrics.requests == 3
+    assert metrics.errors == 2
+    assert metrics.bytes_received == 1000
+    assert round(metrics.latency_mean) == 87
@@ -0,0 +1,55 @@
+"""Test the cached asset search."""
+
+import asyncio
+from datetime import date
+
+from custom_components.immich_integration.hub import ImmichHub
+from custom_components.immich_integration.search import (
+    RESULT_FIELDS,
+    SEARCH_METADATA,
+    SEARCH_SMART,
+    AssetSearch,
+)
+
+from .fake_immich import FakeImmich
+
+
+async def test_repeated_searches_are_cached() -> None:
+    """Test equal queries, however spelled, cost one request to the server."""
+    async with FakeImmich() as server:
+        server.latency = 0.05
+        hub = ImmichHub(host=server.url, api_key="key")
+        search = AssetSearch(hub)
+
+        results = await asyncio.gather(
+            search.async_search(SEARCH_SMART, "Dog on the beach", {}),
+            search.async_search(SEARCH_SMART, "dog  on the beach ", {}),
+        )
+        page, cached = await search.async_search(SEARCH_SMART, "DOG on the beach", {})
+        await hub.async_close()
+
+    assert server.requests["/api/search/smart"] == 1
+    assert [result[0] for result in results] == [page, page]
+    assert cached
+    assert len(page.items) == len(server.favorites)
+    assert set(page.items[0]) <= set(RESULT_FIELDS)
+    assert search.stats == {"entries": 1, "hits": 1, "misses": 1, "coalesced": 1}
+
+
+async def test_filters_with_dates() -> None:
+    """Test filter values without a JSON type are sent as strings."""
+    async with FakeImmich() as server:
+        hub = ImmichHub(host=server.url, api_key="key")
+        search = AssetSearch(hub)
+
+        _, cached = await search.async_search(
+            SEARCH_METADATA, None, {"takenAfter": date(2024, 1, 1)}
+        )
+        assert not cached
+        _, cached = await search.async_search(
+            SEARCH_METADATA, None, {"takenAfter": "2024-01-01"}
+        )
+        assert cached
+        await hub.async_close()
+
+    assert server.requests["/api/search/metadata"] == 1
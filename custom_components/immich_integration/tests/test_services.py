@@ -0,0 +1,148 @@
+"""Test the Immich Integration services."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.immich_integration.const import DOMAIN
+
+from .fake_immich import JOB_NAMES, FakeImmich
+
+
+async def test_refresh_fans_out_to_all_entries(hass: HomeAssistant) -> None:
+    """Test one refresh call reaches every server and reports each."""
+    async with FakeImmich() as first, FakeImmich() as second:
+        entries = []
+        for server in (first, second):
+            entry = MockConfigEntry(
+                domain=DOMAIN, data={CONF_HOST: server.url, CONF_API_KEY: "key"}
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            entries.append(entry)
+        await hass.async_block_till_done()
+        first.requests.clear()
+        second.requests.clear()
+
+        response = await hass.services.async_call(
+            DOMAIN, "refresh", {}, blocking=True, return_response=True
+        )
+
+        assert set(response) == {entry.entry_id for entry in entries}
+        assert all(result["success"] for result in response.values())
+        assert first.requests["/api/jobs"] == second.requests["/api/jobs"] == 1
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "refresh",
+            {"config_entry_id": entries[0].entry_id},
+            blocking=True,
+            return_response=True,
+        )
+        assert set(response) == {entries[0].entry_id}
+
+        for entry in entries:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_refresh_targets_one_device(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry
+) -> None:
+    """Test targeting the device of one entry leaves the others alone."""
+    async with FakeImmich() as server:
+        entries = []
+        for _ in range(2):
+            entry = MockConfigEntry(
+                domain=DOMAIN, data={CONF_HOST: server.url, CONF_API_KEY: "key"}
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            entries.append(entry)
+        await hass.async_block_till_done()
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, entries[1].entry_id)}
+        )
+        assert device is not None
+        assert device.config_entries == {entries[1].entry_id}
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "refresh",
+            {"device_id": [device.id]},
+            blocking=True,
+            return_response=True,
+        )
+        assert set(response) == {entries[1].entry_id}
+
+        for entry in entries:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_job_command_sent_once_per_server(hass: HomeAssistant) -> None:
+    """Test entries on the same server send a job command only once."""
+    async with FakeImmich() as server:
+        entries = []
+        for api_key in ("alice", "bob"):
+            entry = MockConfigEntry(
+                domain=DOMAIN, data={CONF_HOST: server.url, CONF_API_KEY: api_key}
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            entries.append(entry)
+        await hass.async_block_till_done()
+        server.requests.clear()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "job_command",
+            {"queues": ["library", "thumbnailGeneration"], "command": "start"},
+            blocking=True,
+            return_response=True,
+        )
+        await hass.async_block_till_done()
+
+        expected = {"library": True, "thumbnailGeneration": True}
+        assert response == {entry.entry_id: expected for entry in entries}
+        assert server.requests["/api/jobs/{name}"] == 2
+
+        for entry in entries:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_job_command_all_queues_refreshes_once(hass: HomeAssistant) -> None:
+    """Test all expands to every queue, failures stay per queue, one refresh."""
+    async with FakeImmich() as server:
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_HOST: server.url, CONF_API_KEY: "key"}
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        server.requests.clear()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "job_command",
+            {"queues": "all", "command": "pause"},
+            blocking=True,
+            return_response=True,
+        )
+        await hass.async_block_till_done()
+
+        assert response == {entry.entry_id: dict.fromkeys(JOB_NAMES, True)}
+        assert server.requests["/api/jobs/{name}"] == len(JOB_NAMES)
+        assert server.requests["/api/jobs"] == 1
+        assert all(job["queueStatus"]["isPaused"] for job in server.jobs.values())
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "job_command",
+            {"queues": ["library", "missing"], "command": "resume"},
+            blocking=True,
+            return_response=True,
+        )
+        assert response == {entry.entry_id: {"library": True, "missing": False}}
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,49 @@
+"""Test the folder sync."""
+
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.immich_integration.const import DOMAIN
+from custom_components.immich_integration.hub import ImmichHub
+from custom_components.immich_integration.sync import STATE_IDLE, FolderSync
+
+from .fake_immich import FakeImmich
+
+
+async def test_rescan_only_uploads_changed_files(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test files already synced are neither hashed nor checked again."""
+    photo = tmp_path / "photo.jpg"
+    photo.write_bytes(b"first")
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    coordinator = MagicMock(async_command_issued=AsyncMock())
+
+    async with FakeImmich() as server:
+        hub = ImmichHub(host=server.url, api_key="key")
+        sync = FolderSync(hass, entry, hub, coordinator, [str(tmp_path)])
+
+        await sync._async_sync()
+        assert sync.uploaded == 1
+        assert sync.indexed == 1
+        assert server.requests["/api/assets/bulk-upload-check"] == 1
+
+        await sync._async_sync()
+        assert sync.uploaded == 1
+        assert server.requests["/api/assets/bulk-upload-check"] == 1
+
+        photo.write_bytes(b"second")
+        os.utime(photo, (0, 1_000_000))
+        await sync._async_sync()
+        await hub.async_close()
+
+    assert sync.uploaded == 2
+    assert sync.state == STATE_IDLE
+    assert server.requests["/api/assets"] == 2
+    assert coordinator.async_command_issued.await_count == 2
@@ -0,0 +1,63 @@
+"""Test uploading local files."""
+
+import asyncio
+import hashlib
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.immich_integration.hub import ImmichHub
+from custom_components.immich_integration.upload import (
+    async_upload_files,
+    scan_files,
+)
+
+from .fake_immich import FakeImmich
+
+
+async def test_upload_skips_files_on_the_server(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test only files the server does not have are uploaded."""
+    (tmp_path / "new.jpg").write_bytes(b"new clip" * 100_000)
+    (tmp_path / "old.mp4").write_bytes(b"old clip")
+    (tmp_path / "notes.txt").write_bytes(b"not media")
+
+    async with FakeImmich() as server:
+        server.checksums.add(hashlib.sha1(b"old clip").hexdigest())
+        hub = ImmichHub(host=server.url, api_key="key")
+
+        files = await hass.async_add_executor_job(scan_files, [str(tmp_path)], False)
+        result = await async_upload_files(hass, hub, files)
+        await hub.async_close()
+
+    assert list(result.uploaded) == [str(tmp_path / "new.jpg")]
+    assert result.duplicates == [str(tmp_path / "old.mp4")]
+    assert result.failed == {}
+    assert server.requests["/api/assets"] == 1
+
+
+async def test_polls_succeed_during_parallel_uploads(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test uploads at full parallelism leave the poll's connections free."""
+    for i in range(8):
+        (tmp_path / f"{i}.jpg").write_bytes(f"clip {i}".encode())
+
+    async with FakeImmich() as server:
+        server.upload_latency = 1.0
+        hub = ImmichHub(host=server.url, api_key="key")
+        files = await hass.async_add_executor_job(scan_files, [str(tmp_path)], False)
+        upload = asyncio.create_task(
+            async_upload_files(hass, hub, files, max_parallel=8)
+        )
+        while server.requests["/api/assets"] < 8:
+            await asyncio.sleep(0.01)
+
+        jobs = await asyncio.wait_for(hub.get_jobs(False), 0.5)
+        result = await upload
+        await hub.async_close()
+
+    assert jobs
+    assert len(result.uploaded) == 8
+    assert not hub.breaker.is_open
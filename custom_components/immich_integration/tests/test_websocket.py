@@ -0,0 +1,96 @@
+"""Test the Immich Integration live event channel."""
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from custom_components.immich_integration.hub import ImmichHub
+from custom_components.immich_integration.websocket import ImmichWebSocket
+
+
+async def _socket_handler(request: web.Request) -> web.WebSocketResponse:
+    """Stand-in for Immich's Socket.IO endpoint."""
+    assert request.headers["x-api-key"] == "key"
+    assert request.query["EIO"] == "4"
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    await ws.send_str('0{"sid":"abc","pingInterval":25000,"pingTimeout":20000}')
+    assert await ws.receive_str() == "40"
+    await ws.send_str('40{"sid":"def"}')
+    await ws.send_str("2")
+    assert await ws.receive_str() == "3"
+    await ws.send_str('42["on_upload_success",{"id":"asset-1"}]')
+    await ws.send_str('42["on_asset_trash",["asset-2"]]')
+    await ws.send_str("41")
+    await ws.close()
+    return ws
+
+
+async def test_websocket_delivers_events() -> None:
+    """Test events and connection changes are reported."""
+    app = web.Application()
+    app.router.add_get("/api/socket.io/", _socket_handler)
+    events = []
+    connection_changes = []
+
+    async with TestServer(app) as server:
+        hub = ImmichHub(host=str(server.make_url("/")), api_key="key")
+        socket = ImmichWebSocket(
+            hub,
+            lambda event, payload: events.append((event, payload)),
+            connection_changes.append,
+        )
+        await socket._async_connect()
+        await hub.async_close()
+
+    assert events == [
+        ("on_upload_success", {"id": "asset-1"}),
+        ("on_asset_trash", ["asset-2"]),
+    ]
+    assert connection_changes == [True]
+
+
+async def test_websocket_reconnects_after_callback_error() -> None:
+    """Test an error in an event callback reports a disconnect and reconnects."""
+    connections = 0
+
+    async def handler(request: web.Request) -> web.WebSocketResponse:
+        nonlocal connections
+        connections += 1
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_str('0{"sid":"abc","pingInterval":25000,"pingTimeout":20000}')
+        await ws.receive_str()
+        await ws.send_str('40{"sid":"def"}')
+        await ws.send_str('42["on_upload_success",{"id":"asset-1"}]')
+        await ws.receive()
+        return ws
+
+    def on_event(event: str, payload: Any) -> None:
+        raise RuntimeError("callback failed")
+
+    app = web.Application()
+    app.router.add_get("/api/socket.io/", handler)
+    connection_changes = []
+
+    async with TestServer(app) as server:
+        hub = ImmichHub(host=str(server.make_url("/")), api_key="key")
+        socket = ImmichWebSocket(hub, on_event, connection_changes.append)
+        with patch(
+            "custom_components.immich_integration.websocket._RECONNECT_MIN_DELAY", 0
+        ):
+            task = asyncio.create_task(socket.async_run())
+            while connections < 2:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        await hub.async_close()
+
+    assert connection_changes[:2] == [True, False]
+    assert connection_changes[-1] is False
+    assert not socket.connected
@@ -0,0 +1,89 @@
+"""Job throughput tracking for the Immich Integration."""
+
+from __future__ import annotations
+
+from collections import deque
+
+from .models import JobCounts
+
+_MAX_SAMPLES = 64
+_WINDOW = 15 * 60.0
+
+
+class JobThroughput:
+    """Rolling completion and failure rates of one job queue.
+
+    Samples of the queue's counters go into a fixed-size ring buffer and the
+    rates are derived from its oldest and newest sample only, so adding a
+    sample is O(1) and memory stays fixed however long HA runs.
+    """
+
+    __slots__ = ("_samples", "_window")
+
+    def __init__(self, max_samples: int = _MAX_SAMPLES, window: float = _WINDOW) -> None:
+        """Initialize the tracker."""
+        # (timestamp, completed, failed, backlog)
+        self._samples: deque[tuple[float, int, int, int]] = deque(maxlen=max_samples)
+        self._window = window
+
+    def add_sample(self, timestamp: float, counts: JobCounts) -> None:
+        """Record the queue's counters at a monotonic timestamp."""
+        completed = counts.completed
+        failed = counts.failed
+        backlog = counts.backlog
+        if self._samples:
+            _, last_completed, last_failed, _ = self._samples[-1]
+            if completed < last_completed or failed < last_failed:
+                # Counters were reset, e.g. by a server restart.
+                self._samples.clear()
+        self._samples.append((timestamp, completed, failed, backlog))
+        while len(self._samples) > 2 and timestamp - self._samples[0][0] > self._window:
+            self._samples.popleft()
+
+    def _span(self) -> tuple[float, tuple[float, int, int, int], tuple[float, int, int, int]] | None:
+        """Return the window length in minutes and its first and last sample."""
+        if len(self._samples) < 2:
+            return None
+        first, last = self._samples[0], self._samples[-1]
+        if (minutes := (last[0] - first[0]) / 60) <= 0:
+            return None
+        return minutes, first, last
+
+    @property
+    def backlog(self) -> int | None:
+        """Return the active, waiting and delayed jobs of the newest sample."""
+        return self._samples[-1][3] if self._samples else None
+
+    @property
+    def completion_rate(self) -> float | None:
+        """Return completed jobs per minute over the window.
+
+        Immich usually drops completed jobs from the queue, leaving the
+        completed counter at zero; the net backlog drain is used then.
+        """
+        if (span := self._span()) is None:
+            return None
+        minutes, first, last = span
+        completed = last[1] - first[1]
+        if completed <= 0:
+            completed = max(0, first[3] - last[3])
+        return completed / minutes
+
+    @property
+    def failure_rate(self) -> float | None:
+        """Return failed jobs per minute over the window."""
+        if (span := self._span()) is None:
+            return None
+        minutes, first, last = span
+        return (last[2] - first[2]) / minutes
+
+    @property
+    def time_to_drain(self) -> float | None:
+        """Return the estimated minutes until the backlog is empty."""
+        if (backlog := self.backlog) is None:
+            return None
+        if backlog == 0:
+            return 0.0
+        if not (rate := self.completion_rate):
+            return None
+        return backlog / rate
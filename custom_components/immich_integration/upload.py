@@ -0,0 +1,163 @@
+"""Uploading local files to Immich."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import hashlib
+import logging
+import os
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .hub import ApiError, CannotConnect, ImmichHub
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_PARALLEL_UPLOADS = 3
+_MAX_PARALLEL_HASHES = 4
+_CHECK_BATCH_SIZE = 1000
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+MEDIA_EXTENSIONS = frozenset(
+    {
+        ".3gp", ".avi", ".avif", ".bmp", ".dng", ".gif", ".heic", ".heif",
+        ".jpeg", ".jpg", ".jxl", ".m4v", ".mkv", ".mov", ".mp4", ".mpeg",
+        ".mpg", ".mts", ".png", ".raw", ".tif", ".tiff", ".webm", ".webp",
+    }
+)
+
+
+@dataclass(slots=True)
+class LocalFile:
+    """A media file on disk, as seen when it was scanned."""
+
+    path: str
+    size: int
+    mtime: float
+    checksum: str | None = None
+
+    @property
+    def device_asset_id(self) -> str:
+        """Return the per-device ID Immich uses to recognise the file."""
+        return f"{os.path.basename(self.path)}-{self.size}"
+
+
+@dataclass(slots=True)
+class UploadResult:
+    """Outcome of uploading a batch of files."""
+
+    uploaded: dict[str, str]
+    duplicates: list[str]
+    failed: dict[str, str]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as a service response."""
+        return {
+            "uploaded": self.uploaded,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+        }
+
+
+def scan_files(paths: Iterable[str], recursive: bool) -> list[LocalFile]:
+    """Return the media files at or below paths. Runs in the executor."""
+    files: list[LocalFile] = []
+    pending = list(paths)
+    while pending:
+        path = pending.pop()
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            files.append(LocalFile(path, stat.st_size, stat.st_mtime))
+            continue
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif (
+                    entry.is_file()
+                    and os.path.splitext(entry.name)[1].lower() in MEDIA_EXTENSIONS
+                ):
+                    stat = entry.stat()
+                    files.append(LocalFile(entry.path, stat.st_size, stat.st_mtime))
+    return files
+
+
+def sha1_file(path: str) -> str:
+    """Return the hex SHA-1 of a file, read in chunks. Runs in the executor."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        while chunk := file.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def async_hash_files(hass: HomeAssistant, files: list[LocalFile]) -> None:
+    """Fill in missing checksums, hashing a few files at a time in the executor."""
+    semaphore = asyncio.Semaphore(_MAX_PARALLEL_HASHES)
+
+    async def _hash(file: LocalFile) -> None:
+        async with semaphore:
+            file.checksum = await hass.async_add_executor_job(sha1_file, file.path)
+
+    await asyncio.gather(*(_hash(file) for file in files if file.checksum is None))
+
+
+async def async_upload_files(
+    hass: HomeAssistant,
+    hub: ImmichHub,
+    files: list[LocalFile],
+    max_parallel: int = DEFAULT_MAX_PARALLEL_UPLOADS,
+) -> UploadResult:
+    """Upload files that are not on the server yet.
+
+    Files are hashed first and checked in bulk against the server, so only
+    new files are sent. At most max_parallel uploads run at once.
+    """
+    result = UploadResult(uploaded={}, duplicates=[], failed={})
+    await async_hash_files(hass, files)
+
+    accepted: list[LocalFile] = []
+    for start in range(0, len(files), _CHECK_BATCH_SIZE):
+        batch = files[start : start + _CHECK_BATCH_SIZE]
+        actions = await hub.bulk_upload_check(
+            {str(index): file.checksum for index, file in enumerate(batch)}
+        )
+        for index, file in enumerate(batch):
+            if actions.get(str(index), True):
+                accepted.append(file)
+            else:
+                result.duplicates.append(file.path)
+
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def _upload(file: LocalFile) -> None:
+        async with semaphore:
+            try:
+                result.uploaded[file.path] = await async_upload_file(hass, hub, file)
+            except (CannotConnect, ApiError, OSError) as err:
+                _LOGGER.debug("Unable to upload %s: %s", file.path, err)
+                result.failed[file.path] = str(err) or type(err).__name__
+
+    await asyncio.gather(*(_upload(file) for file in accepted))
+    return result
+
+
+async def async_upload_file(hass: HomeAssistant, hub: ImmichHub, file: LocalFile) -> str:
+    """Upload one hashed file and return its asset ID."""
+    assert file.checksum is not None
+    handle = await hass.async_add_executor_job(open, file.path, "rb")
+    try:
+        return await hub.upload_asset(
+            handle,
+            os.path.basename(file.path),
+            file.checksum,
+            datetime.fromtimestamp(file.mtime, UTC),
+            file.device_asset_id,
+        )
+    finally:
+        await hass.async_add_executor_job(handle.close)
@@ -0,0 +1,144 @@
+"""Live event channel for the Immich Integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import random
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from homeassistant.util.json import json_loads
+
+from .hub import ImmichHub
+
+_LOGGER = logging.getLogger(__name__)
+
+_SOCKET_PATH = "/api/socket.io/"
+_HEADER_API_KEY = "x-api-key"
+_RECONNECT_MIN_DELAY = 1.0
+_RECONNECT_MAX_DELAY = 60.0
+
+# Engine.IO packet types.
+_EIO_OPEN = "0"
+_EIO_CLOSE = "1"
+_EIO_PING = "2"
+_EIO_PONG = "3"
+_EIO_MESSAGE = "4"
+# Socket.IO packet types, carried in Engine.IO messages.
+_SIO_CONNECT = "0"
+_SIO_DISCONNECT = "1"
+_SIO_EVENT = "2"
+_SIO_CONNECT_ERROR = "4"
+
+
+class ImmichWebSocket:
+    """Persistent Socket.IO connection to Immich's live event channel.
+
+    This is the channel the Immich web UI uses for live updates. Only the
+    small subset of Engine.IO v4 and Socket.IO v5 needed to receive events
+    on the default namespace over a WebSocket is implemented. The
+    connection is re-established with jittered backoff whenever it drops.
+    """
+
+    def __init__(
+        self,
+        hub: ImmichHub,
+        on_event: Callable[[str, Any], None],
+        on_connection_change: Callable[[bool], None],
+    ) -> None:
+        """Initialize the connection."""
+        self.hub = hub
+        self._on_event = on_event
+        self._on_connection_change = on_connection_change
+        self.connected = False
+
+    @property
+    def url(self) -> URL:
+        """Return the WebSocket URL of the event channel."""
+        url = URL(self.hub.host).join(URL(_SOCKET_PATH))
+        scheme = "wss" if url.scheme == "https" else "ws"
+        return url.with_scheme(scheme).with_query(EIO="4", transport="websocket")
+
+    async def async_run(self) -> None:
+        """Keep the connection open until cancelled.
+
+        Unexpected errors, from the server or an event callback, are logged
+        and the connection is re-established rather than given up.
+        """
+        delay = _RECONNECT_MIN_DELAY
+        while True:
+            try:
+                await self._async_connect()
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                KeyError,
+                ValueError,
+            ) as err:
+                _LOGGER.debug("Immich event channel error: %s", err)
+            except Exception:
+                _LOGGER.exception("Unexpected error on the Immich event channel")
+            else:
+                delay = _RECONNECT_MIN_DELAY
+            finally:
+                self._set_connected(False)
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, _RECONNECT_MAX_DELAY)
+
+    async def _async_connect(self) -> None:
+        """Run one connection until the server closes it."""
+        async with self.hub.transfer_session.ws_connect(
+            self.url, headers={_HEADER_API_KEY: self.hub.api_key}
+        ) as ws:
+            handshake = await ws.receive_str(timeout=30)
+            if not handshake.startswith(_EIO_OPEN):
+                raise ValueError(f"Unexpected handshake: {handshake}")
+            options = json_loads(handshake[1:])
+            # Expect a ping at least every pingInterval + pingTimeout.
+            timeout = (options["pingInterval"] + options["pingTimeout"]) / 1000
+
+            await ws.send_str(_EIO_MESSAGE + _SIO_CONNECT)
+
+            while True:
+                message = await ws.receive(timeout=timeout)
+                if message.type is not aiohttp.WSMsgType.TEXT:
+                    return
+                packet: str = message.data
+                if packet == _EIO_PING:
+                    await ws.send_str(_EIO_PONG)
+                elif packet.startswith(_EIO_CLOSE):
+                    return
+                elif packet.startswith(_EIO_MESSAGE):
+                    if not self._handle_message(packet[1:]):
+                        return
+
+    def _handle_message(self, packet: str) -> bool:
+        """Handle a Socket.IO packet, returning False on disconnect."""
+        kind, payload = packet[:1], packet[1:]
+        if kind == _SIO_CONNECT:
+            self._set_connected(True)
+        elif kind == _SIO_CONNECT_ERROR:
+            _LOGGER.warning("Immich event channel refused the connection: %s", payload)
+            return False
+        elif kind == _SIO_DISCONNECT:
+            return False
+        elif kind == _SIO_EVENT:
+            # Skip the acknowledgement ID, if any.
+            event = json_loads(payload.lstrip("0123456789"))
+            if isinstance(event, list) and event:
+                self._on_event(event[0], event[1] if len(event) > 1 else None)
+        return True
+
+    def _set_connected(self, connected: bool) -> None:
+        """Report connection changes."""
+        if connected == self.connected:
+            return
+        self.connected = connected
+        _LOGGER.debug(
+            "Immich event channel %s", "connected" if connected else "disconnected"
+        )
+        self._on_connection_change(connected)